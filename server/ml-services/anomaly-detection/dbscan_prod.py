@@ -22,12 +22,23 @@ from base.ml_model_base import (
     ArtifactStore,
     PersistenceError
 )
+from base.instrumentation import input_stats
 from base.preprocessing import FeatureExtractor, FeatureConfig
 from base.schemas import validate_event_log
 
 
+# Above this many features a ball tree beats a KD-tree for radius queries
+KDTREE_MAX_FEATURES = 20
+
+
 class DBSCANAnomalyDetector(AnomalyDetectorBase):
-    """DBSCAN-based anomaly detection with production-ready lifecycle"""
+    """
+    DBSCAN-based anomaly detection with production-ready lifecycle
+    
+    Training clusters once and indexes the core samples; prediction labels
+    new points by their nearest core sample within eps (the DBSCAN border
+    rule) instead of re-clustering.
+    """
     
     def __init__(
         self,
@@ -40,6 +51,10 @@ class DBSCANAnomalyDetector(AnomalyDetectorBase):
         self.eps = eps
         self.min_samples = min_samples
         
+        # Spatial index over core samples and their cluster labels
+        self.core_index = None
+        self.core_labels = np.empty(0, dtype=np.int64)
+        
         # Deterministic feature extractor
         self.feature_extractor = FeatureExtractor(
             config=FeatureConfig(
@@ -107,6 +122,7 @@ class DBSCANAnomalyDetector(AnomalyDetectorBase):
             # Fit DBSCAN
             self.model = DBSCAN(eps=self.eps, min_samples=self.min_samples, n_jobs=-1)
             labels = self.model.fit_predict(X)
+            self._build_core_index(self.model.components_, labels[self.model.core_sample_indices_])
             
             # Points labeled -1 are anomalies
             n_anomalies = np.sum(labels == -1)
@@ -119,14 +135,21 @@ class DBSCANAnomalyDetector(AnomalyDetectorBase):
                 'anomalies_detected': int(n_anomalies),
                 'anomaly_rate': float(n_anomalies / len(X)),
                 'n_clusters': int(n_clusters),
+                'core_samples': int(len(self.core_labels)),
                 'eps': self.eps,
                 'min_samples': self.min_samples
             }
             
             self.metadata.performance_metrics = metrics
             
-            # Invoke after_train hook
-            self.after_train(context)
+            # Invoke after_train hook (fresh context carrying the input size)
+            self.after_train(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='train',
+                timestamp=datetime.now(),
+                data=input_stats(X)
+            ))
             
             return TrainingResult(
                 success=True,
@@ -166,21 +189,27 @@ class DBSCANAnomalyDetector(AnomalyDetectorBase):
             else:
                 X = np.array(data)
             
-            # Re-run clustering on new data
-            labels = self.model.fit_predict(X)
+            labels, distances = self._assign_clusters(X)
             
             results = []
-            for idx, label in enumerate(labels):
+            for idx, (label, distance) in enumerate(zip(labels.tolist(), distances.tolist())):
                 results.append({
                     'index': int(idx),
                     'is_anomaly': bool(label == -1),
                     'cluster_id': int(label) if label != -1 else None,
                     'anomaly_score': 1.0 if label == -1 else 0.0,
+                    'core_distance': float(distance),
                     'severity': 'high' if label == -1 else 'low'
                 })
             
-            # Invoke after_predict hook
-            self.after_predict(context)
+            # Invoke after_predict hook (fresh context carrying the input size)
+            self.after_predict(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='predict',
+                timestamp=datetime.now(),
+                data=input_stats(X)
+            ))
             
             return PredictionResult(
                 predictions=results,
@@ -196,6 +225,36 @@ class DBSCANAnomalyDetector(AnomalyDetectorBase):
         except Exception as e:
             raise PredictionError(f"Unexpected prediction error: {str(e)}")
     
+    def _build_core_index(self, core_samples: np.ndarray, core_labels: np.ndarray) -> None:
+        """Index core samples for nearest-core queries"""
+        from sklearn.neighbors import BallTree, KDTree
+        
+        self.core_labels = np.asarray(core_labels, dtype=np.int64)
+        if len(core_samples) == 0:
+            self.core_index = None
+            return
+        
+        index_cls = KDTree if core_samples.shape[1] <= KDTREE_MAX_FEATURES else BallTree
+        self.core_index = index_cls(np.asarray(core_samples, dtype=np.float64))
+    
+    def _assign_clusters(self, X: np.ndarray):
+        """
+        Label points by their nearest core sample
+        
+        A point within eps of a core sample joins that sample's cluster;
+        anything further from every core sample is noise (-1).
+        
+        Returns:
+            (labels, distance to the nearest core sample)
+        """
+        if self.core_index is None:
+            return np.full(len(X), -1, dtype=np.int64), np.full(len(X), np.inf)
+        
+        distances, nearest = self.core_index.query(np.asarray(X, dtype=np.float64), k=1)
+        distances, nearest = distances[:, 0], nearest[:, 0]
+        labels = np.where(distances <= self.eps, self.core_labels[nearest], -1)
+        return labels, distances
+    
     def detect_anomalies(self, data: Any) -> List[Dict[str, Any]]:
         """Return only anomalous records"""
         pred_result = self.predict(data)
@@ -254,8 +313,15 @@ class DBSCANAnomalyDetector(AnomalyDetectorBase):
             self.feature_extractor, extractor_path, 'joblib', name='feature_extractor'
         )
         
+        # Save core-sample index with its cluster labels
+        index_path = artifact_dir / "core_index.joblib"
+        index_spec = ArtifactStore.save(
+            {'index': self.core_index, 'labels': self.core_labels, 'eps': self.eps},
+            index_path, 'joblib', name='core_index'
+        )
+        
         # Replace artifacts list with complete set (prevents accumulation on repeated saves)
-        self.metadata.artifacts = [model_artifact, extractor_spec]
+        self.metadata.artifacts = [model_artifact, extractor_spec, index_spec]
         
         # Re-save manifest
         manifest_path = save_dir_path / "manifest.json"
@@ -275,7 +341,20 @@ class DBSCANAnomalyDetector(AnomalyDetectorBase):
         load_dir = Path(path)
         artifact_dir = load_dir / "artifacts"
         
+        core_index = None
         for artifact_spec in self.metadata.artifacts:
             if artifact_spec.name == 'feature_extractor':
                 extractor_path = artifact_dir / artifact_spec.filename
                 self.feature_extractor = ArtifactStore.load(extractor_path, artifact_spec.artifact_type)
+            elif artifact_spec.name == 'core_index':
+                core_index = ArtifactStore.load(artifact_dir / artifact_spec.filename, artifact_spec.artifact_type)
+        
+        if core_index is not None:
+            self.core_index = core_index['index']
+            self.core_labels = core_index['labels']
+            self.eps = core_index['eps']
+        else:
+            # Models saved before the index existed: rebuild it from the estimator
+            self._build_core_index(
+                self.model.components_, self.model.labels_[self.model.core_sample_indices_]
+            )
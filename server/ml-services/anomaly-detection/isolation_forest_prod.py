@@ -4,23 +4,68 @@ Complete implementation with persistence, evaluation, and proper error handling
 """
 
 import numpy as np
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Iterable
+import os
+import re
 import sys
+import threading
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from base.ml_model_base import AnomalyDetectorBase, TrainingResult, PredictionResult
+from base.ml_model_base import AnomalyDetectorBase, TrainingResult, PredictionResult, LifecycleContext, TrainingError
+from base.instrumentation import input_stats
 from base.schemas import EventLogSchema, AnomalyDetectionInput, AnomalyDetectionOutput, validate_event_log
 from base.model_registry import get_registry
+from base.model_serving import get_model_holder
 from datetime import datetime
 
 
+def _average_path_length(n: int) -> float:
+    """Expected path length of an unsuccessful BST search over n samples"""
+    if n <= 1:
+        return 0.0
+    if n == 2:
+        return 1.0
+    return 2.0 * (np.log(n - 1.0) + np.euler_gamma) - 2.0 * (n - 1.0) / n
+
+
+# Online tree swapping reads and rewrites private IsolationForest attributes
+# (introduced in scikit-learn 1.3); only the versions it was verified
+# against are allowed, [min, max) by (major, minor)
+TREE_SWAP_SKLEARN_VERSIONS = ((1, 3), (1, 10))
+_TREE_SWAP_ATTRIBUTES = ('_decision_path_lengths', '_average_path_length_per_tree', '_seeds')
+
+
+def _check_tree_swap_support(model: Any) -> None:
+    """Fail loudly if the installed scikit-learn's forest internals are not the expected ones"""
+    import sklearn
+    
+    match = re.match(r'(\d+)\.(\d+)', sklearn.__version__)
+    version = (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+    low, high = TREE_SWAP_SKLEARN_VERSIONS
+    missing = [
+        name for name in _TREE_SWAP_ATTRIBUTES
+        if len(getattr(model, name, ())) != len(model.estimators_)
+    ]
+    if not low <= version < high or missing:
+        raise TrainingError(
+            f"Online Isolation Forest updates do not support scikit-learn {sklearn.__version__} "
+            f"(supported: >={low[0]}.{low[1]},<{high[0]}.{high[1]})",
+            context={'sklearn_version': sklearn.__version__, 'missing_attributes': missing}
+        )
+
+
 class IsolationForestAnomalyDetector(AnomalyDetectorBase):
     """
     Production-ready Isolation Forest anomaly detector
     Fast, scalable tree-based outlier detection
+    
+    Besides batch train()/predict(), partial_fit() keeps the model current on
+    a stream: recent feature vectors live in a sliding window and the oldest
+    trees are periodically replaced by trees fit on new data.
     """
     
     def __init__(
@@ -29,18 +74,36 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
         n_estimators: int = 100,
         contamination: float = 0.05,
         max_samples: int = 256,
-        random_state: int = 42
+        random_state: int = 42,
+        window_size: int = 10000,
+        refresh_trees: int = 10,
+        refresh_every: int = 2048,
+        drift_tolerance: float = 0.5
     ):
         super().__init__(model_id, "isolation_forest", contamination)
         self.n_estimators = n_estimators
         self.max_samples = max_samples
         self.random_state = random_state
         
+        # Online mode: window of recent samples, k trees swapped per refresh,
+        # size trigger (new samples) and drift trigger (relative deviation of
+        # the flagged rate from contamination)
+        self.window_size = window_size
+        self.refresh_trees = min(refresh_trees, n_estimators)
+        self.refresh_every = refresh_every
+        self.drift_tolerance = drift_tolerance
+        self.refresh_count = 0
+        self._reset_window()
+        
         # Update hyperparameters
         self.metadata.hyperparameters.update({
             'n_estimators': n_estimators,
             'max_samples': max_samples,
-            'random_state': random_state
+            'random_state': random_state,
+            'window_size': window_size,
+            'refresh_trees': self.refresh_trees,
+            'refresh_every': refresh_every,
+            'drift_tolerance': drift_tolerance
         })
     
     def train(self, data: Any, **kwargs) -> TrainingResult:
@@ -54,6 +117,13 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
         Returns:
             TrainingResult with success status and metrics
         """
+        self.before_train(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='train',
+            timestamp=datetime.now()
+        ))
+        
         try:
             # Import sklearn
             try:
@@ -68,14 +138,7 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
                     error=error_msg
                 )
             
-            # Convert data to numpy array if needed
-            if isinstance(data, list) and data and isinstance(data[0], (EventLogSchema, dict)):
-                if isinstance(data[0], dict):
-                    data = validate_event_log(data)
-                input_schema = AnomalyDetectionInput(events=data)
-                X = input_schema.to_feature_matrix()
-            else:
-                X = np.array(data)
+            X = self._to_matrix(data)
             
             # Validate data
             if len(X) < 10:
@@ -96,10 +159,15 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
             
             self.model.fit(X)
             
-            # Calculate threshold from training data
-            scores = self.model.score_samples(X)
+            # Calculate threshold from training data; the per-sample path
+            # lengths also seed the online window
+            depths = self._tree_depths(X, range(len(self.model.estimators_)))
+            scores = self._scores_from_depths(depths)
             self.threshold = np.percentile(scores, self.contamination * 100)
             
+            self._reset_window()
+            self._window_append(X, depths)
+            
             # Mark as trained
             self.is_trained = True
             self.metadata.status = 'trained'
@@ -118,6 +186,14 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
             
             self.metadata.performance_metrics = metrics
             
+            self.after_train(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='train',
+                timestamp=datetime.now(),
+                data=input_stats(X)
+            ))
+            
             return TrainingResult(
                 success=True,
                 metrics=metrics,
@@ -146,14 +222,14 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction. Call train() first.")
         
-        # Convert data to numpy array if needed
-        if isinstance(data, list) and data and isinstance(data[0], (EventLogSchema, dict)):
-            if isinstance(data[0], dict):
-                data = validate_event_log(data)
-            input_schema = AnomalyDetectionInput(events=data)
-            X = input_schema.to_feature_matrix()
-        else:
-            X = np.array(data)
+        self.before_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now()
+        ))
+        
+        X = self._to_matrix(data)
         
         # Predict
         predictions = self.model.predict(X)
@@ -171,6 +247,14 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
                 'confidence': float(abs(score) / abs(self.threshold)) if self.threshold else 1.0
             })
         
+        self.after_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now(),
+            data=input_stats(X)
+        ))
+        
         return PredictionResult(
             predictions=results,
             metadata={
@@ -180,6 +264,54 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
             }
         )
     
+    def partial_fit(self, data: Any) -> Dict[str, Any]:
+        """
+        Add new observations and refresh the forest when a trigger fires
+        
+        New samples are scored against the current forest and pushed into
+        the sliding window. Once `refresh_every` samples have arrived since
+        the last refresh, or the rate of flagged samples among them deviates
+        from `contamination` by more than `drift_tolerance` (relative), the
+        `refresh_trees` oldest trees are replaced by trees fit on the recent
+        samples. The threshold is then recomputed from the window, whose
+        path lengths are kept per sample so only the swapped trees are
+        re-evaluated.
+        
+        Args:
+            data: Either numpy array or list of EventLogSchema
+        
+        Returns:
+            Dict with samples added, window size, refresh trigger and threshold
+        
+        Raises:
+            TrainingError: If the installed scikit-learn is outside
+                TREE_SWAP_SKLEARN_VERSIONS
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before partial_fit. Call train() first.")
+        _check_tree_swap_support(self.model)
+        
+        X = self._to_matrix(data)
+        if len(X) == 0:
+            return self._online_status(0, None)
+        
+        if self.threshold is None:
+            # Loaded models carry the threshold as the forest's offset
+            self.threshold = float(self.model.offset_)
+        
+        depths = self._tree_depths(X, range(len(self.model.estimators_)))
+        scores = self._scores_from_depths(depths)
+        self._window_append(X, depths)
+        self._since_refresh += len(X)
+        self._flagged_since_refresh += int(np.sum(scores < self.threshold))
+        
+        trigger = self._refresh_trigger()
+        if trigger and not self._refresh_oldest_trees():
+            trigger = None
+        self._update_threshold()
+        
+        return self._online_status(len(X), trigger)
+    
     def detect_anomalies(self, data: Any) -> List[Dict[str, Any]]:
         """
         Detect anomalies and return only anomalous records
@@ -254,6 +386,143 @@ class IsolationForestAnomalyDetector(AnomalyDetectorBase):
         else:
             return 'low'
     
+    def _to_matrix(self, data: Any) -> np.ndarray:
+        """Convert event records or array-like input to a feature matrix"""
+        if isinstance(data, list) and data and isinstance(data[0], (EventLogSchema, dict)):
+            if isinstance(data[0], dict):
+                data = validate_event_log(data)
+            input_schema = AnomalyDetectionInput(events=data)
+            return input_schema.to_feature_matrix()
+        return np.array(data)
+    
+    def _tree_depths(self, X: np.ndarray, tree_indices: Iterable[int]) -> np.ndarray:
+        """
+        Sum of isolation path lengths of each sample over the given trees
+        
+        Mirrors IsolationForest.score_samples, but per tree subset so that
+        swapping trees only costs a walk of the swapped ones.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        depths = np.zeros(len(X))
+        for idx in tree_indices:
+            features = self.model.estimators_features_[idx]
+            X_subset = X if len(features) == X.shape[1] else X[:, features]
+            leaves = self.model.estimators_[idx].apply(X_subset, check_input=False)
+            depths += (
+                self.model._decision_path_lengths[idx][leaves]
+                + self.model._average_path_length_per_tree[idx][leaves]
+                - 1.0
+            )
+        return depths
+    
+    def _scores_from_depths(self, depths: np.ndarray) -> np.ndarray:
+        """Convert summed path lengths to score_samples values"""
+        denominator = len(self.model.estimators_) * _average_path_length(self.model.max_samples_)
+        if denominator == 0:
+            return -np.ones_like(depths)
+        return -(2.0 ** (-depths / denominator))
+    
+    def _reset_window(self) -> None:
+        self._window_X: Optional[np.ndarray] = None
+        self._window_depths: Optional[np.ndarray] = None
+        self._window_len = 0
+        self._window_pos = 0
+        self._since_refresh = 0
+        self._flagged_since_refresh = 0
+    
+    def _window_append(self, X: np.ndarray, depths: np.ndarray) -> None:
+        """Push samples into the ring buffer, overwriting the oldest"""
+        X, depths = X[-self.window_size:], depths[-self.window_size:]
+        if self._window_X is None:
+            self._window_X = np.empty((self.window_size, X.shape[1]), dtype=np.float32)
+            self._window_depths = np.empty(self.window_size)
+        
+        slots = (self._window_pos + np.arange(len(X))) % self.window_size
+        self._window_X[slots] = X
+        self._window_depths[slots] = depths
+        self._window_pos = int((self._window_pos + len(X)) % self.window_size)
+        self._window_len = min(self.window_size, self._window_len + len(X))
+    
+    def _window_slots(self, n: Optional[int] = None) -> np.ndarray:
+        """Ring-buffer slots of the n most recent samples (all if None)"""
+        n = self._window_len if n is None else min(n, self._window_len)
+        return (self._window_pos - n + np.arange(n)) % self.window_size
+    
+    def _refresh_trigger(self) -> Optional[str]:
+        """'size', 'drift' or None"""
+        if self._since_refresh >= self.refresh_every:
+            return 'size'
+        if self._since_refresh >= self.model.max_samples_:
+            rate = self._flagged_since_refresh / self._since_refresh
+            if abs(rate - self.contamination) > self.drift_tolerance * self.contamination:
+                return 'drift'
+        return None
+    
+    def _refresh_oldest_trees(self) -> bool:
+        """
+        Replace the oldest `refresh_trees` trees with trees fit on recent data
+        
+        Trees are kept oldest-first, so the oldest k are always at the front.
+        Returns False (and leaves the forest unchanged) if the window holds
+        fewer samples than one tree needs.
+        """
+        from sklearn.ensemble import IsolationForest
+        
+        k = self.refresh_trees
+        max_samples = self.model.max_samples_
+        if k == 0 or self._window_len < max_samples:
+            return False
+        
+        recent = self._window_X[self._window_slots(max(self._since_refresh, max_samples))]
+        donor = IsolationForest(
+            n_estimators=k,
+            max_samples=max_samples,
+            random_state=self.random_state + self.refresh_count + 1
+        ).fit(recent)
+        
+        slots = self._window_slots()
+        window = self._window_X[slots]
+        depths = self._window_depths[slots] - self._tree_depths(window, range(k))
+        
+        # The attributes IsolationForest.score_samples reads per tree
+        model = self.model
+        model.estimators_ = model.estimators_[k:] + donor.estimators_
+        model.estimators_features_ = model.estimators_features_[k:] + donor.estimators_features_
+        model._decision_path_lengths = (
+            tuple(model._decision_path_lengths[k:]) + tuple(donor._decision_path_lengths)
+        )
+        model._average_path_length_per_tree = (
+            tuple(model._average_path_length_per_tree[k:]) + tuple(donor._average_path_length_per_tree)
+        )
+        model._seeds = np.concatenate([model._seeds[k:], donor._seeds])
+        
+        n_trees = len(model.estimators_)
+        self._window_depths[slots] = depths + self._tree_depths(window, range(n_trees - k, n_trees))
+        
+        self.refresh_count += 1
+        self._since_refresh = 0
+        self._flagged_since_refresh = 0
+        return True
+    
+    def _update_threshold(self) -> None:
+        """Re-derive the contamination threshold from the window's scores"""
+        if self._window_len < self.model.max_samples_:
+            return
+        scores = self._scores_from_depths(self._window_depths[self._window_slots()])
+        self.threshold = float(np.percentile(scores, self.contamination * 100))
+        # Keep model.predict() consistent with the online threshold
+        self.model.offset_ = self.threshold
+    
+    def _online_status(self, added: int, trigger: Optional[str]) -> Dict[str, Any]:
+        return {
+            'samples_added': added,
+            'window_size': self._window_len,
+            'refreshed': trigger is not None,
+            'trigger': trigger,
+            'refresh_count': self.refresh_count,
+            'threshold': float(self.threshold)
+        }
+    
     def save_to_registry(self) -> str:
         """Save model and register in model registry"""
         model_path = self.save()
@@ -319,10 +588,18 @@ def train_isolation_forest(
         }
 
 
+# Detectors kept in memory for online detection, least recently used first,
+# each with a lock so batches for one model are applied one at a time
+MAX_ONLINE_DETECTORS = int(os.environ.get("ML_MAX_ONLINE_DETECTORS", "32"))
+_online_detectors: "OrderedDict[str, tuple[IsolationForestAnomalyDetector, threading.Lock]]" = OrderedDict()
+_online_lock = threading.Lock()
+
+
 def detect_anomalies_with_isolation_forest(
     event_log: List[Dict[str, Any]],
     model_id: str = "isolation_forest_default",
-    train_if_not_exists: bool = True
+    train_if_not_exists: bool = True,
+    online: bool = False
 ) -> AnomalyDetectionOutput:
     """
     Detect anomalies using Isolation Forest
@@ -331,31 +608,57 @@ def detect_anomalies_with_isolation_forest(
         event_log: List of process events
         model_id: Model to use for detection
         train_if_not_exists: Train new model if not found
+        online: Keep the detector in memory and update it with each batch
+            via partial_fit() instead of loading or retraining per call
     
     Returns:
         AnomalyDetectionOutput with detected anomalies
     """
-    # Try to load from registry
-    registry = get_registry()
-    deployed = registry.get_deployed_model('isolation_forest', 'production')
-    
-    detector = IsolationForestAnomalyDetector(model_id=model_id)
+    events = validate_event_log(event_log)
+    entry = None
+    if online:
+        with _online_lock:
+            entry = _online_detectors.get(model_id)
+            if entry is not None:
+                _online_detectors.move_to_end(model_id)
     
-    if deployed and deployed['model_id'] == model_id:
-        # Load deployed model
-        detector.load(deployed['model_path'])
-    elif train_if_not_exists:
-        # Train new model
-        events = validate_event_log(event_log)
-        result = detector.train(events)
-        if not result.success:
-            raise ValueError(f"Training failed: {result.error}")
+    if entry is not None:
+        detector, lock = entry
+        with lock:
+            detector.partial_fit(events)
+            anomalies = detector.detect_anomalies(events)
     else:
-        raise ValueError(f"Model {model_id} not found and train_if_not_exists=False")
-    
-    # Detect anomalies
-    events = validate_event_log(event_log)
-    anomalies = detector.detect_anomalies(events)
+        # Deployed model, kept warm and hot-swapped by the holder
+        deployed = get_model_holder(
+            'isolation_forest', lambda mid: IsolationForestAnomalyDetector(model_id=mid)
+        ).get(model_id)
+        
+        if deployed is not None and not online:
+            detector = deployed.model
+        elif deployed is not None:
+            # partial_fit() mutates the detector, so online mode works on a
+            # private copy rather than the shared deployed instance
+            detector = IsolationForestAnomalyDetector(model_id=model_id)
+            detector.load(deployed.model_path)
+            detector.partial_fit(events)
+        elif train_if_not_exists:
+            # Train new model
+            detector = IsolationForestAnomalyDetector(model_id=model_id)
+            result = detector.train(events)
+            if not result.success:
+                raise ValueError(f"Training failed: {result.error}")
+        else:
+            raise ValueError(f"Model {model_id} not found and train_if_not_exists=False")
+        
+        # Detect anomalies
+        anomalies = detector.detect_anomalies(events)
+        
+        if online:
+            with _online_lock:
+                _online_detectors[model_id] = (detector, threading.Lock())
+                _online_detectors.move_to_end(model_id)
+                while len(_online_detectors) > MAX_ONLINE_DETECTORS:
+                    _online_detectors.popitem(last=False)
     
     return AnomalyDetectionOutput(
         total_events=len(events),
@@ -16,7 +16,10 @@ from base.ml_model_base import (
     AnomalyDetectorBase, TrainingResult, PredictionResult, TrainingError,
     PersistenceError, ArtifactStore, LifecycleContext
 )
+from base.instrumentation import input_stats
 from base.preprocessing import StandardScaler
+from base.windowing import sliding_windows, predict_in_batches
+from base.training_pipeline import PipelineConfig, fit_on_series, history_metrics
 
 
 class LSTMAutoencoderDetector(AnomalyDetectorBase):
@@ -36,26 +39,35 @@ class LSTMAutoencoderDetector(AnomalyDetectorBase):
         sequence_length: int = 10,
         encoding_dim: int = 8,
         epochs: int = 50,
-        contamination: float = 0.05
+        contamination: float = 0.05,
+        pipeline: Optional[PipelineConfig] = None
     ):
         super().__init__(model_id, "lstm_autoencoder", contamination)
         self.sequence_length = sequence_length
         self.encoding_dim = encoding_dim
         self.epochs = epochs
+        self.pipeline = pipeline or PipelineConfig()
         self.scaler: Optional[StandardScaler] = None
         
         self.metadata.hyperparameters.update({
             'sequence_length': sequence_length,
             'encoding_dim': encoding_dim,
-            'epochs': epochs
+            'epochs': epochs,
+            **self.pipeline.hyperparameters()
         })
     
     def _create_sequences(self, data: np.ndarray) -> np.ndarray:
-        """Create LSTM sequences"""
-        X = []
-        for i in range(len(data) - self.sequence_length + 1):
-            X.append(data[i:i + self.sequence_length])
-        return np.array(X)
+        """Create LSTM sequences (read-only window views)"""
+        X, _ = sliding_windows(data, self.sequence_length)
+        return X
+    
+    def _reconstruction_errors(self, X: np.ndarray) -> np.ndarray:
+        """Per-window reconstruction MSE, materializing one batch of windows at a time"""
+        return predict_in_batches(
+            lambda batch: self.model.predict(batch, verbose=0),
+            X,
+            reduce=lambda batch, reconstructions: np.mean(np.square(batch - reconstructions), axis=(1, 2))
+        )
     
     def train(self, data: Any, **kwargs) -> TrainingResult:
         """
@@ -119,16 +131,13 @@ class LSTMAutoencoderDetector(AnomalyDetectorBase):
         self.model.compile(optimizer='adam', loss='mse')
         
         # Train
-        self.model.fit(
-            X, X,
-            epochs=self.epochs,
-            batch_size=32,
-            verbose=0
+        history = fit_on_series(
+            self.model, scaled_data, self.epochs, self.pipeline,
+            input_length=self.sequence_length, autoencoder=True
         )
         
         # Calculate reconstruction errors
-        reconstructions = self.model.predict(X, verbose=0)
-        mse = np.mean(np.square(X - reconstructions), axis=(1, 2))
+        mse = self._reconstruction_errors(X)
         
         # Set threshold at contamination percentile
         self.threshold = np.percentile(mse, (1 - self.contamination) * 100)
@@ -144,7 +153,8 @@ class LSTMAutoencoderDetector(AnomalyDetectorBase):
             'encoding_dim': self.encoding_dim,
             'threshold': float(self.threshold),
             'anomalies_in_training': int(n_anomalies),
-            'anomaly_rate': float(n_anomalies / len(X))
+            'anomaly_rate': float(n_anomalies / len(X)),
+            **history_metrics(history)
         }
         
         self.metadata.performance_metrics = metrics
@@ -154,7 +164,8 @@ class LSTMAutoencoderDetector(AnomalyDetectorBase):
             model_id=self.model_id,
             model_type=self.model_type,
             operation='train',
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            data=input_stats(X)
         )
         self.after_train(after_context)
         
@@ -212,9 +223,8 @@ class LSTMAutoencoderDetector(AnomalyDetectorBase):
         scaled_data = self.scaler.transform(data)
         X = self._create_sequences(scaled_data)
         
-        # Get reconstructions
-        reconstructions = self.model.predict(X, verbose=0)
-        mse = np.mean(np.square(X - reconstructions), axis=(1, 2))
+        # Get reconstruction errors
+        mse = self._reconstruction_errors(X)
         
         # Detect anomalies
         results = []
@@ -234,7 +244,8 @@ class LSTMAutoencoderDetector(AnomalyDetectorBase):
             model_id=self.model_id,
             model_type=self.model_type,
             operation='predict',
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            data=input_stats(X)
         )
         self.after_predict(after_context)
         
@@ -353,6 +364,14 @@ class LSTMAutoencoderDetector(AnomalyDetectorBase):
         Args:
             path: Path to model directory
         """
+        from datetime import datetime
+        self.before_load(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='load',
+            timestamp=datetime.now()
+        ))
+        
         try:
             import tensorflow as tf
             from tensorflow import keras
@@ -399,7 +418,6 @@ class LSTMAutoencoderDetector(AnomalyDetectorBase):
         self.is_trained = True
         
         # Lifecycle hook
-        from datetime import datetime
         context = LifecycleContext(
             model_id=self.model_id,
             model_type=self.model_type,
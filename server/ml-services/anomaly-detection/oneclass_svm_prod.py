@@ -22,6 +22,7 @@ from base.ml_model_base import (
     ArtifactStore,
     PersistenceError
 )
+from base.instrumentation import input_stats
 from base.preprocessing import FeatureExtractor, FeatureConfig
 from base.schemas import validate_event_log
 
@@ -130,8 +131,14 @@ class OneClassSVMAnomalyDetector(AnomalyDetectorBase):
             
             self.metadata.performance_metrics = metrics
             
-            # Invoke after_train hook
-            self.after_train(context)
+            # Invoke after_train hook (fresh context carrying the input size)
+            self.after_train(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='train',
+                timestamp=datetime.now(),
+                data=input_stats(X)
+            ))
             
             return TrainingResult(
                 success=True,
@@ -185,8 +192,14 @@ class OneClassSVMAnomalyDetector(AnomalyDetectorBase):
                     'confidence': float(abs(score - self.threshold) / abs(self.threshold)) if self.threshold else 1.0
                 })
             
-            # Invoke after_predict hook
-            self.after_predict(context)
+            # Invoke after_predict hook (fresh context carrying the input size)
+            self.after_predict(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='predict',
+                timestamp=datetime.now(),
+                data=input_stats(X)
+            ))
             
             return PredictionResult(
                 predictions=results,
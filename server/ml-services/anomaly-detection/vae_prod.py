@@ -4,13 +4,16 @@ Probabilistic deep learning for anomaly detection
 """
 
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import sys
 from pathlib import Path
+from datetime import datetime
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from base.ml_model_base import AnomalyDetectorBase, TrainingResult, PredictionResult, TrainingError
+from base.ml_model_base import AnomalyDetectorBase, TrainingResult, PredictionResult, TrainingError, LifecycleContext
+from base.instrumentation import input_stats
+from base.training_pipeline import PipelineConfig, fit_on_series, history_metrics
 
 
 class VAEAnomalyDetector(AnomalyDetectorBase):
@@ -21,18 +24,21 @@ class VAEAnomalyDetector(AnomalyDetectorBase):
         model_id: str = "vae_default",
         latent_dim: int = 8,
         epochs: int = 50,
-        contamination: float = 0.05
+        contamination: float = 0.05,
+        pipeline: Optional[PipelineConfig] = None
     ):
         super().__init__(model_id, "vae", contamination)
         self.latent_dim = latent_dim
         self.epochs = epochs
+        self.pipeline = pipeline or PipelineConfig()
         self.input_dim = None
         self.scaler_mean = None
         self.scaler_std = None
         
         self.metadata.hyperparameters.update({
             'latent_dim': latent_dim,
-            'epochs': epochs
+            'epochs': epochs,
+            **self.pipeline.hyperparameters()
         })
     
     def _scale_data(self, data: np.ndarray, fit: bool = False) -> np.ndarray:
@@ -45,6 +51,13 @@ class VAEAnomalyDetector(AnomalyDetectorBase):
     
     def train(self, data: Any, **kwargs) -> TrainingResult:
         """Train VAE"""
+        self.before_train(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='train',
+            timestamp=datetime.now()
+        ))
+        
         try:
             import tensorflow as tf
             from tensorflow import keras
@@ -103,12 +116,7 @@ class VAEAnomalyDetector(AnomalyDetectorBase):
         self.model.compile(optimizer='adam')
         
         # Train
-        self.model.fit(
-            scaled_data, None,
-            epochs=self.epochs,
-            batch_size=32,
-            verbose=0
-        )
+        history = fit_on_series(self.model, scaled_data, self.epochs, self.pipeline)
         
         # Calculate reconstruction errors
         reconstructions = self.model.predict(scaled_data, verbose=0)
@@ -126,11 +134,20 @@ class VAEAnomalyDetector(AnomalyDetectorBase):
             'training_samples': len(data),
             'latent_dim': self.latent_dim,
             'threshold': float(self.threshold),
-            'anomalies_in_training': int(n_anomalies)
+            'anomalies_in_training': int(n_anomalies),
+            **history_metrics(history)
         }
         
         self.metadata.performance_metrics = metrics
         
+        self.after_train(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='train',
+            timestamp=datetime.now(),
+            data=input_stats(scaled_data)
+        ))
+        
         return TrainingResult(
             success=True,
             metrics=metrics,
@@ -142,6 +159,13 @@ class VAEAnomalyDetector(AnomalyDetectorBase):
         if not self.is_trained:
             raise ValueError("Model must be trained first")
         
+        self.before_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now()
+        ))
+        
         if isinstance(data, list):
             data = np.array(data)
         
@@ -168,6 +192,14 @@ class VAEAnomalyDetector(AnomalyDetectorBase):
                 'confidence': float(error / self.threshold) if self.threshold > 0 else 1.0
             })
         
+        self.after_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now(),
+            data=input_stats(scaled_data)
+        ))
+        
         return PredictionResult(
             predictions=results,
             metadata={'model_type': 'vae', 'total_samples': len(results)}
@@ -0,0 +1,181 @@
+"""
+Binary columnar transport for the ML Services API
+Length-prefixed raw buffers that decode zero-copy into numpy arrays
+
+Frame layout (all integers little-endian):
+
+    magic      4 bytes   b"EPQC"
+    version    uint8     FRAME_VERSION
+    reserved   3 bytes
+    meta_len   uint32    length of the UTF-8 JSON metadata block
+    n_columns  uint32
+    metadata   meta_len bytes, zero-padded to 8-byte alignment
+    columns    n_columns column blocks
+
+Column block:
+
+    name_len   uint16
+    kind       uint8     0 = numeric, 1 = dictionary-encoded string
+    dtype      uint8     index into DTYPES (numeric) / code dtype (string)
+    length     uint64    number of elements
+    name       name_len bytes, zero-padded to 8-byte alignment
+    numeric:   length * itemsize bytes of raw data, padded to 8 bytes
+    string:    codes (int32 * length, padded), then
+               n_dict uint64, offsets int64 * (n_dict + 1), utf-8 blob (padded)
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+CONTENT_TYPE = "application/vnd.epiq.columnar"
+FRAME_MAGIC = b"EPQC"
+FRAME_VERSION = 1
+
+KIND_NUMERIC = 0
+KIND_STRING = 1
+
+DTYPES = ('<f8', '<f4', '<i8', '<i4', '<u1', '<i2')
+
+_FRAME_HEADER = struct.Struct('<4sB3xII')
+_COLUMN_HEADER = struct.Struct('<HBBQ')
+_ALIGN = 8
+
+
+class TransportError(ValueError):
+    """Raised for malformed columnar frames"""
+    pass
+
+
+def is_columnar(content_type: Optional[str]) -> bool:
+    """Whether a Content-Type / Accept header selects the binary transport"""
+    return bool(content_type) and CONTENT_TYPE in content_type.lower()
+
+
+def encode_frame(columns: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Encode named columns plus JSON metadata into one frame
+    
+    Numeric arrays are written as their raw buffers; object / unicode
+    arrays are dictionary-encoded.
+    """
+    parts: List[bytes] = []
+    meta = json.dumps(metadata or {}, default=_json_default).encode('utf-8')
+    parts.append(_FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, len(meta), len(columns)))
+    parts.append(_pad(meta))
+    
+    for name, values in columns.items():
+        arr = np.asarray(values)
+        encoded_name = name.encode('utf-8')
+        
+        if arr.dtype.kind in ('U', 'S', 'O'):
+            uniques, codes = np.unique(arr.astype(np.str_), return_inverse=True)
+            codes = codes.reshape(-1).astype('<i4')
+            blobs = [u.encode('utf-8') for u in uniques.tolist()]
+            offsets = np.zeros(len(blobs) + 1, dtype='<i8')
+            offsets[1:] = np.cumsum([len(b) for b in blobs])
+            
+            parts.append(_COLUMN_HEADER.pack(len(encoded_name), KIND_STRING, DTYPES.index('<i4'), len(arr)))
+            parts.append(_pad(encoded_name))
+            parts.append(_pad(codes.tobytes()))
+            parts.append(struct.pack('<Q', len(blobs)))
+            parts.append(offsets.tobytes())
+            parts.append(_pad(b''.join(blobs)))
+        else:
+            dtype = np.dtype(arr.dtype).newbyteorder('<').str
+            if dtype == '|u1':
+                dtype = '<u1'
+            if arr.dtype == np.bool_:
+                arr, dtype = arr.astype('<u1'), '<u1'
+            if dtype not in DTYPES:
+                raise TransportError(f"Unsupported dtype for column {name}: {arr.dtype}")
+            data = np.ascontiguousarray(arr, dtype=dtype).reshape(-1)
+            
+            parts.append(_COLUMN_HEADER.pack(len(encoded_name), KIND_NUMERIC, DTYPES.index(dtype), len(data)))
+            parts.append(_pad(encoded_name))
+            parts.append(_pad(data.tobytes()))
+    
+    return b''.join(parts)
+
+
+def decode_frame(buffer: bytes) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Decode a frame into (columns, metadata)
+    
+    Numeric columns are read-only views over `buffer` (no copy). String
+    columns come back as object arrays built from their dictionary.
+    """
+    view = memoryview(buffer)
+    if len(view) < _FRAME_HEADER.size:
+        raise TransportError("Frame too short")
+    
+    magic, version, meta_len, n_columns = _FRAME_HEADER.unpack_from(view, 0)
+    if magic != FRAME_MAGIC:
+        raise TransportError("Not a columnar frame (bad magic)")
+    if version != FRAME_VERSION:
+        raise TransportError(f"Unsupported frame version: {version}")
+    
+    pos = _FRAME_HEADER.size
+    try:
+        metadata = json.loads(bytes(view[pos:pos + meta_len]).decode('utf-8')) if meta_len else {}
+    except ValueError as e:
+        raise TransportError(f"Invalid metadata: {e}")
+    if not isinstance(metadata, dict):
+        raise TransportError("Metadata must be a JSON object")
+    pos += _padded(meta_len)
+    
+    columns: Dict[str, np.ndarray] = {}
+    try:
+        for _ in range(n_columns):
+            name_len, kind, dtype_idx, length = _COLUMN_HEADER.unpack_from(view, pos)
+            pos += _COLUMN_HEADER.size
+            name = bytes(view[pos:pos + name_len]).decode('utf-8')
+            pos += _padded(name_len)
+            dtype = np.dtype(DTYPES[dtype_idx])
+            
+            data = np.frombuffer(view, dtype=dtype, count=length, offset=pos)
+            pos += _padded(length * dtype.itemsize)
+            
+            if kind == KIND_NUMERIC:
+                columns[name] = data
+            elif kind == KIND_STRING:
+                (n_dict,) = struct.unpack_from('<Q', view, pos)
+                pos += 8
+                offsets = np.frombuffer(view, dtype='<i8', count=n_dict + 1, offset=pos)
+                pos += (n_dict + 1) * 8
+                blob = bytes(view[pos:pos + int(offsets[-1])])
+                pos += _padded(int(offsets[-1]))
+                
+                dictionary = np.empty(n_dict, dtype=object)
+                dictionary[:] = [
+                    blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(n_dict)
+                ]
+                columns[name] = dictionary[data] if n_dict else np.empty(length, dtype=object)
+            else:
+                raise TransportError(f"Unknown column kind {kind} for {name}")
+    except (struct.error, ValueError, IndexError) as e:
+        if isinstance(e, TransportError):
+            raise
+        raise TransportError(f"Truncated or corrupt frame: {e}")
+    
+    return columns, metadata
+
+
+def _pad(data: bytes) -> bytes:
+    remainder = len(data) % _ALIGN
+    return data + b'\0' * (_ALIGN - remainder) if remainder else data
+
+
+def _padded(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
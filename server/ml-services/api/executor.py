@@ -0,0 +1,158 @@
+"""
+Bounded compute executor for the ML Services API
+Runs CPU-bound fitting and scoring off the asyncio event loop
+"""
+
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+import os
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the executor queue is full"""
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(f"Compute queue saturated, retry after {retry_after}s")
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a task does not finish before its request deadline"""
+    pass
+
+
+class ComputeExecutor:
+    """
+    Thread or process pool with a bounded queue and per-call deadlines
+    
+    At most `max_workers + max_queue` tasks are admitted at once; further
+    submissions fail fast with ExecutorSaturated. A task whose deadline
+    passes (or whose request is cancelled) is cancelled if it has not
+    started yet, and otherwise finishes in the background while the caller
+    gets DeadlineExceeded.
+    """
+    
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: Optional[int] = None,
+        max_queue: int = 32,
+        default_timeout: Optional[float] = None
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor kind: {kind}")
+        
+        self.kind = kind
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._avg_task_seconds = 0.0
+    
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+    
+    def deadline(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Absolute deadline (event-loop clock) for a request-level timeout"""
+        timeout = timeout if timeout is not None else self.default_timeout
+        if timeout is None:
+            return None
+        return asyncio.get_running_loop().time() + timeout
+    
+    async def run(self, fn: Callable, *args: Any, deadline: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Run `fn(*args, **kwargs)` in the pool and await its result
+        
+        Raises:
+            ExecutorSaturated: If the queue is full
+            DeadlineExceeded: If the deadline passes first
+        """
+        loop = asyncio.get_running_loop()
+        timeout = None if deadline is None else deadline - loop.time()
+        if timeout is not None and timeout <= 0:
+            with self._lock:
+                self._timeouts += 1
+            raise DeadlineExceeded("Request deadline already passed")
+        
+        with self._lock:
+            if self._admitted >= self.capacity:
+                self._rejected += 1
+                raise ExecutorSaturated(self._retry_after())
+            self._admitted += 1
+        
+        started = time.perf_counter()
+        try:
+            future = self._get_pool().submit(partial(fn, *args, **kwargs))
+        except Exception:
+            with self._lock:
+                self._admitted -= 1
+            raise
+        future.add_done_callback(lambda _: self._release(started))
+        
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise DeadlineExceeded(f"Task did not finish within {timeout:.2f}s")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+    
+    def stats(self) -> Dict[str, Any]:
+        """Executor statistics for health reporting"""
+        with self._lock:
+            return {
+                'kind': self.kind,
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self._admitted,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts,
+                'avg_task_seconds': round(self._avg_task_seconds, 4)
+            }
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool, cancelling queued tasks"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if self.kind == "process":
+                        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._pool = ThreadPoolExecutor(
+                            max_workers=self.max_workers, thread_name_prefix="ml-compute"
+                        )
+        return self._pool
+    
+    def _release(self, started: float) -> None:
+        """Done-callback: free the slot and update the task-time average"""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._admitted -= 1
+            self._completed += 1
+            # Exponentially weighted so retry hints track the current load
+            self._avg_task_seconds = 0.8 * self._avg_task_seconds + 0.2 * elapsed
+    
+    def _retry_after(self) -> int:
+        """Seconds until a slot is likely to free up (lock held)"""
+        waves = self._admitted / self.max_workers
+        return max(1, math.ceil(self._avg_task_seconds * waves))
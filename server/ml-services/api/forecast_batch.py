@@ -0,0 +1,208 @@
+"""
+Vectorized forecasting kernels for the ML Services API
+Runs the /forecast algorithms across many series held in one padded 2-D array
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+
+BATCH_ALGORITHMS = ("holt_winters", "linear_regression", "moving_average")
+
+CONFIDENCE_LEVELS = {
+    "holt_winters": 0.95,
+    "linear_regression": 0.90,
+    "moving_average": 0.80,
+}
+
+# Metrics reported as ints rather than floats
+_INTEGER_METRICS = ("window_size",)
+
+
+@dataclass
+class BatchForecast:
+    """
+    Forecasts for N series over a common horizon
+    
+    `value`, `lower` and `upper` have shape (N, horizon); every entry of
+    `metrics` is an array of shape (N,).
+    """
+    algorithm: str
+    steps: np.ndarray
+    value: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    metrics: Dict[str, np.ndarray]
+    
+    @property
+    def confidence_level(self) -> float:
+        return CONFIDENCE_LEVELS[self.algorithm]
+    
+    def series_metrics(self, row: int) -> Dict[str, Any]:
+        """Metrics of one series as plain Python values"""
+        return {
+            name: int(values[row]) if name in _INTEGER_METRICS else float(values[row])
+            for name, values in self.metrics.items()
+        }
+
+
+def pad_series(series: Sequence[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Left-align ragged series into a NaN-padded (N, max_len) float64 array
+    
+    Returns:
+        (values, lengths)
+    """
+    lengths = np.fromiter((len(s) for s in series), dtype=np.int64, count=len(series))
+    values = np.full((len(series), int(lengths.max(initial=0))), np.nan)
+    for row, s in enumerate(series):
+        values[row, :lengths[row]] = s
+    return values, lengths
+
+
+def forecast_batch(
+    values: np.ndarray,
+    lengths: np.ndarray,
+    horizon: int,
+    algorithm: str
+) -> BatchForecast:
+    """
+    Forecast every row of a padded series array
+    
+    Row i holds a series in `values[i, :lengths[i]]`; the rest is ignored.
+    Every series needs at least 3 points.
+    """
+    if algorithm not in BATCH_ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if len(lengths) and lengths.min() < 3:
+        raise ValueError("Every series needs at least 3 data points")
+    
+    values = np.asarray(values, dtype=np.float64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    steps = np.arange(1, horizon + 1)
+    
+    if algorithm == "holt_winters":
+        point, margin, metrics = _holt_winters(values, lengths, steps)
+    elif algorithm == "linear_regression":
+        point, margin, metrics = _linear_regression(values, lengths, steps)
+    else:
+        point, margin, metrics = _moving_average(values, lengths, steps)
+    
+    return BatchForecast(
+        algorithm=algorithm,
+        steps=steps,
+        value=np.maximum(0, point),
+        lower=np.maximum(0, point - margin),
+        upper=point + margin,
+        metrics=metrics
+    )
+
+
+def _holt_winters(values, lengths, steps, alpha=0.3, beta=0.1):
+    """
+    Holt's linear trend smoothing
+    
+    The recursion runs once per time step over all series still active
+    at that step. Rows are processed longest-first so the active set is
+    always a prefix and can be updated in place.
+    """
+    order = np.argsort(-lengths, kind="stable")
+    sorted_values = values[order]
+    sorted_lengths = lengths[order]
+    
+    level = sorted_values[:, 0].copy()
+    trend = np.zeros(len(level))
+    # active[t] = number of series with more than t points
+    active = np.searchsorted(-sorted_lengths, -np.arange(sorted_values.shape[1]), side="left")
+    
+    for t in range(1, sorted_values.shape[1]):
+        k = active[t]
+        prev_level = level[:k].copy()
+        level[:k] = alpha * sorted_values[:k, t] + (1 - alpha) * (level[:k] + trend[:k])
+        trend[:k] = beta * (level[:k] - prev_level) + (1 - beta) * trend[:k]
+    
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    level, trend = level[inverse], trend[inverse]
+    
+    std_dev = _masked_std(values, lengths)
+    point = level[:, None] + steps[None, :] * trend[:, None]
+    margin = 1.96 * std_dev[:, None] * np.sqrt(steps[None, :] / lengths[:, None])
+    
+    metrics = {
+        "level": level,
+        "trend": trend,
+        "alpha": np.full(len(level), alpha),
+        "beta": np.full(len(level), beta)
+    }
+    return point, margin, metrics
+
+
+def _linear_regression(values, lengths, steps):
+    """Closed-form least squares on x = 0..n-1 for every row"""
+    mask = _valid_mask(values, lengths)
+    n = lengths.astype(np.float64)
+    x = np.arange(values.shape[1], dtype=np.float64)[None, :]
+    y = np.where(mask, values, 0.0)
+    
+    x_mean = (n - 1) / 2
+    y_mean = y.sum(axis=1) / n
+    dx = np.where(mask, x - x_mean[:, None], 0.0)
+    slope = (dx * (y - y_mean[:, None])).sum(axis=1) / (dx * dx).sum(axis=1)
+    intercept = y_mean - slope * x_mean
+    
+    residuals = np.where(mask, y - (intercept[:, None] + slope[:, None] * x), 0.0)
+    ss_res = (residuals ** 2).sum(axis=1)
+    ss_tot = (np.where(mask, y - y_mean[:, None], 0.0) ** 2).sum(axis=1)
+    # Constant series: perfect fit scores 1.0, anything else 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_squared = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.where(ss_res == 0, 1.0, 0.0))
+    
+    residual_std = np.sqrt(ss_res / n)
+    future_x = (lengths[:, None] - 1 + steps[None, :]).astype(np.float64)
+    point = intercept[:, None] + slope[:, None] * future_x
+    margin = np.repeat(
+        (1.645 * residual_std * np.sqrt(1 + 1 / n))[:, None], len(steps), axis=1
+    )
+    
+    metrics = {
+        "slope": slope,
+        "intercept": intercept,
+        "r_squared": r_squared
+    }
+    return point, margin, metrics
+
+
+def _moving_average(values, lengths, steps, max_window=7):
+    """Mean and spread of the last min(7, n // 2) points of every row"""
+    window = np.minimum(max_window, lengths // 2)
+    offsets = np.arange(max_window)[None, :]
+    in_window = offsets < window[:, None]
+    index = np.where(in_window, lengths[:, None] - window[:, None] + offsets, 0)
+    tail = np.where(in_window, np.take_along_axis(values, index, axis=1), 0.0)
+    
+    ma = tail.sum(axis=1) / window
+    spread = np.where(in_window, tail - ma[:, None], 0.0)
+    std_dev = np.sqrt((spread ** 2).sum(axis=1) / window)
+    
+    point = np.repeat(ma[:, None], len(steps), axis=1)
+    margin = 1.28 * std_dev[:, None] * np.sqrt(steps[None, :] / window[:, None])
+    
+    metrics = {
+        "window_size": window,
+        "moving_average": ma,
+        "std_dev": std_dev
+    }
+    return point, margin, metrics
+
+
+def _valid_mask(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    return np.arange(values.shape[1])[None, :] < lengths[:, None]
+
+
+def _masked_std(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    mask = _valid_mask(values, lengths)
+    mean = np.where(mask, values, 0.0).sum(axis=1) / lengths
+    return np.sqrt((np.where(mask, values - mean[:, None], 0.0) ** 2).sum(axis=1) / lengths)
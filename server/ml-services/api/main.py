@@ -3,22 +3,108 @@ FastAPI Server for EPI-Q ML Services
 Bridges Python ML models with TypeScript backend
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Any, Optional, Callable, Tuple
 import numpy as np
 from datetime import datetime
+from functools import partial
+import os
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from base.instrumentation import PROMETHEUS_CONTENT_TYPE, get_metrics_registry, get_phase_instrumentation
+from base.columnar import (
+    factorize,
+    get_column,
+    hour_and_weekday,
+    map_uniques,
+    parse_timestamps,
+    previous_in_case,
+    segment_cases,
+    stack_features,
+    to_float,
+)
+from api.model_cache import ModelCache, MODEL_MODES, MODEL_MODE_CACHED, MODEL_MODE_REFIT
+from api.executor import ComputeExecutor, ExecutorSaturated, DeadlineExceeded
+from api.columnar_transport import (
+    CONTENT_TYPE as COLUMNAR_CONTENT_TYPE,
+    TransportError,
+    decode_frame,
+    encode_frame,
+    is_columnar,
+)
+from api.forecast_batch import BATCH_ALGORITHMS, forecast_batch, pad_series
+from api.tracing import TracingRoute, for_compute_pool, from_compute_pool, register_algorithms, stage
+from api.streaming import (
+    CaseStreamState,
+    LineChunker,
+    FORMAT_CSV,
+    detect_format,
+    parse_csv_header,
+    parse_csv_lines,
+    parse_ndjson_lines,
+)
+
+# Binary columnar variants of JSON endpoints, keyed by route path
+_COLUMNAR_HANDLERS: Dict[str, Callable] = {}
+
+
+def columnar_variant(path: str) -> Callable:
+    """Register the binary columnar handler for a JSON endpoint"""
+    def decorator(handler: Callable) -> Callable:
+        _COLUMNAR_HANDLERS[path] = handler
+        return handler
+    return decorator
+
+
+class ColumnarRoute(APIRoute):
+    """
+    Route that serves the binary columnar content type alongside JSON
+    
+    Requests sent with Content-Type: application/vnd.epiq.columnar skip
+    pydantic body parsing and go to the handler registered with
+    `columnar_variant`, which returns (columns, metadata) for the response
+    frame.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        json_handler = super().get_route_handler()
+        path = self.path
+        
+        async def route_handler(request: Request) -> Response:
+            handler = _COLUMNAR_HANDLERS.get(path)
+            if handler is None or not is_columnar(request.headers.get("content-type")):
+                return await json_handler(request)
+            
+            try:
+                columns, metadata = decode_frame(await request.body())
+            except TransportError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            
+            out_columns, out_metadata = await handler(columns, metadata)
+            return Response(
+                content=encode_frame(out_columns, out_metadata),
+                media_type=COLUMNAR_CONTENT_TYPE
+            )
+        
+        return route_handler
+
+
+class ServiceRoute(TracingRoute, ColumnarRoute):
+    """Columnar-aware route whose JSON and columnar requests are both traced"""
+
+
 app = FastAPI(
     title="EPI-Q ML Services API",
     description="Production-ready ML algorithms for process mining",
     version="1.0.0"
 )
+app.router.route_class = ServiceRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +114,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+model_cache = ModelCache(
+    max_entries=int(os.environ.get("ML_MODEL_CACHE_MAX_ENTRIES", "128")),
+    ttl_seconds=float(os.environ.get("ML_MODEL_CACHE_TTL_SECONDS", "900")),
+    max_bytes=int(float(os.environ.get("ML_MODEL_CACHE_MAX_MB", "512")) * 1024 * 1024)
+)
+
+compute_executor = ComputeExecutor(
+    kind=os.environ.get("ML_EXECUTOR_KIND", "thread"),
+    max_workers=int(os.environ.get("ML_EXECUTOR_WORKERS", "0")) or None,
+    max_queue=int(os.environ.get("ML_EXECUTOR_MAX_QUEUE", "32")),
+    default_timeout=float(os.environ["ML_REQUEST_TIMEOUT_SECONDS"]) if os.environ.get("ML_REQUEST_TIMEOUT_SECONDS") else None
+)
+
 
 class EventLog(BaseModel):
     case_id: str
@@ -41,6 +140,9 @@ class AnomalyDetectionRequest(BaseModel):
     events: List[EventLog]
     algorithm: str = "isolation_forest"
     contamination: float = 0.05
+    tenant_id: Optional[str] = None
+    model_mode: str = "auto"  # "auto", "cached" or "refit"
+    timeout_seconds: Optional[float] = None
 
 
 class AnomalyDetectionResponse(BaseModel):
@@ -58,6 +160,7 @@ class ForecastRequest(BaseModel):
     timestamps: Optional[List[str]] = None
     horizon: int = 30
     algorithm: str = "holt_winters"
+    timeout_seconds: Optional[float] = None
 
 
 class ForecastResponse(BaseModel):
@@ -68,50 +171,94 @@ class ForecastResponse(BaseModel):
     confidence_intervals: Dict[str, Any]
 
 
+class BatchForecastRequest(BaseModel):
+    series: Dict[str, List[float]]
+    horizon: int = 30
+    algorithm: str = "holt_winters"
+    timeout_seconds: Optional[float] = None
+
+
+class SeriesForecast(BaseModel):
+    forecast: List[Dict[str, Any]]
+    metrics: Dict[str, Any]
+
+
+class BatchForecastResponse(BaseModel):
+    success: bool
+    algorithm: str
+    forecasts: Dict[str, SeriesForecast]
+    confidence_intervals: Dict[str, Any]
+
+
 class HealthResponse(BaseModel):
     status: str
     algorithms_available: Dict[str, List[str]]
     version: str
+    model_cache: Dict[str, Any] = {}
+    executor: Dict[str, Any] = {}
 
 
 def extract_features(events: List[EventLog]) -> np.ndarray:
-    """Extract numerical features from event logs for ML models"""
-    features = []
+    """
+    Extract numerical features from event logs for ML models
     
-    case_events = {}
-    for event in events:
-        if event.case_id not in case_events:
-            case_events[event.case_id] = []
-        case_events[event.case_id].append(event)
+    Rows are aligned with the input events so model outputs can be mapped
+    straight back to `events[i]`.
+    """
+    if not events:
+        return np.zeros((1, 6), dtype=np.float32)
     
-    for case_id, case_data in case_events.items():
-        sorted_events = sorted(case_data, key=lambda x: x.timestamp)
-        
-        for i, event in enumerate(sorted_events):
-            try:
-                ts = datetime.fromisoformat(event.timestamp.replace('Z', '+00:00'))
-            except:
-                ts = datetime.now()
-            
-            duration = event.duration if event.duration else 0
-            if i > 0:
-                try:
-                    prev_ts = datetime.fromisoformat(sorted_events[i-1].timestamp.replace('Z', '+00:00'))
-                    duration = (ts - prev_ts).total_seconds()
-                except:
-                    pass
-            
-            feature_vector = [
-                ts.hour,
-                ts.weekday(),
-                len(case_data),
-                i,
-                duration,
-                hash(event.activity) % 1000,
-            ]
-            features.append(feature_vector)
+    return extract_column_features(
+        case_ids=get_column(events, 'case_id'),
+        activities=get_column(events, 'activity'),
+        timestamps=get_column(events, 'timestamp'),
+        durations=get_column(events, 'duration')
+    )
+
+
+def extract_column_features(
+    case_ids: np.ndarray,
+    activities: np.ndarray,
+    timestamps: np.ndarray,
+    durations: np.ndarray,
+    case_state: Optional[CaseStreamState] = None
+) -> np.ndarray:
+    """
+    Columnar core of `extract_features`
+    
+    With `case_state`, per-case positions and gaps continue from earlier
+    chunks of the same stream.
+    """
+    parsed = parse_timestamps(timestamps, fill_invalid=datetime.now())
+    
+    # Order events within each case by their timestamp string
+    case_codes, case_uniques = factorize(case_ids)
+    ts_rank, _ = factorize(timestamps)
+    segments = segment_cases(case_codes, order_key=ts_rank)
     
-    return np.array(features) if features else np.array([[0]*6])
+    prev_utc, has_prev = previous_in_case(parsed.utc, segments)
+    prev_valid, _ = previous_in_case(parsed.valid, segments)
+    position, case_size = segments.position, segments.case_size
+    if case_state is not None:
+        position, case_size, prev_utc, prev_valid, has_prev = case_state.advance(
+            case_codes, case_uniques, segments, parsed, prev_utc, prev_valid, has_prev
+        )
+    
+    duration = to_float(durations, falsy_as_missing=True)
+    use_gap = has_prev & prev_valid
+    duration[use_gap] = (parsed.utc[use_gap] - prev_utc[use_gap]) / 1e6
+    
+    hour, weekday = hour_and_weekday(parsed.wall)
+    activity_hash = map_uniques(activities, lambda a: hash(a) % 1000)
+    
+    return stack_features([
+        hour,
+        weekday,
+        case_size,
+        position,
+        duration,
+        activity_hash,
+    ])
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -135,8 +282,153 @@ async def health_check():
                 "parameter_based"
             ]
         },
-        version="1.0.0"
+        version="1.0.0",
+        model_cache=model_cache.stats(),
+        executor=compute_executor.stats()
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Process metrics in the Prometheus text exposition format"""
+    # Register the lifecycle phase families so they are listed before first use
+    get_phase_instrumentation()
+    return Response(get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    compute_executor.shutdown()
+
+
+async def _offload(fn: Callable, *args: Any, deadline: Optional[float] = None, **kwargs: Any) -> Any:
+    """
+    Run CPU-bound work in the compute pool, mapping saturation/deadlines to HTTP errors
+    
+    The call is traced as a stage named after `fn` (profiled in profile mode).
+    """
+    name = getattr(fn, "__name__", None) or getattr(fn, "func", fn).__name__
+    task = for_compute_pool(partial(fn, *args, **kwargs), in_thread=compute_executor.kind == "thread")
+    try:
+        with stage(name.lstrip("_")):
+            return from_compute_pool(await compute_executor.run(task, deadline=deadline))
+    except ExecutorSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
+
+def _fit_isolation_forest(X: np.ndarray, contamination: float) -> Any:
+    """Fit an Isolation Forest on the feature matrix"""
+    from sklearn.ensemble import IsolationForest
+    
+    model = IsolationForest(
+        contamination=contamination,
+        n_estimators=100,
+        max_samples=min(256, len(X)),
+        random_state=42,
+        n_jobs=-1
     )
+    return model.fit(X)
+
+
+def _fit_dbscan(X: np.ndarray, eps: float, min_samples: int) -> Dict[str, Any]:
+    """Fit scaler + DBSCAN and index the core samples for out-of-sample scoring"""
+    from sklearn.cluster import DBSCAN
+    from sklearn.neighbors import NearestNeighbors
+    from sklearn.preprocessing import StandardScaler
+    
+    with stage("scale"):
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+    
+    with stage("fit"):
+        db = DBSCAN(eps=eps, min_samples=min_samples)
+        labels = db.fit_predict(X_scaled)
+    
+    core_index = None
+    if len(db.core_sample_indices_) > 0:
+        with stage("index_core_samples"):
+            core_index = NearestNeighbors(n_neighbors=1).fit(db.components_)
+    
+    return {
+        "scaler": scaler,
+        "eps": eps,
+        "core_index": core_index,
+        "core_labels": labels[db.core_sample_indices_],
+        "training_labels": labels
+    }
+
+
+def _score_isolation_forest(model: Any, X: np.ndarray, contamination: float) -> Dict[str, Any]:
+    """Predict labels and scores plus the percentile cut-offs used for severity"""
+    with stage("score_samples"):
+        scores = model.score_samples(X)
+    with stage("predict"):
+        predictions = model.predict(X)
+    with stage("percentiles"):
+        severity_cutoff, threshold = np.percentile(scores, [5, contamination * 100])
+    return {
+        "predictions": predictions,
+        "scores": scores,
+        "severity_cutoff": float(severity_cutoff),
+        "threshold": float(threshold)
+    }
+
+
+def _dbscan_labels(fitted: Dict[str, Any], X: np.ndarray, is_training_window: bool) -> np.ndarray:
+    """Label points by the nearest core sample within eps (-1 = noise)"""
+    if is_training_window:
+        return fitted["training_labels"]
+    
+    labels = np.full(len(X), -1, dtype=int)
+    if fitted["core_index"] is None:
+        return labels
+    
+    distances, indices = fitted["core_index"].kneighbors(fitted["scaler"].transform(X))
+    within = distances[:, 0] <= fitted["eps"]
+    labels[within] = fitted["core_labels"][indices[within, 0]]
+    return labels
+
+
+async def _resolve_model(
+    tenant_id: Optional[str],
+    model_mode: str,
+    algorithm: str,
+    hyperparameters: Dict[str, Any],
+    X: np.ndarray,
+    fit: Callable[[np.ndarray], Any],
+    deadline: Optional[float] = None
+) -> Tuple[Any, str, bool]:
+    """
+    Fetch a fitted model from the warm cache or fit a new one
+    
+    Returns:
+        (model, cache_status, fitted_on_this_window)
+    """
+    if model_mode not in MODEL_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown model_mode: {model_mode}"
+        )
+    
+    key = model_cache.make_key(tenant_id, algorithm, hyperparameters, X)
+    
+    if model_mode != MODEL_MODE_REFIT:
+        model, exact = model_cache.lookup(key, allow_latest=model_mode == MODEL_MODE_CACHED)
+        if model is not None:
+            return model, ("hit" if exact else "hit_latest"), exact
+    
+    model = await _offload(fit, X, deadline=deadline)
+    model_cache.put(key, model)
+    return model, "refit" if model_mode == MODEL_MODE_REFIT else "miss", True
+
+
+ANOMALY_ALGORITHMS = ("isolation_forest", "statistical_zscore", "dbscan")
 
 
 @app.post("/anomaly-detection", response_model=AnomalyDetectionResponse)
@@ -149,22 +441,31 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
                 detail="Insufficient data: need at least 10 events for anomaly detection"
             )
         
-        X = extract_features(request.events)
+        if request.algorithm not in ANOMALY_ALGORITHMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown algorithm: {request.algorithm}"
+            )
+        
+        deadline = compute_executor.deadline(request.timeout_seconds)
+        X = await _offload(extract_features, request.events, deadline=deadline)
         
         if request.algorithm == "isolation_forest":
-            from sklearn.ensemble import IsolationForest
-            
-            model = IsolationForest(
-                contamination=request.contamination,
-                n_estimators=100,
-                max_samples=min(256, len(X)),
-                random_state=42,
-                n_jobs=-1
+            model, cache_status, _ = await _resolve_model(
+                request.tenant_id,
+                request.model_mode,
+                "isolation_forest",
+                {"contamination": request.contamination},
+                X,
+                partial(_fit_isolation_forest, contamination=request.contamination),
+                deadline=deadline
             )
             
-            model.fit(X)
-            predictions = model.predict(X)
-            scores = model.score_samples(X)
+            scored = await _offload(
+                _score_isolation_forest, model, X, request.contamination, deadline=deadline
+            )
+            predictions = scored["predictions"]
+            scores = scored["scores"]
             
             anomalies = []
             for i, (pred, score) in enumerate(zip(predictions, scores)):
@@ -177,7 +478,7 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
                             "activity": event.activity,
                             "timestamp": event.timestamp,
                             "anomaly_score": float(-score),
-                            "severity": "high" if score < np.percentile(scores, 5) else "medium"
+                            "severity": "high" if score < scored["severity_cutoff"] else "medium"
                         })
             
             return AnomalyDetectionResponse(
@@ -188,14 +489,15 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
                 anomaly_rate=len(anomalies) / len(request.events),
                 anomalies=anomalies[:100],
                 model_metrics={
-                    "threshold": float(np.percentile(scores, request.contamination * 100)),
+                    "threshold": scored["threshold"],
                     "mean_score": float(np.mean(scores)),
-                    "std_score": float(np.std(scores))
+                    "std_score": float(np.std(scores)),
+                    "model_cache": cache_status
                 }
             )
         
         elif request.algorithm == "statistical_zscore":
-            durations = np.array([e.duration if e.duration else 0 for e in request.events])
+            durations = to_float(get_column(request.events, 'duration'), falsy_as_missing=True)
             if durations.std() > 0:
                 z_scores = np.abs((durations - durations.mean()) / durations.std())
             else:
@@ -229,14 +531,16 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
             )
         
         elif request.algorithm == "dbscan":
-            from sklearn.cluster import DBSCAN
-            from sklearn.preprocessing import StandardScaler
-            
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
-            
-            db = DBSCAN(eps=0.5, min_samples=5)
-            labels = db.fit_predict(X_scaled)
+            fitted, cache_status, same_window = await _resolve_model(
+                request.tenant_id,
+                request.model_mode,
+                "dbscan",
+                {"eps": 0.5, "min_samples": 5},
+                X,
+                partial(_fit_dbscan, eps=0.5, min_samples=5),
+                deadline=deadline
+            )
+            labels = await _offload(_dbscan_labels, fitted, X, same_window, deadline=deadline)
             
             anomalies = []
             for i, label in enumerate(labels):
@@ -261,7 +565,8 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
                 anomalies=anomalies[:100],
                 model_metrics={
                     "n_clusters": int(len(set(labels)) - (1 if -1 in labels else 0)),
-                    "noise_ratio": float(sum(1 for l in labels if l == -1) / len(labels))
+                    "noise_ratio": float(sum(1 for l in labels if l == -1) / len(labels)),
+                    "model_cache": cache_status
                 }
             )
         
@@ -277,135 +582,366 @@ async def detect_anomalies(request: AnomalyDetectionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/forecast", response_model=ForecastResponse)
-async def generate_forecast(request: ForecastRequest):
-    """Generate time series forecasts using ML algorithms"""
+STREAM_ALGORITHMS = ("isolation_forest", "dbscan")
+
+
+def _stream_chunk_features(
+    lines: List[bytes],
+    body_format: str,
+    header: Optional[List[str]],
+    case_state: CaseStreamState
+) -> Tuple[Dict[str, np.ndarray], np.ndarray, CaseStreamState]:
+    """Parse one chunk of body lines and extract its features (executes in the compute pool)"""
+    if body_format == FORMAT_CSV:
+        columns = parse_csv_lines(lines, header)
+    else:
+        columns = parse_ndjson_lines(lines)
+    
+    X = extract_column_features(
+        case_ids=columns['case_id'],
+        activities=columns['activity'],
+        timestamps=columns['timestamp'],
+        durations=columns['duration'],
+        case_state=case_state
+    )
+    return columns, X, case_state
+
+
+@app.post("/anomaly-detection/stream", response_model=AnomalyDetectionResponse)
+async def detect_anomalies_stream(
+    request: Request,
+    algorithm: str = "isolation_forest",
+    contamination: float = 0.05,
+    chunk_size: int = 50000,
+    tenant_id: Optional[str] = None,
+    model_mode: str = "auto",
+    timeout_seconds: Optional[float] = None
+):
+    """
+    Detect anomalies in an event log streamed as NDJSON or CSV
+    
+    The body is parsed and scored chunk by chunk: the model is fitted on
+    (or fetched from the cache for) the first chunk and every later chunk is
+    scored against it, so memory is bounded by `chunk_size`, not log size.
+    """
     try:
-        if len(request.values) < 3:
+        if algorithm not in STREAM_ALGORITHMS:
             raise HTTPException(
                 status_code=400,
-                detail="Insufficient data: need at least 3 data points for forecasting"
+                detail=f"Algorithm {algorithm} does not support streaming; use one of {list(STREAM_ALGORITHMS)}"
             )
+        if chunk_size < 10:
+            raise HTTPException(status_code=400, detail="chunk_size must be at least 10")
         
-        values = np.array(request.values)
+        body_format = detect_format(request.headers.get("content-type"))
+        deadline = compute_executor.deadline(timeout_seconds)
+        chunker = LineChunker(chunk_size)
+        case_state = CaseStreamState()
         
-        if request.algorithm == "holt_winters":
-            alpha = 0.3
-            beta = 0.1
-            
-            level = values[0]
-            trend = 0
-            
-            for i in range(1, len(values)):
-                prev_level = level
-                level = alpha * values[i] + (1 - alpha) * (level + trend)
-                trend = beta * (level - prev_level) + (1 - beta) * trend
-            
-            forecast = []
-            std_dev = float(np.std(values))
-            
-            for i in range(1, request.horizon + 1):
-                point_forecast = level + i * trend
-                margin = 1.96 * std_dev * np.sqrt(i / len(values))
-                
-                forecast.append({
-                    "step": i,
-                    "value": max(0, float(point_forecast)),
-                    "lower": max(0, float(point_forecast - margin)),
-                    "upper": float(point_forecast + margin)
-                })
-            
-            return ForecastResponse(
-                success=True,
-                algorithm="holt_winters",
-                forecast=forecast,
-                metrics={
-                    "level": float(level),
-                    "trend": float(trend),
-                    "alpha": alpha,
-                    "beta": beta
-                },
-                confidence_intervals={
-                    "confidence_level": 0.95,
-                    "method": "prediction_interval"
-                }
-            )
+        header: Optional[List[str]] = None
+        model = None
+        cache_status = None
+        same_window = False
+        severity_cutoff = threshold = 0.0
+        total_events = 0
+        n_anomalies = 0
+        n_chunks = 0
+        score_sum = score_sq_sum = 0.0
+        noise_count = 0
+        clusters = set()
+        anomalies: List[Dict[str, Any]] = []
         
-        elif request.algorithm == "linear_regression":
-            from sklearn.linear_model import LinearRegression
-            
-            X = np.arange(len(values)).reshape(-1, 1)
-            y = values
+        async def process(lines: List[bytes]) -> None:
+            nonlocal header, model, cache_status, same_window, severity_cutoff, threshold
+            nonlocal total_events, n_anomalies, n_chunks, score_sum, score_sq_sum, noise_count
+            nonlocal case_state
             
-            model = LinearRegression()
-            model.fit(X, y)
+            if body_format == FORMAT_CSV and header is None:
+                header = parse_csv_header(lines[0])
+                lines = lines[1:]
+                if not lines:
+                    return
             
-            future_X = np.arange(len(values), len(values) + request.horizon).reshape(-1, 1)
-            predictions = model.predict(future_X)
+            # Process workers advance a pickled copy of the state; keep theirs
+            columns, X, case_state = await _offload(
+                _stream_chunk_features, lines, body_format, header, case_state, deadline=deadline
+            )
             
-            residuals = y - model.predict(X)
-            std_dev = float(np.std(residuals))
+            if model is None:
+                if len(X) < 10:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Insufficient data: need at least 10 events for anomaly detection"
+                    )
+                if algorithm == "isolation_forest":
+                    fit = partial(_fit_isolation_forest, contamination=contamination)
+                    hyperparameters = {"contamination": contamination}
+                else:
+                    fit = partial(_fit_dbscan, eps=0.5, min_samples=5)
+                    hyperparameters = {"eps": 0.5, "min_samples": 5}
+                model, cache_status, same_window = await _resolve_model(
+                    tenant_id, model_mode, algorithm, hyperparameters, X, fit, deadline=deadline
+                )
             
-            forecast = []
-            for i, pred in enumerate(predictions):
-                margin = 1.645 * std_dev * np.sqrt(1 + 1/len(values))
-                forecast.append({
-                    "step": i + 1,
-                    "value": max(0, float(pred)),
-                    "lower": max(0, float(pred - margin)),
-                    "upper": float(pred + margin)
-                })
+            if algorithm == "isolation_forest":
+                scored = await _offload(
+                    _score_isolation_forest, model, X, contamination, deadline=deadline
+                )
+                if n_chunks == 0:
+                    severity_cutoff = scored["severity_cutoff"]
+                    threshold = scored["threshold"]
+                scores = scored["scores"]
+                score_sum += float(scores.sum())
+                score_sq_sum += float(np.square(scores, dtype=np.float64).sum())
+                flagged = np.flatnonzero(scored["predictions"] == -1)
+            else:
+                labels = await _offload(
+                    _dbscan_labels, model, X, same_window and n_chunks == 0, deadline=deadline
+                )
+                flagged = np.flatnonzero(labels == -1)
+                noise_count += len(flagged)
+                clusters.update(np.unique(labels[labels != -1]).tolist())
             
-            return ForecastResponse(
-                success=True,
-                algorithm="linear_regression",
-                forecast=forecast,
-                metrics={
-                    "slope": float(model.coef_[0]),
-                    "intercept": float(model.intercept_),
-                    "r_squared": float(model.score(X, y))
-                },
-                confidence_intervals={
-                    "confidence_level": 0.90,
-                    "method": "prediction_interval"
+            for i in flagged[:max(0, 100 - len(anomalies))].tolist():
+                anomaly = {
+                    "index": total_events + i,
+                    "case_id": str(columns['case_id'][i]),
+                    "activity": str(columns['activity'][i]),
+                    "timestamp": str(columns['timestamp'][i]),
                 }
-            )
-        
-        elif request.algorithm == "moving_average":
-            window = min(7, len(values) // 2)
-            ma = float(np.mean(values[-window:]))
-            std_dev = float(np.std(values[-window:]))
-            
-            forecast = []
-            for i in range(1, request.horizon + 1):
-                margin = 1.28 * std_dev * np.sqrt(i / window)
-                forecast.append({
-                    "step": i,
-                    "value": max(0, ma),
-                    "lower": max(0, ma - margin),
-                    "upper": ma + margin
-                })
+                if algorithm == "isolation_forest":
+                    anomaly["anomaly_score"] = float(-scores[i])
+                    anomaly["severity"] = "high" if scores[i] < severity_cutoff else "medium"
+                else:
+                    anomaly["cluster"] = -1
+                    anomaly["severity"] = "medium"
+                anomalies.append(anomaly)
             
-            return ForecastResponse(
-                success=True,
-                algorithm="moving_average",
-                forecast=forecast,
-                metrics={
-                    "window_size": window,
-                    "moving_average": ma,
-                    "std_dev": std_dev
-                },
-                confidence_intervals={
-                    "confidence_level": 0.80,
-                    "method": "prediction_interval"
-                }
-            )
+            n_anomalies += len(flagged)
+            total_events += len(X)
+            n_chunks += 1
         
+        async for data in request.stream():
+            for lines in chunker.feed(data):
+                await process(lines)
+        for lines in chunker.finish():
+            await process(lines)
+        
+        if total_events == 0:
+            raise HTTPException(status_code=400, detail="Request body contained no events")
+        
+        if algorithm == "isolation_forest":
+            mean_score = score_sum / total_events
+            model_metrics = {
+                "threshold": threshold,
+                "mean_score": mean_score,
+                "std_score": float(np.sqrt(max(score_sq_sum / total_events - mean_score ** 2, 0.0)))
+            }
         else:
+            model_metrics = {
+                "n_clusters": len(clusters),
+                "noise_ratio": noise_count / total_events
+            }
+        model_metrics.update({"model_cache": cache_status, "chunks": n_chunks, "chunk_size": chunk_size})
+        
+        return AnomalyDetectionResponse(
+            success=True,
+            algorithm=algorithm,
+            total_events=total_events,
+            anomalies_detected=n_anomalies,
+            anomaly_rate=n_anomalies / total_events,
+            anomalies=anomalies,
+            model_metrics=model_metrics
+        )
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+FORECAST_ALGORITHMS = BATCH_ALGORITHMS
+
+
+def _forecast_arrays(
+    values: np.ndarray,
+    horizon: int,
+    algorithm: str
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any], Dict[str, Any]]:
+    """
+    Run the selected forecasting algorithm (executes in the compute pool)
+    
+    Returns:
+        (arrays with step/value/lower/upper, metrics, confidence_intervals)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = forecast_batch(values[None, :], np.array([len(values)]), horizon, algorithm)
+    
+    arrays = {
+        "step": result.steps,
+        "value": result.value[0],
+        "lower": result.lower[0],
+        "upper": result.upper[0]
+    }
+    confidence_intervals = {
+        "confidence_level": result.confidence_level,
+        "method": "prediction_interval"
+    }
+    return arrays, result.series_metrics(0), confidence_intervals
+
+
+def _forecast_points(arrays: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Convert forecast arrays to the JSON list-of-points shape"""
+    return [
+        {"step": step, "value": value, "lower": lower, "upper": upper}
+        for step, value, lower, upper in zip(
+            arrays["step"].tolist(),
+            np.asarray(arrays["value"], dtype=float).tolist(),
+            np.asarray(arrays["lower"], dtype=float).tolist(),
+            np.asarray(arrays["upper"], dtype=float).tolist()
+        )
+    ]
+
+
+def _compute_forecast(request: ForecastRequest) -> ForecastResponse:
+    """Forecast for the JSON API (executes in the compute pool)"""
+    with stage("forecast"):
+        arrays, metrics, confidence_intervals = _forecast_arrays(
+            np.array(request.values), request.horizon, request.algorithm
+        )
+    with stage("build_response"):
+        return ForecastResponse(
+            success=True,
+            algorithm=request.algorithm,
+            forecast=_forecast_points(arrays),
+            metrics=metrics,
+            confidence_intervals=confidence_intervals
+        )
+
+
+@app.post("/forecast", response_model=ForecastResponse)
+async def generate_forecast(request: ForecastRequest):
+    """Generate time series forecasts using ML algorithms"""
+    try:
+        if len(request.values) < 3:
+            raise HTTPException(
+                status_code=400,
+                detail="Insufficient data: need at least 3 data points for forecasting"
+            )
+        
+        if request.algorithm not in FORECAST_ALGORITHMS:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unknown algorithm: {request.algorithm}"
             )
+        
+        return await _offload(
+            _compute_forecast, request,
+            deadline=compute_executor.deadline(request.timeout_seconds)
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _validate_batch(lengths: Dict[str, int], algorithm: str) -> None:
+    if not lengths:
+        raise HTTPException(status_code=400, detail="No series provided")
+    short = [name for name, length in lengths.items() if length < 3]
+    if short:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient data: need at least 3 data points per series ({short[:10]})"
+        )
+    if algorithm not in FORECAST_ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {algorithm}")
+
+
+def _compute_batch_forecast(request: BatchForecastRequest) -> BatchForecastResponse:
+    """Forecast every series of a batch request (executes in the compute pool)"""
+    names = list(request.series)
+    values, lengths = pad_series([request.series[name] for name in names])
+    result = forecast_batch(values, lengths, request.horizon, request.algorithm)
+    
+    steps = result.steps.tolist()
+    forecasts = {}
+    for row, (name, value, lower, upper) in enumerate(
+        zip(names, result.value.tolist(), result.lower.tolist(), result.upper.tolist())
+    ):
+        forecasts[name] = SeriesForecast(
+            forecast=[
+                {"step": step, "value": v, "lower": lo, "upper": up}
+                for step, v, lo, up in zip(steps, value, lower, upper)
+            ],
+            metrics=result.series_metrics(row)
+        )
+    
+    return BatchForecastResponse(
+        success=True,
+        algorithm=request.algorithm,
+        forecasts=forecasts,
+        confidence_intervals={
+            "confidence_level": result.confidence_level,
+            "method": "prediction_interval"
+        }
+    )
+
+
+def _compute_long_batch_forecast(
+    series_ids: np.ndarray,
+    values: np.ndarray,
+    horizon: int,
+    algorithm: str
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Forecast long-format (series_id, value) columns (executes in the compute pool)
+    
+    Returns:
+        (long-format forecast columns, metadata)
+    """
+    codes, names = factorize(series_ids)
+    counts = np.bincount(codes, minlength=len(names))
+    order = np.argsort(codes, kind="stable")
+    position = np.arange(len(codes)) - np.repeat(np.cumsum(counts) - counts, counts)
+    padded = np.full((len(names), int(counts.max())), np.nan)
+    padded[codes[order], position] = np.asarray(values, dtype=np.float64)[order]
+    result = forecast_batch(padded, counts, horizon, algorithm)
+    
+    columns = {
+        "series_id": np.repeat(names, horizon).astype(object),
+        "step": np.tile(result.steps, len(names)),
+        "value": result.value.reshape(-1),
+        "lower": result.lower.reshape(-1),
+        "upper": result.upper.reshape(-1)
+    }
+    return columns, {
+        "success": True,
+        "algorithm": algorithm,
+        "series": names.tolist(),
+        "metrics": {name: metric.tolist() for name, metric in result.metrics.items()},
+        "confidence_intervals": {
+            "confidence_level": result.confidence_level,
+            "method": "prediction_interval"
+        }
+    }
+
+
+@app.post("/forecast/batch", response_model=BatchForecastResponse)
+async def generate_batch_forecast(request: BatchForecastRequest):
+    """Forecast many (possibly ragged) series in one call"""
+    try:
+        _validate_batch(
+            {name: len(values) for name, values in request.series.items()},
+            request.algorithm
+        )
+        return await _offload(
+            _compute_batch_forecast, request,
+            deadline=compute_executor.deadline(request.timeout_seconds)
+        )
     
     except HTTPException:
         raise
@@ -418,6 +954,7 @@ class SimulationRequest(BaseModel):
     parameters: Dict[str, Any]
     num_simulations: int = 1000
     algorithm: str = "monte_carlo"
+    timeout_seconds: Optional[float] = None
 
 
 class SimulationResponse(BaseModel):
@@ -428,71 +965,105 @@ class SimulationResponse(BaseModel):
     statistics: Dict[str, Any]
 
 
+SIMULATION_ALGORITHMS = ("monte_carlo", "parameter_based")
+
+register_algorithms(*ANOMALY_ALGORITHMS, *FORECAST_ALGORITHMS, *SIMULATION_ALGORITHMS)
+
+
+def _run_monte_carlo(
+    parameters: Dict[str, Any],
+    num_simulations: int
+) -> Tuple[np.ndarray, Dict[str, float], Dict[str, float]]:
+    """
+    Sample cycle times and summarize them
+    
+    Returns:
+        (simulated_times, percentiles, statistics)
+    """
+    base_cycle_time = parameters.get("base_cycle_time", 60)
+    variance = parameters.get("variance", 0.2)
+    
+    simulated_times = np.random.normal(
+        base_cycle_time,
+        base_cycle_time * variance,
+        num_simulations
+    )
+    simulated_times = np.maximum(simulated_times, 1)
+    
+    levels = (10, 25, 50, 75, 90, 95, 99)
+    percentiles = {
+        f"p{level}": float(value)
+        for level, value in zip(levels, np.percentile(simulated_times, levels))
+    }
+    statistics = {
+        "mean": float(np.mean(simulated_times)),
+        "median": percentiles["p50"],
+        "std_dev": float(np.std(simulated_times)),
+        "min": float(np.min(simulated_times)),
+        "max": float(np.max(simulated_times))
+    }
+    return simulated_times, percentiles, statistics
+
+
+def _compute_simulation(request: SimulationRequest) -> SimulationResponse:
+    """Run the selected simulation algorithm (executes in the compute pool)"""
+    if request.algorithm == "monte_carlo":
+        simulated_times, percentiles, statistics = _run_monte_carlo(
+            request.parameters, request.num_simulations
+        )
+        
+        return SimulationResponse(
+            success=True,
+            algorithm="monte_carlo",
+            num_simulations=request.num_simulations,
+            results={
+                "cycle_times": simulated_times[:100].tolist(),
+                "percentiles": percentiles
+            },
+            statistics=statistics
+        )
+    
+    elif request.algorithm == "parameter_based":
+        activities = request.process_model.get("activities", [])
+        activity_times = request.parameters.get("activity_times", {})
+        
+        total_time = sum(activity_times.get(a, 10) for a in activities)
+        
+        return SimulationResponse(
+            success=True,
+            algorithm="parameter_based",
+            num_simulations=1,
+            results={
+                "estimated_cycle_time": total_time,
+                "activity_breakdown": {a: activity_times.get(a, 10) for a in activities}
+            },
+            statistics={
+                "total_activities": len(activities),
+                "avg_activity_time": total_time / max(len(activities), 1)
+            }
+        )
+    
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown algorithm: {request.algorithm}"
+        )
+
+
 @app.post("/simulation", response_model=SimulationResponse)
 async def run_simulation(request: SimulationRequest):
     """Run process simulation using specified algorithm"""
     try:
-        if request.algorithm == "monte_carlo":
-            base_cycle_time = request.parameters.get("base_cycle_time", 60)
-            variance = request.parameters.get("variance", 0.2)
-            
-            simulated_times = np.random.normal(
-                base_cycle_time,
-                base_cycle_time * variance,
-                request.num_simulations
-            )
-            simulated_times = np.maximum(simulated_times, 1)
-            
-            return SimulationResponse(
-                success=True,
-                algorithm="monte_carlo",
-                num_simulations=request.num_simulations,
-                results={
-                    "cycle_times": simulated_times.tolist()[:100],
-                    "percentiles": {
-                        "p10": float(np.percentile(simulated_times, 10)),
-                        "p25": float(np.percentile(simulated_times, 25)),
-                        "p50": float(np.percentile(simulated_times, 50)),
-                        "p75": float(np.percentile(simulated_times, 75)),
-                        "p90": float(np.percentile(simulated_times, 90)),
-                        "p95": float(np.percentile(simulated_times, 95)),
-                        "p99": float(np.percentile(simulated_times, 99))
-                    }
-                },
-                statistics={
-                    "mean": float(np.mean(simulated_times)),
-                    "median": float(np.median(simulated_times)),
-                    "std_dev": float(np.std(simulated_times)),
-                    "min": float(np.min(simulated_times)),
-                    "max": float(np.max(simulated_times))
-                }
-            )
-        
-        elif request.algorithm == "parameter_based":
-            activities = request.process_model.get("activities", [])
-            activity_times = request.parameters.get("activity_times", {})
-            
-            total_time = sum(activity_times.get(a, 10) for a in activities)
-            
-            return SimulationResponse(
-                success=True,
-                algorithm="parameter_based",
-                num_simulations=1,
-                results={
-                    "estimated_cycle_time": total_time,
-                    "activity_breakdown": {a: activity_times.get(a, 10) for a in activities}
-                },
-                statistics={
-                    "total_activities": len(activities),
-                    "avg_activity_time": total_time / max(len(activities), 1)
-                }
-            )
-        
-        else:
+        if request.algorithm not in SIMULATION_ALGORITHMS:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unknown algorithm: {request.algorithm}"
             )
+        
+        return await _offload(
+            _compute_simulation, request,
+            deadline=compute_executor.deadline(request.timeout_seconds)
+        )
     
     except HTTPException:
         raise
@@ -500,6 +1071,224 @@ async def run_simulation(request: SimulationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _metadata_value(metadata: Dict[str, Any], key: str, cast: Callable, default: Any = None) -> Any:
+    """Metadata field of a columnar request converted with `cast`; 400 if it does not convert"""
+    value = metadata.get(key, default)
+    if value is None:
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid metadata field {key}: {value!r}")
+
+
+@columnar_variant("/anomaly-detection")
+async def detect_anomalies_columnar(
+    columns: Dict[str, np.ndarray],
+    metadata: Dict[str, Any]
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Binary variant of /anomaly-detection
+    
+    Input columns: case_id, activity, timestamp (strings or int64 epoch
+    microseconds) and optional duration (float64, NaN = missing).
+    Output columns: index of flagged events plus per-event scores/labels.
+    """
+    missing = {"case_id", "activity", "timestamp"} - set(columns)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing columns: {sorted(missing)}")
+    
+    algorithm = metadata.get("algorithm", "isolation_forest")
+    contamination = _metadata_value(metadata, "contamination", float, 0.05)
+    tenant_id = _metadata_value(metadata, "tenant_id", str)
+    model_mode = metadata.get("model_mode", "auto")
+    
+    if algorithm not in ANOMALY_ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {algorithm}")
+    
+    n_events = len(columns["case_id"])
+    if n_events < 10:
+        raise HTTPException(
+            status_code=400,
+            detail="Insufficient data: need at least 10 events for anomaly detection"
+        )
+    
+    durations = columns.get("duration", np.full(n_events, np.nan))
+    deadline = compute_executor.deadline(_metadata_value(metadata, "timeout_seconds", float))
+    out: Dict[str, np.ndarray] = {}
+    
+    if algorithm == "statistical_zscore":
+        values = to_float(durations, falsy_as_missing=True)
+        std = values.std()
+        z_scores = np.abs((values - values.mean()) / std) if std > 0 else np.zeros_like(values)
+        flagged = np.flatnonzero(z_scores > 3)
+        out["z_score"] = z_scores
+        model_metrics = {
+            "mean_duration": float(values.mean()),
+            "std_duration": float(std),
+            "threshold_z": 3.0
+        }
+    else:
+        X = await _offload(
+            extract_column_features,
+            case_ids=columns["case_id"],
+            activities=columns["activity"],
+            timestamps=columns["timestamp"],
+            durations=durations,
+            deadline=deadline
+        )
+        
+        if algorithm == "isolation_forest":
+            model, cache_status, _ = await _resolve_model(
+                tenant_id, model_mode, "isolation_forest",
+                {"contamination": contamination}, X,
+                partial(_fit_isolation_forest, contamination=contamination),
+                deadline=deadline
+            )
+            scored = await _offload(
+                _score_isolation_forest, model, X, contamination, deadline=deadline
+            )
+            flagged = np.flatnonzero(scored["predictions"] == -1)
+            out["anomaly_score"] = -scored["scores"]
+            model_metrics = {
+                "threshold": scored["threshold"],
+                "mean_score": float(np.mean(scored["scores"])),
+                "std_score": float(np.std(scored["scores"])),
+                "model_cache": cache_status
+            }
+        else:
+            fitted, cache_status, same_window = await _resolve_model(
+                tenant_id, model_mode, "dbscan",
+                {"eps": 0.5, "min_samples": 5}, X,
+                partial(_fit_dbscan, eps=0.5, min_samples=5),
+                deadline=deadline
+            )
+            labels = await _offload(_dbscan_labels, fitted, X, same_window, deadline=deadline)
+            flagged = np.flatnonzero(labels == -1)
+            out["cluster"] = labels.astype(np.int32)
+            model_metrics = {
+                "n_clusters": int(len(set(labels.tolist())) - (1 if -1 in labels else 0)),
+                "noise_ratio": float(len(flagged) / len(labels)),
+                "model_cache": cache_status
+            }
+    
+    out = {"index": flagged.astype(np.int64), **out}
+    return out, {
+        "success": True,
+        "algorithm": algorithm,
+        "total_events": n_events,
+        "anomalies_detected": int(len(flagged)),
+        "anomaly_rate": len(flagged) / n_events,
+        "model_metrics": model_metrics
+    }
+
+
+@columnar_variant("/forecast")
+async def generate_forecast_columnar(
+    columns: Dict[str, np.ndarray],
+    metadata: Dict[str, Any]
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Binary variant of /forecast
+    
+    Input column: values (float64). Output columns: step, value, lower, upper.
+    """
+    if "values" not in columns:
+        raise HTTPException(status_code=400, detail="Missing columns: ['values']")
+    
+    values = np.asarray(columns["values"], dtype=np.float64)
+    horizon = _metadata_value(metadata, "horizon", int, 30)
+    algorithm = metadata.get("algorithm", "holt_winters")
+    
+    if len(values) < 3:
+        raise HTTPException(
+            status_code=400,
+            detail="Insufficient data: need at least 3 data points for forecasting"
+        )
+    if algorithm not in FORECAST_ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {algorithm}")
+    
+    arrays, metrics, confidence_intervals = await _offload(
+        _forecast_arrays, values, horizon, algorithm,
+        deadline=compute_executor.deadline(_metadata_value(metadata, "timeout_seconds", float))
+    )
+    return arrays, {
+        "success": True,
+        "algorithm": algorithm,
+        "metrics": metrics,
+        "confidence_intervals": confidence_intervals
+    }
+
+
+@columnar_variant("/forecast/batch")
+async def generate_batch_forecast_columnar(
+    columns: Dict[str, np.ndarray],
+    metadata: Dict[str, Any]
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Binary variant of /forecast/batch
+    
+    Input is long format: series_id (string) and values (float64), with the
+    points of each series in time order. Output is long format as well:
+    series_id, step, value, lower, upper, plus one metric column per metric.
+    """
+    missing = {"series_id", "values"} - set(columns)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing columns: {sorted(missing)}")
+    
+    horizon = _metadata_value(metadata, "horizon", int, 30)
+    algorithm = metadata.get("algorithm", "holt_winters")
+    names, counts = np.unique(columns["series_id"].astype(str), return_counts=True)
+    _validate_batch(dict(zip(names.tolist(), counts.tolist())), algorithm)
+    
+    return await _offload(
+        _compute_long_batch_forecast, columns["series_id"], columns["values"], horizon, algorithm,
+        deadline=compute_executor.deadline(_metadata_value(metadata, "timeout_seconds", float))
+    )
+
+
+@columnar_variant("/simulation")
+async def run_simulation_columnar(
+    columns: Dict[str, np.ndarray],
+    metadata: Dict[str, Any]
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Binary variant of /simulation
+    
+    Parameters travel in the metadata block; Monte Carlo returns every
+    simulated cycle time as a float64 column instead of the first 100.
+    """
+    try:
+        request = SimulationRequest(**metadata)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid metadata: {e}")
+    if request.algorithm not in SIMULATION_ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {request.algorithm}")
+    
+    deadline = compute_executor.deadline(request.timeout_seconds)
+    
+    if request.algorithm == "monte_carlo":
+        simulated_times, percentiles, statistics = await _offload(
+            _run_monte_carlo, request.parameters, request.num_simulations, deadline=deadline
+        )
+        return {"cycle_times": simulated_times}, {
+            "success": True,
+            "algorithm": "monte_carlo",
+            "num_simulations": request.num_simulations,
+            "results": {"percentiles": percentiles},
+            "statistics": statistics
+        }
+    
+    response = await _offload(_compute_simulation, request, deadline=deadline)
+    return {}, {
+        "success": response.success,
+        "algorithm": response.algorithm,
+        "num_simulations": response.num_simulations,
+        "results": response.results,
+        "statistics": response.statistics
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
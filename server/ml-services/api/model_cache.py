@@ -0,0 +1,234 @@
+"""
+In-process warm model cache for the ML Services API
+Keeps fitted models per tenant/algorithm/hyperparameters so repeated
+requests can score without refitting
+"""
+
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Bytes per node of a fitted sklearn tree (Node struct), excluding values
+_TREE_NODE_BYTES = 64
+
+# Request-level model modes
+MODEL_MODE_AUTO = "auto"      # reuse only when the training window is identical
+MODEL_MODE_CACHED = "cached"  # score against the latest cached model if any
+MODEL_MODE_REFIT = "refit"    # always fit and replace the cached model
+MODEL_MODES = (MODEL_MODE_AUTO, MODEL_MODE_CACHED, MODEL_MODE_REFIT)
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Identity of a cached model"""
+    tenant_id: str
+    algorithm: str
+    hyperparameters: Tuple[Tuple[str, Any], ...]
+    fingerprint: str
+    
+    @property
+    def family(self) -> Tuple[str, str, Tuple[Tuple[str, Any], ...]]:
+        """Key without the data fingerprint"""
+        return (self.tenant_id, self.algorithm, self.hyperparameters)
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    size_bytes: int
+    expires_at: float
+
+
+class ModelCache:
+    """
+    Thread-safe LRU + TTL cache for fitted models with a memory cap
+    
+    Entries are evicted least-recently-used first when either the entry
+    count or the resident byte budget is exceeded, and lazily once their
+    TTL has passed.
+    """
+    
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 900.0, max_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._latest: Dict[Tuple, CacheKey] = {}
+        self._lock = threading.Lock()
+        self._resident_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+    
+    @staticmethod
+    def make_key(
+        tenant_id: Optional[str],
+        algorithm: str,
+        hyperparameters: Dict[str, Any],
+        training_data: np.ndarray
+    ) -> CacheKey:
+        """Build a cache key, fingerprinting the training window"""
+        data = np.ascontiguousarray(training_data)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str((data.shape, data.dtype.str)).encode())
+        digest.update(data.tobytes())
+        
+        return CacheKey(
+            tenant_id=tenant_id or "default",
+            algorithm=algorithm,
+            hyperparameters=tuple(sorted(hyperparameters.items())),
+            fingerprint=digest.hexdigest()
+        )
+    
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return the model cached under exactly this key"""
+        return self.lookup(key)[0]
+    
+    def lookup(self, key: CacheKey, allow_latest: bool = False) -> Tuple[Optional[Any], bool]:
+        """
+        Find the model for a key, optionally falling back to the latest one
+        
+        With `allow_latest`, a missing key falls back to the most recently
+        stored model for the key's tenant/algorithm/hyperparameters. Counts
+        one hit or miss per call.
+        
+        Returns:
+            (model or None, whether it was cached under exactly this key)
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            exact = entry is not None
+            if entry is None and allow_latest:
+                latest_key = self._latest.get(key.family)
+                entry = self._lookup(latest_key) if latest_key is not None else None
+            if entry is None:
+                self._misses += 1
+                return None, False
+            self._hits += 1
+            return entry.value, exact
+    
+    def get_latest(self, key: CacheKey) -> Optional[Any]:
+        """Return the most recently stored model for the key's tenant/algorithm/hyperparameters"""
+        with self._lock:
+            latest_key = self._latest.get(key.family)
+            entry = self._lookup(latest_key) if latest_key is not None else None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return entry.value
+    
+    def put(self, key: CacheKey, value: Any, size_bytes: Optional[int] = None) -> None:
+        """Store a fitted model, evicting older entries as needed"""
+        if size_bytes is None:
+            size_bytes = self.estimate_size(value)
+        if size_bytes > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = _CacheEntry(
+                value=value,
+                size_bytes=size_bytes,
+                expires_at=time.monotonic() + self.ttl_seconds
+            )
+            self._latest[key.family] = key
+            self._resident_bytes += size_bytes
+            
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._resident_bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every cached model"""
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self._resident_bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for health reporting"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'resident_bytes': self._resident_bytes,
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds
+            }
+    
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        """
+        Approximate resident size of a model without serializing it
+        
+        Sums array buffers and fitted tree storage reachable through
+        attributes and containers; other objects count their shallow size.
+        """
+        total = 0
+        seen = set()
+        stack = [value]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            
+            if isinstance(obj, np.ndarray):
+                total += obj.nbytes
+                if obj.dtype == object:
+                    stack.extend(obj.ravel().tolist())
+            elif isinstance(obj, dict):
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(obj)
+            elif hasattr(obj, "node_count") and hasattr(obj, "value"):
+                # sklearn Tree: node array plus the per-node values
+                total += obj.node_count * _TREE_NODE_BYTES + obj.value.nbytes
+            elif hasattr(obj, "get_arrays"):
+                # sklearn KDTree / BallTree
+                stack.extend(obj.get_arrays())
+            else:
+                total += sys.getsizeof(obj, 0)
+                if hasattr(obj, "__dict__"):
+                    stack.extend(vars(obj).values())
+        return total
+    
+    def _lookup(self, key: CacheKey) -> Optional[_CacheEntry]:
+        """Find a live entry and mark it recently used (lock held)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+    
+    def _remove(self, key: CacheKey) -> None:
+        """Remove an entry and its bookkeeping (lock held)"""
+        entry = self._entries.pop(key)
+        self._resident_bytes -= entry.size_bytes
+        if self._latest.get(key.family) == key:
+            del self._latest[key.family]
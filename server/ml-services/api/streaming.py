@@ -0,0 +1,163 @@
+"""
+Incremental event-log ingestion for the ML Services API
+Splits NDJSON or CSV request bodies into bounded columnar chunks
+"""
+
+import csv
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from base.columnar import CaseSegments, ParsedTimestamps
+
+
+# Columns kept from each event; anything else in the input is ignored
+STREAM_FIELDS = ('case_id', 'activity', 'timestamp', 'resource', 'duration', 'cost')
+_NUMERIC_FIELDS = ('duration', 'cost')
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+
+
+def detect_format(content_type: Optional[str]) -> str:
+    """Pick the body format from the request content type"""
+    if content_type and "csv" in content_type.lower():
+        return FORMAT_CSV
+    return FORMAT_NDJSON
+
+
+class LineChunker:
+    """
+    Reassembles lines from arbitrary byte chunks and groups them into
+    batches of at most `chunk_size` lines
+    """
+    
+    def __init__(self, chunk_size: int):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self._remainder = b""
+        self._lines: List[bytes] = []
+    
+    def feed(self, data: bytes) -> Iterator[List[bytes]]:
+        """Add body bytes; yields every batch that is now full"""
+        if not data:
+            return
+        parts = (self._remainder + data).split(b"\n")
+        self._remainder = parts.pop()
+        for line in parts:
+            if line.strip():
+                self._lines.append(line)
+                if len(self._lines) >= self.chunk_size:
+                    batch, self._lines = self._lines, []
+                    yield batch
+    
+    def finish(self) -> Iterator[List[bytes]]:
+        """Flush the trailing partial line and batch"""
+        if self._remainder.strip():
+            self._lines.append(self._remainder)
+        self._remainder = b""
+        if self._lines:
+            batch, self._lines = self._lines, []
+            yield batch
+
+
+def parse_ndjson_lines(lines: List[bytes]) -> Dict[str, np.ndarray]:
+    """Parse NDJSON lines into object columns"""
+    buffers: Dict[str, List[Any]] = {field: [] for field in STREAM_FIELDS}
+    for line_no, line in enumerate(lines):
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid NDJSON on line {line_no + 1} of chunk: {e}")
+        for field in STREAM_FIELDS:
+            buffers[field].append(record.get(field))
+    return _to_columns(buffers)
+
+
+def parse_csv_lines(lines: List[bytes], header: List[str]) -> Dict[str, np.ndarray]:
+    """Parse CSV data lines (without header) into object columns"""
+    positions = {field: header.index(field) for field in STREAM_FIELDS if field in header}
+    missing = {'case_id', 'activity', 'timestamp'} - set(positions)
+    if missing:
+        raise ValueError(f"CSV header is missing required columns: {sorted(missing)}")
+    
+    buffers: Dict[str, List[Any]] = {field: [] for field in STREAM_FIELDS}
+    for row in csv.reader(line.decode("utf-8").rstrip("\r") for line in lines):
+        for field in STREAM_FIELDS:
+            pos = positions.get(field)
+            value = row[pos] if pos is not None and pos < len(row) else None
+            buffers[field].append(value if value != "" else None)
+    return _to_columns(buffers)
+
+
+def parse_csv_header(line: bytes) -> List[str]:
+    """Parse the CSV header line"""
+    return [name.strip() for name in next(csv.reader([line.decode("utf-8-sig").rstrip("\r")]))]
+
+
+def _to_columns(buffers: Dict[str, List[Any]]) -> Dict[str, np.ndarray]:
+    columns = {}
+    for field, values in buffers.items():
+        if field in _NUMERIC_FIELDS:
+            values = [float(v) if v is not None else None for v in values]
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        columns[field] = column
+    return columns
+
+
+class CaseStreamState:
+    """
+    Per-case running state carried between chunks
+    
+    Holds the number of events seen and the last timestamp per case, so
+    positions and inter-event gaps continue across chunk boundaries.
+    Memory grows with the number of cases, not the number of events.
+    Events of a case are assumed to arrive in time order across chunks.
+    """
+    
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.last_utc: Dict[str, int] = {}
+        self.last_valid: Dict[str, bool] = {}
+    
+    def advance(
+        self,
+        case_codes: np.ndarray,
+        case_uniques: np.ndarray,
+        segments: CaseSegments,
+        parsed: ParsedTimestamps,
+        prev_utc: np.ndarray,
+        prev_valid: np.ndarray,
+        has_prev: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Shift one chunk's per-case features by the state and record the chunk
+        
+        Returns:
+            (position, case_size, prev_utc, prev_valid, has_prev)
+        """
+        cases = case_uniques.tolist()
+        prior = np.array([self.counts.get(c, 0) for c in cases], dtype=np.int64)
+        carried_utc = np.array([self.last_utc.get(c, 0) for c in cases], dtype=np.int64)
+        carried_valid = np.array([self.last_valid.get(c, False) for c in cases], dtype=bool)
+        
+        position = segments.position + prior[case_codes]
+        case_size = segments.case_size + prior[case_codes]
+        
+        continued = (segments.position == 0) & (prior[case_codes] > 0)
+        prev_utc = np.where(continued, carried_utc[case_codes], prev_utc)
+        prev_valid = np.where(continued, carried_valid[case_codes], prev_valid)
+        has_prev = has_prev | continued
+        
+        # Record the last event of every case in this chunk
+        last_rows = segments.order[segments.offsets[1:] - 1]
+        for row in last_rows.tolist():
+            case = cases[case_codes[row]]
+            self.counts[case] = int(case_size[row])
+            self.last_utc[case] = int(parsed.utc[row])
+            self.last_valid[case] = bool(parsed.valid[row])
+        
+        return position, case_size, prev_utc, prev_valid, has_prev
@@ -0,0 +1,388 @@
+"""
+Request-level tracing for the ML Services API
+Always-on stage timing per request, with an opt-in profiling mode
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from base.instrumentation import get_metrics_registry
+
+
+PROFILE_HEADER = "x-epiq-profile"
+PROFILE_MODE_RESPONSE = "response"
+PROFILE_MODE_DIR = "dir"
+PROFILE_MODES = (PROFILE_MODE_RESPONSE, PROFILE_MODE_DIR)
+
+# Functions listed in an inline profile, by cumulative time
+PROFILE_TOP_FUNCTIONS = 30
+
+# Profiling is off unless the server opts in; 'dir' mode additionally
+# needs ML_PROFILE_DIR, since each such request writes files there
+PROFILING_ENABLED = os.environ.get("ML_PROFILING_ENABLED", "0").lower() in ("1", "true", "yes")
+PROFILE_DIR: Optional[Path] = Path(os.environ["ML_PROFILE_DIR"]) if os.environ.get("ML_PROFILE_DIR") else None
+
+# Algorithm label values; anything else a client sends is labelled "other"
+# so request metrics keep a bounded number of series
+ALGORITHM_LABELS: Set[str] = set()
+OTHER_ALGORITHM = "other"
+
+_registry = get_metrics_registry()
+REQUEST_SECONDS = _registry.rolling_histogram(
+    'ml_api_request_seconds', 'Request latency over the last 5 minutes', ('endpoint', 'algorithm')
+)
+STAGE_SECONDS = _registry.histogram(
+    'ml_api_stage_seconds', 'Time spent in request stages', ('endpoint', 'algorithm', 'stage')
+)
+
+_current_trace: contextvars.ContextVar[Optional["RequestTrace"]] = contextvars.ContextVar(
+    "epiq_request_trace", default=None
+)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "epiq_request_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """One timed stage of a request; children are nested stages"""
+    name: str
+    start: float
+    end: Optional[float] = None
+    children: List["Span"] = field(default_factory=list)
+    
+    @property
+    def seconds(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+    
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        """Span tree with offsets and durations in milliseconds from `origin`"""
+        return {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round(self.seconds * 1000, 3),
+            'children': [child.to_dict(origin) for child in self.children]
+        }
+    
+    def walk(self) -> Iterator["Span"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class RequestTrace:
+    """
+    Span tree of one request
+    
+    Stage timing is always on: it costs two clock reads per stage. With a
+    profile mode, work offloaded to the compute pool additionally runs
+    under cProfile and the merged statistics are attached to the response
+    or written to PROFILE_DIR.
+    """
+    
+    def __init__(self, endpoint: str, profile_mode: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.endpoint = endpoint
+        self.algorithm = ""
+        self.profile_mode = profile_mode
+        self.root = Span("request", time.perf_counter())
+        self.handler_returned: Optional[float] = None
+        self._profile: Optional[pstats.Stats] = None
+    
+    @property
+    def profiling(self) -> bool:
+        return self.profile_mode is not None
+    
+    def record(self, name: str, start: float, end: Optional[float]) -> Span:
+        """Add a span under the current one (end=None while it is still running)"""
+        span = Span(name, start, end)
+        (_current_span.get() or self.root).children.append(span)
+        return span
+    
+    def add_profile(self, stats: Dict[Any, Any]) -> None:
+        """Merge raw cProfile statistics from one offloaded call"""
+        holder = _StatsHolder(stats)
+        if self._profile is None:
+            self._profile = pstats.Stats(holder)
+        else:
+            self._profile.add(holder)
+    
+    def finish(self) -> None:
+        """Close the trace and feed the latency metrics"""
+        self.root.end = time.perf_counter()
+        REQUEST_SECONDS.observe(self.root.seconds, endpoint=self.endpoint, algorithm=self.algorithm)
+        
+        totals: Dict[str, float] = {}
+        for span in self.root.walk():
+            if span is not self.root:
+                totals[span.name] = totals.get(span.name, 0.0) + span.seconds
+        for name, seconds in totals.items():
+            STAGE_SECONDS.observe(seconds, endpoint=self.endpoint, algorithm=self.algorithm, stage=name)
+    
+    def server_timing(self) -> str:
+        """Top-level stages as a Server-Timing header value"""
+        entries = [f"{span.name};dur={span.seconds * 1000:.3f}" for span in self.root.children]
+        entries.append(f"total;dur={self.root.seconds * 1000:.3f}")
+        return ", ".join(entries)
+    
+    def report(self) -> Dict[str, Any]:
+        """Span tree and the top profiled functions"""
+        report: Dict[str, Any] = {
+            'trace_id': self.id,
+            'endpoint': self.endpoint,
+            'algorithm': self.algorithm,
+            'spans': self.root.to_dict(self.root.start)
+        }
+        if self._profile is not None:
+            report['profile'] = _top_functions(self._profile, PROFILE_TOP_FUNCTIONS)
+        return report
+    
+    def write(self, directory: Path) -> Path:
+        """Write the span tree (.json) and profile (.pstats) to `directory`"""
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", self.endpoint).strip("-") or "root"
+        base = directory / f"{datetime.now():%Y%m%dT%H%M%S}-{slug}-{self.id}"
+        with open(base.with_suffix(".json"), "w") as f:
+            json.dump(self.report(), f, indent=2)
+        if self._profile is not None:
+            self._profile.dump_stats(str(base.with_suffix(".pstats")))
+        return base.with_suffix(".json")
+
+
+class _StatsHolder:
+    """Adapter letting pstats.Stats load raw statistics returned by a worker"""
+    
+    def __init__(self, stats: Dict[Any, Any]):
+        self.stats = stats
+    
+    def create_stats(self) -> None:
+        pass
+
+
+def _top_functions(profile: pstats.Stats, limit: int) -> List[Dict[str, Any]]:
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in profile.stats.items():
+        rows.append({
+            'function': f"{Path(filename).name}:{line}({name})",
+            'ncalls': ncalls,
+            'tottime_ms': round(tottime * 1000, 3),
+            'cumtime_ms': round(cumtime * 1000, 3)
+        })
+    rows.sort(key=lambda row: row['cumtime_ms'], reverse=True)
+    return rows[:limit]
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as a span of the current request (no-op outside requests)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    
+    span = trace.record(name, time.perf_counter(), None)
+    token = _current_span.set(span)
+    try:
+        yield
+    finally:
+        span.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+def parse_profile_mode(value: Optional[str]) -> Optional[str]:
+    """
+    Profile mode requested by a header value
+    
+    None when profiling is disabled, the value is not a known mode, or it
+    asks for 'dir' mode without a server-side PROFILE_DIR.
+    """
+    if not value or not PROFILING_ENABLED:
+        return None
+    value = value.strip().lower()
+    if value == PROFILE_MODE_DIR and PROFILE_DIR is None:
+        return None
+    return value if value in PROFILE_MODES else None
+
+
+@dataclass
+class _Profiled:
+    """Result of a profiled call in the compute pool, with its raw statistics"""
+    value: Any
+    stats: Dict[Any, Any]
+
+
+def _run_profiled(fn: Callable) -> _Profiled:
+    profiler = cProfile.Profile()
+    value = profiler.runcall(fn)
+    profiler.create_stats()
+    return _Profiled(value, profiler.stats)
+
+
+def for_compute_pool(fn: Callable, in_thread: bool) -> Callable:
+    """
+    Prepare `fn` for the compute pool under the current trace
+    
+    Thread workers run it in a copy of the request context so stage()
+    calls inside nest under the caller's span. In profile mode it runs
+    under cProfile (picklable, so process workers work too); pass the
+    result through `from_compute_pool`.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return fn
+    if in_thread:
+        fn = partial(contextvars.copy_context().run, fn)
+    if trace.profiling:
+        fn = partial(_run_profiled, fn)
+    return fn
+
+
+def from_compute_pool(result: Any) -> Any:
+    """Unwrap a compute-pool result, merging its profile into the trace"""
+    if isinstance(result, _Profiled):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_profile(result.stats)
+        return result.value
+    return result
+
+
+def register_algorithms(*names: str) -> None:
+    """Allow `names` as values of the algorithm metric label"""
+    ALGORITHM_LABELS.update(names)
+
+
+def _algorithm_label(algorithm: str) -> str:
+    if not algorithm:
+        return ""
+    return algorithm if algorithm in ALGORITHM_LABELS else OTHER_ALGORITHM
+
+
+def _algorithm_of(kwargs: Dict[str, Any]) -> str:
+    """Algorithm label of a request, from a body model or an `algorithm` query parameter"""
+    if isinstance(kwargs.get("algorithm"), str):
+        return _algorithm_label(kwargs["algorithm"])
+    for value in kwargs.values():
+        algorithm = getattr(value, "algorithm", None)
+        if isinstance(algorithm, str):
+            return _algorithm_label(algorithm)
+    return ""
+
+
+def traced_endpoint(endpoint: Callable) -> Callable:
+    """
+    Split an async endpoint's time into parse_request / handler spans
+    
+    Everything before the endpoint runs (body read, JSON decoding,
+    pydantic validation) is parse_request; the route handler records
+    serialize_response after it returns. Sync endpoints run in
+    FastAPI's threadpool and are left as they are.
+    """
+    if not asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+    
+    @functools.wraps(endpoint)
+    async def traced(*args, **kwargs):
+        trace = _current_trace.get()
+        if trace is None:
+            return await endpoint(*args, **kwargs)
+        
+        trace.record("parse_request", trace.root.start, time.perf_counter())
+        trace.algorithm = _algorithm_of(kwargs)
+        try:
+            with stage("handler"):
+                return await endpoint(*args, **kwargs)
+        finally:
+            trace.handler_returned = time.perf_counter()
+    
+    return traced
+
+
+class TracingRoute(APIRoute):
+    """
+    Route that traces every request
+    
+    Stage timings feed ml_api_request_seconds (rolling, per endpoint and
+    algorithm) and ml_api_stage_seconds. When ML_PROFILING_ENABLED is
+    set, requests carrying the X-EPIQ-Profile header ('response' or 'dir')
+    are also profiled: the report is added to JSON bodies under "_profile"
+    or written to ML_PROFILE_DIR, and stages are listed in a Server-Timing
+    header.
+    """
+    
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any):
+        super().__init__(path, traced_endpoint(endpoint), **kwargs)
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        path = self.path
+        
+        async def route_handler(request: Request) -> Response:
+            trace = RequestTrace(path, parse_profile_mode(request.headers.get(PROFILE_HEADER)))
+            token = _current_trace.set(trace)
+            try:
+                response = await handler(request)
+                if trace.handler_returned is not None:
+                    trace.record("serialize_response", trace.handler_returned, time.perf_counter())
+            finally:
+                trace.finish()
+                _current_trace.reset(token)
+            
+            if trace.profiling:
+                response = _attach_profile(trace, response)
+            return response
+        
+        return route_handler
+
+
+def _attach_profile(trace: RequestTrace, response: Response) -> Response:
+    """Add the trace report to the response, or write it out"""
+    inline = (
+        trace.profile_mode == PROFILE_MODE_RESPONSE
+        and (response.media_type or "").startswith("application/json")
+    )
+    if inline:
+        try:
+            # Streaming responses have no buffered body
+            body = json.loads(getattr(response, "body", b"") or b"null")
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            body["_profile"] = trace.report()
+            headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+            response = Response(
+                content=json.dumps(body),
+                status_code=response.status_code,
+                headers=headers,
+                media_type=response.media_type
+            )
+        else:
+            inline = False
+    
+    if not inline and PROFILE_DIR is not None:
+        # File name only; the directory is the server's business
+        response.headers["X-EPIQ-Profile-File"] = trace.write(PROFILE_DIR).name
+    response.headers["Server-Timing"] = trace.server_timing()
+    response.headers["X-EPIQ-Trace-Id"] = trace.id
+    return response
@@ -0,0 +1,83 @@
+"""
+Compiled autoregressive rollout for one-step Keras forecasters
+Rolls a whole forecast horizon for a batch of series in one graph execution
+"""
+
+import weakref
+import numpy as np
+from typing import Any
+
+from .windowing import PREDICT_BATCH_SIZE, predict_in_batches
+
+
+# One traced rollout per Keras model; dropped with the model. The rollout
+# reaches its model through a weak reference, since a value holding its
+# key strongly would keep every entry alive.
+_ROLLOUTS: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+
+def compiled_rollout(model: Any, sequence_length: int) -> Any:
+    """
+    Graph function rolling `model` forward autoregressively
+    
+    The returned function takes windows of shape (batch, sequence_length, 1)
+    and a scalar int32 horizon, and returns (batch, horizon) predictions.
+    Each step calls the model directly on the current windows and shifts
+    its prediction in, all inside one tf.while_loop. The input signature
+    is fixed, so new batch sizes or horizons never retrace.
+    
+    The model is only needed while tracing, which happens on the first
+    call, so callers must hold on to it until then (rollout_forecast does).
+    """
+    import tensorflow as tf
+    
+    rollout = _ROLLOUTS.get(model)
+    if rollout is not None:
+        return rollout
+    
+    model_ref = weakref.ref(model)
+    
+    @tf.function(input_signature=[
+        tf.TensorSpec([None, sequence_length, 1], tf.float32),
+        tf.TensorSpec([], tf.int32)
+    ])
+    def rollout(windows, horizon):
+        model = model_ref()
+        steps = tf.TensorArray(tf.float32, size=horizon)
+        for step in tf.range(horizon):
+            next_value = model(windows, training=False)[:, :1]
+            steps = steps.write(step, next_value[:, 0])
+            windows = tf.concat([windows[:, 1:], next_value[:, :, None]], axis=1)
+        return tf.transpose(steps.stack())
+    
+    _ROLLOUTS[model] = rollout
+    return rollout
+
+
+def rollout_forecast(
+    model: Any,
+    windows: np.ndarray,
+    horizon: int,
+    batch_size: int = PREDICT_BATCH_SIZE
+) -> np.ndarray:
+    """
+    Forecast `horizon` steps past every window
+    
+    Args:
+        model: One-step Keras model taking (batch, sequence_length, 1)
+        windows: Scaled seed windows of shape (n_series, sequence_length)
+        horizon: Steps to forecast
+        batch_size: Series rolled per graph call
+    
+    Returns:
+        Scaled float64 forecasts of shape (n_series, horizon)
+    """
+    windows = np.asarray(windows, dtype=np.float32)
+    rollout = compiled_rollout(model, windows.shape[1])
+    
+    forecasts = predict_in_batches(
+        lambda batch: rollout(batch[..., np.newaxis], np.int32(horizon)).numpy(),
+        windows,
+        batch_size=batch_size
+    )
+    return forecasts.reshape(len(windows), horizon).astype(np.float64)
@@ -0,0 +1,454 @@
+"""
+Columnar event-log feature engine
+Bulk timestamp parsing, case segmentation and categorical factorization
+shared by every feature extraction path
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+import warnings
+
+
+# Epoch arrays are int64 microseconds, matching datetime resolution
+EPOCH_UNIT = 'us'
+_US_PER_SECOND = 1_000_000
+_US_PER_HOUR = 3600 * _US_PER_SECOND
+_US_PER_DAY = 24 * _US_PER_HOUR
+
+# 64-bit FNV-1a parameters
+_FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+_FNV_PRIME = np.uint64(0x100000001b3)
+
+# Second, independent hash used to verify fixed-width factorization
+_CHECK_PRIME = np.uint64(0x9E3779B97F4A7C15)
+
+# Rows hashed per block; a block of code points stays in cache
+_HASH_BLOCK_ROWS = 1 << 14
+
+
+@dataclass
+class ParsedTimestamps:
+    """Result of bulk timestamp parsing"""
+    wall: np.ndarray   # int64 epoch of the wall-clock time as written (offset ignored)
+    utc: np.ndarray    # int64 epoch normalized to UTC (wall minus offset)
+    valid: np.ndarray  # bool mask of successfully parsed values
+    
+    def __len__(self) -> int:
+        return len(self.wall)
+
+
+@dataclass
+class CaseSegments:
+    """Events grouped by case via a stable sort and segment offsets"""
+    order: np.ndarray      # permutation sorting events by (case, order key)
+    offsets: np.ndarray    # segment start positions in sorted order, plus total length
+    position: np.ndarray   # position of each event within its case (input order)
+    case_size: np.ndarray  # number of events in each event's case (input order)
+    
+    @property
+    def n_cases(self) -> int:
+        return len(self.offsets) - 1
+
+
+def get_column(events: Sequence[Any], name: str, default: Any = None) -> np.ndarray:
+    """
+    Pull one field out of a list of events as an object array
+    
+    Accepts dicts, dataclasses (EventLogSchema) and pydantic models alike.
+    """
+    column = np.empty(len(events), dtype=object)
+    if not len(events):
+        return column
+    
+    if isinstance(events[0], dict):
+        column[:] = [event.get(name, default) for event in events]
+    else:
+        column[:] = [getattr(event, name, default) for event in events]
+    return column
+
+
+def to_float(values: np.ndarray, fill: float = 0.0, falsy_as_missing: bool = False) -> np.ndarray:
+    """
+    Convert an object column of optional numbers to float64
+    
+    Args:
+        values: Object array with numbers or None, or a float array using NaN for missing
+        fill: Value used for missing entries
+        falsy_as_missing: Also treat 0 / 0.0 as missing (mirrors `x if x else fill`)
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'fiu':
+        missing = np.isnan(values) if values.dtype.kind == 'f' else np.zeros(len(values), dtype=bool)
+    else:
+        missing = np.equal(values, None)
+    result = np.full(len(values), fill, dtype=np.float64)
+    present = ~missing
+    if present.any():
+        result[present] = values[present].astype(np.float64)
+    if falsy_as_missing:
+        result[result == 0] = fill
+    return result
+
+
+def factorize(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode a column as integer codes into its sorted unique values
+    
+    Object and string columns are factorized with a hash table first, so
+    only the distinct values are converted to str and sorted; non-string
+    objects (None, numbers) compare by their str() form. Fixed-width
+    unicode columns are hashed from their code points instead of being
+    converted to Python strings.
+    
+    Returns:
+        (codes, uniques) such that uniques[codes] reproduces the column
+    """
+    arr = np.asarray(values)
+    if len(arr) == 0:
+        return np.empty(0, dtype=np.int64), arr.astype(np.str_) if arr.dtype == object else arr
+    if arr.dtype.kind not in 'OU':
+        uniques, codes = np.unique(arr, return_inverse=True)
+        return codes.reshape(-1).astype(np.int64, copy=False), uniques
+    
+    if arr.dtype.kind == 'U':
+        factorized = _factorize_fixed_width(arr)
+        if factorized is not None:
+            return factorized
+    
+    obj = arr.astype(object, copy=False)
+    codes, first_seen = pd.factorize(obj)
+    labels = np.asarray(first_seen, dtype=object).astype(np.str_)
+    missing = codes < 0
+    if missing.any():
+        # pandas treats None and NaN alike; keep their own str() forms
+        na_labels, na_codes = np.unique(obj[missing].astype(np.str_), return_inverse=True)
+        codes[missing] = len(labels) + na_codes.reshape(-1)
+        labels = np.concatenate([labels, na_labels])
+    
+    # Distinct objects can share a str() form (1 and '1'), so re-unique as str
+    uniques, remap = np.unique(labels, return_inverse=True)
+    return remap.reshape(-1)[codes].astype(np.int64, copy=False), uniques
+
+
+def _factorize_fixed_width(arr: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Factorize a 'U' array by a 64-bit hash of each row's code points
+    
+    Rows are hashed 8 bytes at a time, block by block, and the hashes
+    factorized; a second hash must agree within every group. None on a
+    collision (the caller then takes the exact object path).
+    """
+    n = len(arr)
+    width = max(arr.dtype.itemsize // 4, 1)
+    code_points = np.ascontiguousarray(arr, dtype=f'U{width}').view(np.uint32).reshape(n, width)
+    n_words = (width + 1) // 2
+    
+    hashes = np.empty(n, dtype=np.uint64)
+    checks = np.empty(n, dtype=np.uint64)
+    block = np.zeros((min(n, _HASH_BLOCK_ROWS), 2 * n_words), dtype=np.uint32)
+    for start in range(0, n, _HASH_BLOCK_ROWS):
+        stop = min(n, start + _HASH_BLOCK_ROWS)
+        rows = stop - start
+        block[:rows, :width] = code_points[start:stop]
+        words = block[:rows].view(np.uint64)
+        h = np.full(rows, _FNV_OFFSET, dtype=np.uint64)
+        c = np.zeros(rows, dtype=np.uint64)
+        for j in range(n_words):
+            h ^= words[:, j]
+            h *= _FNV_PRIME
+            c += words[:, j]
+            c *= _CHECK_PRIME
+        hashes[start:stop] = h
+        checks[start:stop] = c
+    
+    codes, distinct = pd.factorize(hashes)
+    first = np.empty(len(distinct), dtype=np.int64)
+    first[codes[::-1]] = np.arange(n - 1, -1, -1)
+    if not np.array_equal(checks, checks[first][codes]):
+        return None
+    
+    uniques, remap = np.unique(arr[first], return_inverse=True)
+    return remap.reshape(-1)[codes].astype(np.int64, copy=False), uniques
+
+
+def hash_strings(values: Iterable[Any]) -> np.ndarray:
+    """
+    Deterministic 64-bit FNV-1a hash of each string, vectorized
+    
+    Hashes the UTF-32 code points of each value (padding excluded), so the
+    result does not depend on the array width or the process.
+    
+    Returns:
+        uint64 array of hashes
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind != 'U':
+        arr = arr.astype(np.str_)
+    n = len(arr)
+    width = max(arr.dtype.itemsize // 4, 1)
+    code_points = np.ascontiguousarray(arr, dtype=f'U{width}').view(np.uint32).reshape(n, width)
+    lengths = np.char.str_len(arr)
+    
+    hashes = np.full(n, _FNV_OFFSET, dtype=np.uint64)
+    for j in range(width):
+        active = lengths > j
+        if not active.any():
+            break
+        mixed = (hashes ^ code_points[:, j].astype(np.uint64)) * _FNV_PRIME
+        hashes = np.where(active, mixed, hashes)
+    return hashes
+
+
+def map_uniques(values: Iterable[Any], func: Callable[[Any], float]) -> np.ndarray:
+    """
+    Apply a scalar function once per distinct value and broadcast the result
+    
+    Cost is O(unique values) Python calls instead of O(rows).
+    """
+    codes, uniques = factorize(values)
+    mapped = np.fromiter((func(u) for u in uniques.tolist()), dtype=np.float64, count=len(uniques))
+    return mapped[codes]
+
+
+def parse_timestamps(values: Iterable[Any], fill_invalid: Optional[datetime] = None) -> ParsedTimestamps:
+    """
+    Parse ISO-8601 strings or datetime objects into int64 epoch arrays in bulk
+    
+    Trailing 'Z' and '+HH:MM' / '-HH:MM' offsets are split off with vectorized
+    code-point arithmetic, the remainder is parsed by numpy's datetime64 parser.
+    Values numpy rejects fall back to `datetime.fromisoformat` once per distinct
+    string.
+    
+    Args:
+        values: Timestamp strings, datetime objects, or integer epochs already
+            in EPOCH_UNIT (taken as UTC wall-clock time)
+        fill_invalid: Datetime used for unparseable values (epoch 0 if None)
+    """
+    raw = np.asarray(values, dtype=object) if not isinstance(values, np.ndarray) else values
+    n = len(raw)
+    if n == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return ParsedTimestamps(wall=empty, utc=empty.copy(), valid=np.empty(0, dtype=bool))
+    
+    if raw.dtype.kind in 'iu':
+        wall = raw.astype(np.int64)
+        return ParsedTimestamps(wall=wall, utc=wall, valid=np.ones(n, dtype=bool))
+    
+    if raw.dtype == object and isinstance(_first_present(raw), datetime):
+        wall, offset, valid = _from_datetimes(raw)
+    else:
+        if raw.dtype == object:
+            raw = np.where(np.equal(raw, None), '', raw)
+        wall, offset, valid = _from_strings(raw.astype(np.str_))
+    
+    if not valid.all():
+        fill = 0
+        if fill_invalid is not None:
+            fill = _datetime_to_epoch(fill_invalid.replace(tzinfo=None))
+        wall = np.where(valid, wall, fill)
+        offset = np.where(valid, offset, 0)
+    
+    return ParsedTimestamps(wall=wall, utc=wall - offset, valid=valid)
+
+
+def hour_and_weekday(epoch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Hour of day and Monday=0 weekday from an int64 epoch array"""
+    hour = (epoch // _US_PER_HOUR) % 24
+    # 1970-01-01 was a Thursday (weekday 3)
+    weekday = (epoch // _US_PER_DAY + 3) % 7
+    return hour, weekday
+
+
+def segment_cases(case_codes: np.ndarray, order_key: Optional[np.ndarray] = None) -> CaseSegments:
+    """
+    Group events by case with a single stable sort
+    
+    Args:
+        case_codes: Integer case codes (from `factorize`)
+        order_key: Sort key within each case; ties keep input order
+    """
+    n = len(case_codes)
+    if order_key is None:
+        order = np.argsort(case_codes, kind='stable')
+    else:
+        order = np.lexsort((order_key, case_codes))
+    
+    sorted_cases = case_codes[order]
+    starts = np.flatnonzero(np.diff(sorted_cases)) + 1 if n else np.empty(0, dtype=np.int64)
+    offsets = np.concatenate(([0], starts, [n])).astype(np.int64)
+    sizes = np.diff(offsets)
+    
+    segment_of_sorted = np.repeat(np.arange(len(sizes)), sizes)
+    position_sorted = np.arange(n) - offsets[segment_of_sorted]
+    
+    position = np.empty(n, dtype=np.int64)
+    position[order] = position_sorted
+    case_size = np.empty(n, dtype=np.int64)
+    case_size[order] = sizes[segment_of_sorted]
+    
+    return CaseSegments(order=order, offsets=offsets, position=position, case_size=case_size)
+
+
+def previous_in_case(values: np.ndarray, segments: CaseSegments) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each event, the value of the preceding event in the same case
+    
+    Returns:
+        (previous, has_previous) in input order
+    """
+    n = len(values)
+    sorted_values = values[segments.order]
+    prev_sorted = np.empty_like(sorted_values)
+    if n:
+        prev_sorted[1:] = sorted_values[:-1]
+        prev_sorted[0] = sorted_values[0]
+    
+    previous = np.empty_like(values)
+    previous[segments.order] = prev_sorted
+    return previous, segments.position > 0
+
+
+def stack_features(columns: List[np.ndarray], dtype: Any = np.float32) -> np.ndarray:
+    """Assemble feature columns into one contiguous (n_events, n_features) matrix"""
+    if not columns:
+        return np.empty((0, 0), dtype=dtype)
+    matrix = np.empty((len(columns[0]), len(columns)), dtype=dtype)
+    for j, column in enumerate(columns):
+        matrix[:, j] = column
+    return matrix
+
+
+def _first_present(values: np.ndarray) -> Any:
+    present = np.flatnonzero(~np.equal(values, None))
+    return values[present[0]] if len(present) else None
+
+
+def _datetime_to_epoch(dt: datetime) -> int:
+    return int(np.datetime64(dt, EPOCH_UNIT).astype(np.int64))
+
+
+def _from_datetimes(raw: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert datetime objects, keeping wall clock and UTC offset separately"""
+    n = len(raw)
+    wall = np.zeros(n, dtype=np.int64)
+    offset = np.zeros(n, dtype=np.int64)
+    valid = np.array([isinstance(v, datetime) for v in raw], dtype=bool)
+    
+    if valid.any():
+        dts = raw[valid]
+        wall[valid] = np.array(
+            [dt.replace(tzinfo=None) for dt in dts], dtype=f'datetime64[{EPOCH_UNIT}]'
+        ).astype(np.int64)
+        offset[valid] = [
+            int(dt.utcoffset().total_seconds() * _US_PER_SECOND) if dt.utcoffset() else 0
+            for dt in dts
+        ]
+    return wall, offset, valid
+
+
+def _from_strings(raw: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized ISO-8601 parse of a unicode array"""
+    n = len(raw)
+    width = max(raw.dtype.itemsize // 4, 1)
+    raw = raw.astype(f'U{width}')
+    codes = raw.view(np.uint32).reshape(n, width).copy()
+    lengths = np.char.str_len(raw).astype(np.int64)
+    rows = np.arange(n)
+    
+    # Strip trailing 'Z'
+    last = codes[rows, np.maximum(lengths - 1, 0)]
+    has_z = (lengths > 0) & (last == ord('Z'))
+    codes[rows[has_z], lengths[has_z] - 1] = 0
+    lengths = lengths - has_z
+    
+    # Strip trailing +HH:MM / -HH:MM (only after a time component)
+    offset = np.zeros(n, dtype=np.int64)
+    candidate = lengths >= 16
+    if candidate.any():
+        sign_pos = np.maximum(lengths - 6, 0)
+        sign = codes[rows, sign_pos]
+        colon = codes[rows, np.maximum(lengths - 3, 0)]
+        has_offset = candidate & ((sign == ord('+')) | (sign == ord('-'))) & (colon == ord(':'))
+        if has_offset.any():
+            def digit(back: int) -> np.ndarray:
+                return codes[rows, np.maximum(lengths - back, 0)].astype(np.int64) - ord('0')
+            
+            hh = digit(5) * 10 + digit(4)
+            mm = digit(2) * 10 + digit(1)
+            signed = np.where(sign == ord('-'), -1, 1)
+            offset = np.where(has_offset, signed * (hh * 3600 + mm * 60) * _US_PER_SECOND, 0)
+            cols = np.arange(width)
+            codes[has_offset[:, None] & (cols[None, :] >= sign_pos[:, None])] = 0
+    
+    # numpy accepts more than ISO-8601 extended format (e.g. '20240115' or
+    # '+0530' offsets) and misreads it; only the extended shape goes to numpy
+    plain = _is_extended_iso(codes, lengths)
+    stripped = codes.view(f'U{width}').reshape(n)
+    try:
+        with warnings.catch_warnings():
+            # Deprecated numpy timezone parsing warns instead of failing
+            warnings.simplefilter('error')
+            parsed = np.where(plain, stripped, '').astype(f'datetime64[{EPOCH_UNIT}]')
+    except (ValueError, Warning):
+        return _from_strings_fallback(raw)
+    
+    wall = parsed.astype(np.int64)
+    valid = ~np.isnat(parsed)
+    other = ~plain & (lengths > 0)
+    if other.any():
+        wall[other], offset[other], valid[other] = _from_strings_fallback(raw[other])
+    return wall, offset, valid
+
+
+def _is_extended_iso(codes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Rows shaped YYYY-MM-DD[(T| )hh:mm[:ss[.f]]], offsets already stripped
+    
+    Checks lengths and separator positions; numpy itself rejects
+    non-digits in the digit fields.
+    """
+    n, width = codes.shape
+    
+    def char(pos: int) -> np.ndarray:
+        return codes[:, pos] if pos < width else np.zeros(n, dtype=codes.dtype)
+    
+    date = (char(4) == ord('-')) & (char(7) == ord('-'))
+    minutes = date & ((char(10) == ord('T')) | (char(10) == ord(' '))) & (char(13) == ord(':'))
+    seconds = minutes & (char(16) == ord(':'))
+    shaped = (
+        ((lengths == 10) & date)
+        | ((lengths == 16) & minutes)
+        | ((lengths == 19) & seconds)
+    )
+    
+    # Fraction: '.' then only digits up to the end of the string
+    fraction = (lengths >= 21) & seconds & (char(19) == ord('.'))
+    if fraction.any():
+        tail = codes[fraction, 20:]
+        beyond = np.arange(20, width)[None, :] >= lengths[fraction, None]
+        fraction[fraction] = (((tail - ord('0')) <= 9) | beyond).all(axis=1)  # uint32 wraps below '0'
+        shaped |= fraction
+    return shaped
+
+
+def _from_strings_fallback(raw: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse each distinct string with datetime.fromisoformat"""
+    codes, uniques = factorize(raw)
+    u_wall = np.zeros(len(uniques), dtype=np.int64)
+    u_offset = np.zeros(len(uniques), dtype=np.int64)
+    u_valid = np.zeros(len(uniques), dtype=bool)
+    
+    for i, value in enumerate(uniques.tolist()):
+        try:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            continue
+        u_wall[i] = _datetime_to_epoch(dt.replace(tzinfo=None))
+        if dt.utcoffset():
+            u_offset[i] = int(dt.utcoffset().total_seconds() * _US_PER_SECOND)
+        u_valid[i] = True
+    
+    return u_wall[codes], u_offset[codes], u_valid[codes]
@@ -0,0 +1,378 @@
+"""
+Streaming aggregates for A/B experiment results
+Mergeable running statistics, quantile sketches and a buffered recorder
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import math
+import threading
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+# Magnitudes below this are counted as zero by the sketch
+_MIN_INDEXABLE = 1e-12
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+@dataclass
+class RunningStats:
+    """
+    Count, mean and variance maintained with Welford's update
+    
+    Batches are folded in with Chan et al.'s pairwise form, so adding n
+    values is one vectorized pass and two partial states merge exactly.
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> 'RunningStats':
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(
+            count=len(values),
+            mean=mean,
+            m2=float(((values - mean) ** 2).sum()),
+            min=float(values.min()),
+            max=float(values.max())
+        )
+    
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """Combine with another state in place"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunningStats':
+        return cls(**data)
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch with relative-error guarantees (DDSketch)
+    
+    Values are counted in buckets whose bounds grow geometrically, so any
+    quantile estimate is within `relative_accuracy` of the true value.
+    Memory grows with the log of the value range, not the number of values,
+    and sketches merge by adding bucket counts.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def add(self, values: np.ndarray) -> 'QuantileSketch':
+        """Add a batch of values (non-finite values are ignored)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        
+        positive = values[values > _MIN_INDEXABLE]
+        negative = -values[values < -_MIN_INDEXABLE]
+        self.zero_count += len(values) - len(positive) - len(negative)
+        self._add_to(self.positive, positive)
+        self._add_to(self.negative, negative)
+        self.count += len(values)
+        return self
+    
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Add another sketch's counts in place"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, n in theirs.items():
+                mine[index] = mine.get(index, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+    
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return math.nan
+        
+        rank = q * (self.count - 1)
+        seen = 0
+        # Most negative values first, then zeros, then positives
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._bucket_value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._bucket_value(index)
+        return self._bucket_value(max(self.positive)) if self.positive else 0.0
+    
+    def _add_to(self, buckets: Dict[int, int], magnitudes: np.ndarray) -> None:
+        if len(magnitudes) == 0:
+            return
+        indices = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+        unique, counts = np.unique(indices, return_counts=True)
+        for index, n in zip(unique.tolist(), counts.tolist()):
+            buckets[index] = buckets.get(index, 0) + n
+    
+    def _bucket_value(self, index: int) -> float:
+        # Point of bucket (gamma^(i-1), gamma^i] with equal relative error to both ends
+        return 2.0 * self._gamma ** index / (self._gamma + 1.0)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': {str(k): v for k, v in self.positive.items()},
+            'negative': {str(k): v for k, v in self.negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'])
+        sketch.positive = {int(k): v for k, v in data['positive'].items()}
+        sketch.negative = {int(k): v for k, v in data['negative'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        return sketch
+
+
+class MetricAggregate:
+    """Running statistics plus quantile sketch for one (variant, metric)"""
+    
+    def __init__(self, stats: Optional[RunningStats] = None, sketch: Optional[QuantileSketch] = None):
+        self.stats = stats or RunningStats()
+        self.sketch = sketch or QuantileSketch()
+    
+    @classmethod
+    def from_values(cls, values: Iterable[float], relative_accuracy: float = 0.01) -> 'MetricAggregate':
+        values = np.fromiter(values, dtype=np.float64)
+        return cls(RunningStats.from_values(values), QuantileSketch(relative_accuracy).add(values))
+    
+    def merge(self, other: 'MetricAggregate') -> 'MetricAggregate':
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        return self
+    
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, variance, std, min, max and the SUMMARY_QUANTILES"""
+        stats = self.stats
+        summary = {
+            'count': stats.count,
+            'mean': stats.mean,
+            'variance': stats.variance,
+            'std': math.sqrt(stats.variance),
+            'min': stats.min if stats.count else math.nan,
+            'max': stats.max if stats.count else math.nan
+        }
+        for q in SUMMARY_QUANTILES:
+            summary[f"p{round(q * 100)}"] = self.sketch.quantile(q)
+        return summary
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'stats': self.stats.to_dict(), 'sketch': self.sketch.to_dict()}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricAggregate':
+        return cls(RunningStats.from_dict(data['stats']), QuantileSketch.from_dict(data['sketch']))
+
+
+def aggregate_results(results: Iterable[Dict[str, Any]]) -> Dict[Tuple[str, str], MetricAggregate]:
+    """Group result records by (variant_id, metric_name) and aggregate each group"""
+    groups: Dict[Tuple[str, str], List[float]] = {}
+    for result in results:
+        groups.setdefault((result['variant_id'], result['metric_name']), []).append(result['metric_value'])
+    return {key: MetricAggregate.from_values(values) for key, values in groups.items()}
+
+
+class ExperimentRecorder:
+    """
+    Buffered writer for experiment results
+    
+    record() only appends to an in-memory buffer. The buffer is written to
+    the registry, raw rows plus merged per-variant aggregates in one backend
+    call, when it reaches `flush_size` results, every `flush_interval`
+    seconds from a background thread, on flush() and on close().
+    
+    Background flush failures are logged and kept in `last_flush_error`
+    until a flush succeeds; the results stay buffered and are retried. At
+    most `max_pending` results are held: beyond that the oldest are dropped
+    (counted in `dropped`) so a broken registry cannot grow memory without
+    bound. Results for experiments the registry does not know are logged
+    and discarded.
+    """
+    
+    def __init__(
+        self,
+        registry: Any,
+        flush_size: int = 1000,
+        flush_interval: Optional[float] = 5.0,
+        max_pending: int = 100_000
+    ):
+        self.registry = registry
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max(max_pending, flush_size)
+        self.dropped = 0
+        
+        self._buffer: List[Tuple[str, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_flush_error: Optional[BaseException] = None
+        
+        if flush_interval:
+            self._thread = threading.Thread(
+                target=self._flush_periodically, name="experiment-recorder", daemon=True
+            )
+            self._thread.start()
+    
+    def record(self, experiment_id: str, variant_id: str, metric_name: str, metric_value: float) -> None:
+        """Buffer one result"""
+        result = {
+            'variant_id': variant_id,
+            'metric_name': metric_name,
+            'metric_value': float(metric_value),
+            'timestamp': datetime.now().isoformat()
+        }
+        with self._lock:
+            self._buffer.append((experiment_id, result))
+            self._trim()
+            full = len(self._buffer) >= self.flush_size
+        if full:
+            self.flush()
+    
+    def record_batch(self, experiment_id: str, results: Iterable[Tuple[str, str, float]]) -> None:
+        """Buffer many (variant_id, metric_name, metric_value) results"""
+        timestamp = datetime.now().isoformat()
+        batch = [
+            (experiment_id, {
+                'variant_id': variant_id,
+                'metric_name': metric_name,
+                'metric_value': float(metric_value),
+                'timestamp': timestamp
+            })
+            for variant_id, metric_name, metric_value in results
+        ]
+        with self._lock:
+            self._buffer.extend(batch)
+            self._trim()
+            full = len(self._buffer) >= self.flush_size
+        if full:
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Write buffered results to the registry
+        
+        Returns:
+            Number of results written. On failure the batch is put back at
+            the front of the buffer and the error re-raised.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            
+            by_experiment: Dict[str, List[Dict[str, Any]]] = {}
+            for experiment_id, result in batch:
+                by_experiment.setdefault(experiment_id, []).append(result)
+            
+            done = set()
+            try:
+                for experiment_id, results in by_experiment.items():
+                    if not self.registry.record_experiment_results(experiment_id, results):
+                        logger.warning(
+                            "Dropped %d results for unknown experiment %s", len(results), experiment_id
+                        )
+                    done.add(experiment_id)
+            except Exception:
+                # Each experiment is written in one transaction, so only
+                # the experiments not yet written go back in the buffer
+                with self._lock:
+                    self._buffer[:0] = [item for item in batch if item[0] not in done]
+                    self._trim()
+                raise
+            self.last_flush_error = None
+            return len(batch)
+    
+    def summary(self, experiment_id: str) -> Optional[Dict[str, Dict[str, Dict[str, float]]]]:
+        """Flush, then read the per-variant summary from the registry"""
+        self.flush()
+        return self.registry.get_experiment_summary(experiment_id)
+    
+    def close(self) -> None:
+        """Stop the background flusher and write what is left"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+    
+    def __enter__(self) -> 'ExperimentRecorder':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _trim(self) -> None:
+        """Drop the oldest results beyond `max_pending` (lock held)"""
+        excess = len(self._buffer) - self.max_pending
+        if excess > 0:
+            del self._buffer[:excess]
+            self.dropped += excess
+            logger.warning(
+                "Experiment results buffer is full (%d pending); dropped the %d oldest",
+                self.max_pending, excess
+            )
+    
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                # Results stay buffered and are retried on the next tick
+                self.last_flush_error = e
+                logger.exception("Experiment results flush failed; %d results buffered", len(self._buffer))
@@ -0,0 +1,449 @@
+"""
+Process-wide metrics for model lifecycle phases
+Counters, gauges and histograms with labels, rendered in the Prometheus
+text exposition format
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import bisect
+import math
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+# Seconds; spans sub-millisecond scoring to multi-minute training
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + '}'
+
+
+class _Metric:
+    """Base for labelled metrics; children are keyed by label values"""
+    kind = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+    
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_child(key, value))
+        return lines
+    
+    def _render_child(self, key: Tuple[str, ...], value: Any) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    kind = 'counter'
+    
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    kind = 'gauge'
+    
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+    
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+    
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with sum and count"""
+    kind = 'histogram'
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._values.get(key)
+            if child is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                child = self._values[key] = [np.zeros(len(self.buckets) + 1, dtype=np.int64), 0.0]
+            child[0][index] += 1
+            child[1] += value
+    
+    def count(self, **labels: Any) -> int:
+        child = self._values.get(self._key(labels))
+        return int(child[0].sum()) if child is not None else 0
+    
+    def quantile(self, q: float, **labels: Any) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty)"""
+        child = self._values.get(self._key(labels))
+        if child is None or not child[0].sum():
+            return None
+        cumulative = np.cumsum(child[0])
+        index = int(np.searchsorted(cumulative, q * cumulative[-1]))
+        return self.buckets[index] if index < len(self.buckets) else math.inf
+    
+    def _render_child(self, key: Tuple[str, ...], value: Any) -> List[str]:
+        counts, total = value
+        cumulative = np.cumsum(counts)
+        names = self.labelnames + ('le',)
+        lines = [
+            f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {int(n)}"
+            for bound, n in zip(self.buckets + (math.inf,), cumulative)
+        ]
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {int(cumulative[-1])}")
+        return lines
+
+
+class RollingHistogram(_Metric):
+    """
+    Bucketed observations over a sliding time window
+    
+    The window is split into `slots` intervals; each observation lands in
+    its interval's bucket counts and intervals older than the window are
+    recycled, so quantiles track recent latency at constant memory and
+    O(1) cost per observation. Rendered as a Prometheus summary: window
+    quantiles (bucket upper bounds) plus cumulative _sum and _count.
+    """
+    kind = 'summary'
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        window_seconds: float = 300.0,
+        slots: int = 10,
+        quantiles: Sequence[float] = (0.5, 0.9, 0.99),
+        clock: Any = time.monotonic
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.slots = slots
+        self.slot_seconds = window_seconds / slots
+        self.quantiles = tuple(quantiles)
+        self._clock = clock
+    
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        interval = int(self._clock() // self.slot_seconds)
+        row = interval % self.slots
+        with self._lock:
+            child = self._values.get(key)
+            if child is None:
+                # Per-slot bucket counts, the interval each slot holds, sum, count
+                child = self._values[key] = [
+                    np.zeros((self.slots, len(self.buckets) + 1), dtype=np.int64),
+                    np.full(self.slots, -1, dtype=np.int64), 0.0, 0
+                ]
+            if child[1][row] != interval:
+                child[0][row] = 0
+                child[1][row] = interval
+            child[0][row, index] += 1
+            child[2] += value
+            child[3] += 1
+    
+    def window_counts(self, **labels: Any) -> np.ndarray:
+        """Bucket counts of the current window (last slot is +Inf)"""
+        with self._lock:
+            child = self._values.get(self._key(labels))
+            return self._window(child)
+    
+    def quantile(self, q: float, **labels: Any) -> Optional[float]:
+        """Upper bound of the bucket holding the window's q-quantile (None if empty)"""
+        return self._quantile(self.window_counts(**labels), q)
+    
+    def _window(self, child: Any) -> np.ndarray:
+        if child is None:
+            return np.zeros(len(self.buckets) + 1, dtype=np.int64)
+        current = int(self._clock() // self.slot_seconds)
+        live = child[1] > current - self.slots
+        return child[0][live].sum(axis=0)
+    
+    def _quantile(self, counts: np.ndarray, q: float) -> Optional[float]:
+        if not counts.sum():
+            return None
+        cumulative = np.cumsum(counts)
+        index = int(np.searchsorted(cumulative, q * cumulative[-1]))
+        return self.buckets[index] if index < len(self.buckets) else math.inf
+    
+    def _render_child(self, key: Tuple[str, ...], value: Any) -> List[str]:
+        counts = self._window(value)
+        names = self.labelnames + ('quantile',)
+        lines = []
+        for q in self.quantiles:
+            estimate = self._quantile(counts, q)
+            lines.append(
+                f"{self.name}{_format_labels(names, key + (repr(q),))} "
+                f"{_format_value(math.nan if estimate is None else estimate)}"
+            )
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(value[2])}")
+        lines.append(f"{self.name}_count{labels} {int(value[3])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics of one process; get-or-create by name"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _get(self, cls: type, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)
+    
+    def rolling_histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        window_seconds: float = 300.0
+    ) -> RollingHistogram:
+        return self._get(
+            RollingHistogram, name, documentation, labelnames, buckets=buckets, window_seconds=window_seconds
+        )
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    return _metrics_registry
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of this process's resident set size"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@dataclass
+class PhaseSnapshot:
+    """Clock and memory readings taken when a phase starts"""
+    model_type: str
+    operation: str
+    wall: float
+    cpu: float
+    peak_rss: int
+
+
+def input_stats(data: Any) -> Dict[str, int]:
+    """Sample count, feature width and size of a phase input, as far as known"""
+    if isinstance(data, np.ndarray):
+        if data.ndim == 0:
+            return {'samples': 1, 'features': 1, 'input_bytes': int(data.nbytes)}
+        features = int(np.prod(data.shape[1:])) if data.ndim > 1 else 1
+        return {'samples': len(data), 'features': features, 'input_bytes': int(data.nbytes)}
+    if isinstance(data, (list, tuple)):
+        return {'samples': len(data)}
+    return {}
+
+
+class PhaseInstrumentation:
+    """
+    Records lifecycle phases into a metrics registry
+    
+    A phase is opened by a before_* hook and closed by the matching
+    after_* hook. Open phases are tracked per thread, so one model can
+    serve concurrent predictions.
+    
+    Metrics, labelled by model_type and operation:
+        ml_model_phase_total{status}            phases finished ('ok') or failed ('error')
+        ml_model_phase_seconds                  wall-clock histogram
+        ml_model_phase_cpu_seconds_total        process CPU time (all threads)
+        ml_model_phase_peak_memory_delta_bytes  growth of peak RSS during the last phase
+        ml_model_phase_samples_total            input samples processed
+        ml_model_phase_input_features           feature width of the last input
+        ml_model_phase_input_bytes              size of the last input array
+    """
+    
+    LABELS = ('model_type', 'operation')
+    
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        registry = registry or get_metrics_registry()
+        self.phases = registry.counter(
+            'ml_model_phase_total', 'Lifecycle phases by outcome', self.LABELS + ('status',)
+        )
+        self.seconds = registry.histogram(
+            'ml_model_phase_seconds', 'Wall-clock duration of lifecycle phases', self.LABELS
+        )
+        self.cpu_seconds = registry.counter(
+            'ml_model_phase_cpu_seconds_total', 'Process CPU time spent in lifecycle phases', self.LABELS
+        )
+        self.memory_delta = registry.gauge(
+            'ml_model_phase_peak_memory_delta_bytes', 'Growth of peak RSS during the last phase', self.LABELS
+        )
+        self.samples = registry.counter(
+            'ml_model_phase_samples_total', 'Input samples processed by lifecycle phases', self.LABELS
+        )
+        self.features = registry.gauge(
+            'ml_model_phase_input_features', 'Feature width of the last phase input', self.LABELS
+        )
+        self.input_bytes = registry.gauge(
+            'ml_model_phase_input_bytes', 'Size of the last phase input array', self.LABELS
+        )
+        self._local = threading.local()
+    
+    def _phases(self) -> Dict[Tuple[int, str], List[PhaseSnapshot]]:
+        """Open phases of this thread; keys exist only while a phase is open"""
+        phases = getattr(self._local, 'phases', None)
+        if phases is None:
+            phases = self._local.phases = {}
+        return phases
+    
+    def _pop(self, key: Tuple[int, str]) -> Optional[PhaseSnapshot]:
+        """Remove the innermost open phase of `key`, dropping the key once empty"""
+        phases = self._phases()
+        open_phases = phases.get(key)
+        if not open_phases:
+            return None
+        snapshot = open_phases.pop()
+        if not open_phases:
+            del phases[key]
+        return snapshot
+    
+    def depth(self, owner: Any, operation: str) -> int:
+        """Phases of `operation` currently open on `owner` in this thread"""
+        return len(self._phases().get((id(owner), operation), ()))
+    
+    def begin(self, owner: Any, model_type: str, operation: str) -> None:
+        """Open a phase of `owner`"""
+        self._phases().setdefault((id(owner), operation), []).append(PhaseSnapshot(
+            model_type, operation, time.perf_counter(), time.process_time(), peak_rss_bytes()
+        ))
+    
+    def end(self, owner: Any, operation: str, stats: Optional[Dict[str, Any]] = None, success: bool = True) -> None:
+        """Close the innermost open phase of `operation`; ignored when none is open"""
+        snapshot = self._pop((id(owner), operation))
+        if snapshot is not None:
+            self._record(snapshot, stats or {}, success)
+    
+    def abort(self, owner: Any, operation: str, depth: int = 0) -> None:
+        """Close phases opened above `depth` as failed (an exception skipped their after_* hook)"""
+        while self.depth(owner, operation) > depth:
+            self._record(self._pop((id(owner), operation)), {}, success=False)
+    
+    def _record(self, snapshot: PhaseSnapshot, stats: Dict[str, Any], success: bool) -> None:
+        labels = {'model_type': snapshot.model_type, 'operation': snapshot.operation}
+        self.phases.inc(status='ok' if success else 'error', **labels)
+        self.seconds.observe(time.perf_counter() - snapshot.wall, **labels)
+        self.cpu_seconds.inc(max(0.0, time.process_time() - snapshot.cpu), **labels)
+        self.memory_delta.set(peak_rss_bytes() - snapshot.peak_rss, **labels)
+        
+        if stats.get('samples') is not None:
+            self.samples.inc(stats['samples'], **labels)
+        if stats.get('features') is not None:
+            self.features.set(stats['features'], **labels)
+        if stats.get('input_bytes') is not None:
+            self.input_bytes.set(stats['input_bytes'], **labels)
+
+
+_phase_instrumentation: Optional[PhaseInstrumentation] = None
+_phase_lock = threading.Lock()
+
+
+def get_phase_instrumentation() -> PhaseInstrumentation:
+    """Process-wide phase recorder on the process-wide registry"""
+    global _phase_instrumentation
+    if _phase_instrumentation is None:
+        with _phase_lock:
+            if _phase_instrumentation is None:
+                _phase_instrumentation = PhaseInstrumentation()
+    return _phase_instrumentation
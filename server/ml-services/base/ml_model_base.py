@@ -4,18 +4,27 @@ Production-Ready ML Model Base with Versioned Lifecycle Management
 - Manifest validation with checksums
 - Typed error hierarchy
 - Lifecycle hooks
+- Per-phase instrumentation
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Dict, List, Optional, Union, Callable, Tuple
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 import json
+import os
 import pickle
 import hashlib
+import functools
+import threading
 import joblib
+import numpy as np
+
+from .instrumentation import get_phase_instrumentation
 
 
 class ModelErrorCode(Enum):
@@ -76,7 +85,7 @@ class ArtifactSpec:
     filename: str
     checksum: str
     size_bytes: int
-    artifact_type: str  # 'pickle', 'joblib', 'json', 'weights'
+    artifact_type: str  # 'pickle', 'joblib', 'joblib_mmap', 'npy', 'json', 'weights'
 
 
 @dataclass
@@ -98,16 +107,42 @@ class ModelManifest:
 
 
 class ManifestValidator:
-    """Validates model manifests"""
+    """
+    Validates model manifests
+    
+    Artifact checksums are cached by (path, size, mtime_ns, inode), so
+    reloading an unchanged file skips re-hashing it.
+    """
     
     REQUIRED_FIELDS = {'schema_version', 'model_id', 'model_type', 'version', 'status'}
     SUPPORTED_SCHEMA_VERSIONS = {'1.0.0'}
     
+    CHUNK_SIZE = 1 << 20
+    CHECKSUM_CACHE_SIZE = 4096
+    
+    _checksum_cache: 'OrderedDict[Tuple[str, int, int, int], str]' = OrderedDict()
+    _cache_lock = threading.Lock()
+    _verify_pool: Optional[ThreadPoolExecutor] = None
+    
     @classmethod
-    def validate(cls, manifest: ModelManifest, artifact_dir: Path) -> None:
+    def validate(
+        cls,
+        manifest: ModelManifest,
+        artifact_dir: Path,
+        deferred: bool = False
+    ) -> Optional[Future]:
         """
         Validate manifest completeness and artifact integrity
         
+        Args:
+            manifest: Manifest to validate
+            artifact_dir: Directory holding the artifacts
+            deferred: Only check fields and artifact presence now; verify
+                checksums in a background thread
+        
+        Returns:
+            Future of the checksum verification if deferred, else None
+        
         Raises:
             ValidationError: If validation fails
         """
@@ -128,19 +163,31 @@ class ManifestValidator:
                 context={'supported': list(cls.SUPPORTED_SCHEMA_VERSIONS)}
             )
         
-        # Validate artifacts exist and checksums match
+        # Validate artifacts exist
         for artifact_spec in manifest.artifacts:
-            artifact_path = artifact_dir / artifact_spec.filename
-            
-            if not artifact_path.exists():
+            if not (artifact_dir / artifact_spec.filename).exists():
                 raise PersistenceError(
                     f"Missing artifact: {artifact_spec.filename}",
                     code=ModelErrorCode.MISSING_ARTIFACT,
                     context={'artifact': artifact_spec.name}
                 )
-            
-            # Verify checksum
-            actual_checksum = cls._calculate_checksum(artifact_path)
+        
+        if deferred:
+            return cls._get_verify_pool().submit(cls.verify_checksums, manifest, artifact_dir)
+        cls.verify_checksums(manifest, artifact_dir)
+        return None
+    
+    @classmethod
+    def verify_checksums(cls, manifest: ModelManifest, artifact_dir: Path) -> None:
+        """
+        Check every artifact against its manifest checksum
+        
+        Raises:
+            PersistenceError: On a checksum mismatch
+        """
+        for artifact_spec in manifest.artifacts:
+            artifact_path = artifact_dir / artifact_spec.filename
+            actual_checksum = cls.cached_checksum(artifact_path)
             if actual_checksum != artifact_spec.checksum:
                 raise PersistenceError(
                     f"Checksum mismatch for {artifact_spec.filename}",
@@ -151,13 +198,58 @@ class ManifestValidator:
                     }
                 )
     
+    @classmethod
+    def cached_checksum(cls, file_path: Path) -> str:
+        """SHA256 of a file, reused while its size, mtime and inode are unchanged"""
+        key = cls._cache_key(file_path)
+        with cls._cache_lock:
+            checksum = cls._checksum_cache.get(key)
+            if checksum is not None:
+                cls._checksum_cache.move_to_end(key)
+                return checksum
+        
+        checksum = cls._calculate_checksum(file_path)
+        
+        # Only cache if the file did not change while it was being hashed
+        if cls._cache_key(file_path) == key:
+            with cls._cache_lock:
+                cls._checksum_cache[key] = checksum
+                while len(cls._checksum_cache) > cls.CHECKSUM_CACHE_SIZE:
+                    cls._checksum_cache.popitem(last=False)
+        return checksum
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget all cached checksums"""
+        with cls._cache_lock:
+            cls._checksum_cache.clear()
+    
     @staticmethod
-    def _calculate_checksum(file_path: Path) -> str:
+    def _cache_key(file_path: Path) -> Tuple[str, int, int, int]:
+        stat = os.stat(file_path)
+        return (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    
+    @classmethod
+    def _get_verify_pool(cls) -> ThreadPoolExecutor:
+        with cls._cache_lock:
+            if cls._verify_pool is None:
+                cls._verify_pool = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="artifact-verify"
+                )
+            return cls._verify_pool
+    
+    @classmethod
+    def _calculate_checksum(cls, file_path: Path) -> str:
         """Calculate SHA256 checksum of file"""
         sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
+        buffer = bytearray(cls.CHUNK_SIZE)
+        view = memoryview(buffer)
+        with open(file_path, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                sha256.update(view[:n])
         return sha256.hexdigest()
 
 
@@ -171,6 +263,72 @@ class LifecycleContext:
     data: Optional[Dict[str, Any]] = None
 
 
+# before_* hook -> operation whose phase it opens; after_* hooks close it
+_PHASE_HOOKS = {
+    'before_train': 'train', 'before_predict': 'predict',
+    'before_save': 'save', 'before_load': 'load',
+    'after_train': 'train', 'after_predict': 'predict',
+    'after_save': 'save', 'after_load': 'load',
+}
+_PHASE_OPERATIONS = ('train', 'predict', 'save', 'load')
+
+
+def _instrument_hook(name: str, hook: Callable) -> Callable:
+    """
+    Run phase instrumentation around a lifecycle hook
+    
+    Overrides rarely call super(), so each hook definition is wrapped;
+    only the wrapper resolved for the instance's class records, which
+    keeps super() chains from counting a phase twice.
+    """
+    operation = _PHASE_HOOKS[name]
+    opens = name.startswith('before_')
+    
+    @functools.wraps(hook)
+    def instrumented(self, context: LifecycleContext) -> None:
+        if getattr(type(self), name) is not instrumented:
+            return hook(self, context)
+        instrumentation = get_phase_instrumentation()
+        if opens:
+            instrumentation.begin(self, self.model_type, operation)
+            hook(self, context)
+        else:
+            hook(self, context)
+            instrumentation.end(self, operation, context.data)
+    
+    instrumented._phase_hook = True
+    return instrumented
+
+
+def _instrument_operation(operation: str, method: Callable) -> Callable:
+    """
+    Record phases that train/predict/save/load left open as failed
+    
+    A phase stays open when an exception skips its after_* hook, or when
+    a model reports failure (TrainingResult(success=False)) without it.
+    """
+    @functools.wraps(method)
+    def instrumented(self, *args, **kwargs):
+        instrumentation = get_phase_instrumentation()
+        depth = instrumentation.depth(self, operation)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            instrumentation.abort(self, operation, depth)
+    
+    instrumented._phase_operation = True
+    return instrumented
+
+
+def _instrument_class(cls: type) -> None:
+    for name, attr in list(vars(cls).items()):
+        if name in _PHASE_HOOKS and callable(attr) and not hasattr(attr, '_phase_hook'):
+            setattr(cls, name, _instrument_hook(name, attr))
+        elif name in _PHASE_OPERATIONS and callable(attr) and not getattr(attr, '__isabstractmethod__', False) \
+                and not hasattr(attr, '_phase_operation'):
+            setattr(cls, name, _instrument_operation(name, attr))
+
+
 @dataclass
 class TrainingResult:
     """Standardized training result"""
@@ -189,7 +347,13 @@ class PredictionResult:
 
 
 class ArtifactStore:
-    """Manages artifact persistence"""
+    """
+    Manages artifact persistence
+    
+    'npy' and 'joblib_mmap' artifacts are written uncompressed and loaded
+    with mmap_mode='r': their arrays are read-only views of the file, so
+    processes loading the same artifact share pages via the OS page cache.
+    """
     
     @staticmethod
     def save(obj: Any, path: Path, artifact_type: str = 'joblib', *, name: Optional[str] = None) -> ArtifactSpec:
@@ -199,7 +363,7 @@ class ArtifactStore:
         Args:
             obj: Object to save
             path: Save path
-            artifact_type: 'joblib', 'pickle', 'json', or 'tensorflow'
+            artifact_type: 'joblib', 'joblib_mmap', 'npy', 'pickle', 'json', or 'tensorflow'
             name: Optional explicit artifact name (defaults to path.stem)
         
         Returns:
@@ -209,6 +373,13 @@ class ArtifactStore:
         
         if artifact_type == 'joblib':
             joblib.dump(obj, path)
+        elif artifact_type == 'joblib_mmap':
+            # Must stay uncompressed for the embedded arrays to be mappable
+            joblib.dump(obj, path, compress=0)
+        elif artifact_type == 'npy':
+            # Write through a handle so np.save keeps the exact filename
+            with open(path, 'wb') as f:
+                np.save(f, np.asarray(obj), allow_pickle=False)
         elif artifact_type == 'pickle':
             with open(path, 'wb') as f:
                 pickle.dump(obj, f)
@@ -221,8 +392,8 @@ class ArtifactStore:
         else:
             raise ValueError(f"Unsupported artifact type: {artifact_type}")
         
-        # Calculate checksum
-        checksum = ManifestValidator._calculate_checksum(path)
+        # Calculate checksum (also primes the cache for the next load)
+        checksum = ManifestValidator.cached_checksum(path)
         size = path.stat().st_size
         
         return ArtifactSpec(
@@ -238,6 +409,10 @@ class ArtifactStore:
         """Load artifact"""
         if artifact_type == 'joblib':
             return joblib.load(path)
+        elif artifact_type == 'joblib_mmap':
+            return joblib.load(path, mmap_mode='r')
+        elif artifact_type == 'npy':
+            return np.load(path, mmap_mode='r', allow_pickle=False)
         elif artifact_type == 'pickle':
             with open(path, 'rb') as f:
                 return pickle.load(f)
@@ -261,8 +436,18 @@ class MLModelBase(ABC):
     - Versioned manifest with artifact/metadata separation
     - Lifecycle hooks for extensibility
     - Typed error handling
+    
+    The before_*/after_* hooks of train, predict, save and load also time
+    each phase into the process-wide metrics registry (base.instrumentation),
+    including in subclasses that override them without calling super().
+    Subclasses pass input sizes as the after_* context's data, e.g.
+    `data=input_stats(X)`.
     """
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _instrument_class(cls)
+    
     def __init__(self, model_id: str, model_type: str, version: str = "1.0.0"):
         self.model_id = model_id
         self.model_type = model_type
@@ -280,6 +465,12 @@ class MLModelBase(ABC):
         self.model = None
         self.is_trained = False
         
+        # With deferred verification, load() returns before checksums are
+        # checked; a failed check later quarantines the model
+        self.deferred_verification = False
+        self.verification_error: Optional[ModelError] = None
+        self._verification: Optional[Future] = None
+        
         # Model directory structure: models/{type}/{id}/{version}/
         self.model_dir = Path(f"models/{model_type}/{model_id}/{version}")
         self.artifact_dir = self.model_dir / "artifacts"
@@ -309,6 +500,10 @@ class MLModelBase(ABC):
         """Called after saving"""
         pass
     
+    def before_load(self, context: LifecycleContext) -> None:
+        """Called before loading"""
+        pass
+    
     def after_load(self, context: LifecycleContext) -> None:
         """Called after loading"""
         pass
@@ -317,6 +512,10 @@ class MLModelBase(ABC):
         """Called during rollback"""
         pass
     
+    def on_quarantine(self, context: LifecycleContext) -> None:
+        """Called when deferred artifact verification fails"""
+        pass
+    
     @abstractmethod
     def train(self, data: Any, **kwargs) -> TrainingResult:
         """Train the model"""
@@ -369,10 +568,16 @@ class MLModelBase(ABC):
             with open(manifest_path, 'w') as f:
                 json.dump(asdict(self.metadata), f, indent=2, default=str)
             
-            return str(save_dir)
-            
         except Exception as e:
             raise PersistenceError(f"Failed to save model: {str(e)}", context={'error': str(e)})
+        
+        self.after_save(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='save',
+            timestamp=datetime.now()
+        ))
+        return str(save_dir)
     
     def load(self, path: str) -> None:
         """
@@ -381,6 +586,13 @@ class MLModelBase(ABC):
         Args:
             path: Path to model directory
         """
+        self.before_load(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='load',
+            timestamp=datetime.now()
+        ))
+        
         try:
             load_dir = Path(path)
             manifest_path = load_dir / "manifest.json"
@@ -397,7 +609,9 @@ class MLModelBase(ABC):
             self.metadata = ModelManifest(**manifest_dict)
             
             # Validate manifest
-            ManifestValidator.validate(self.metadata, artifact_dir)
+            pending = ManifestValidator.validate(
+                self.metadata, artifact_dir, deferred=self.deferred_verification
+            )
             
             # Load artifacts
             for artifact_spec in self.metadata.artifacts:
@@ -407,6 +621,8 @@ class MLModelBase(ABC):
             
             self.is_trained = True
             self.version = self.metadata.version
+            self.verification_error = None
+            self._verification = pending
             
             # Lifecycle hook
             context = LifecycleContext(
@@ -417,11 +633,57 @@ class MLModelBase(ABC):
             )
             self.after_load(context)
             
+            if pending is not None:
+                pending.add_done_callback(self._on_verified)
+            
         except Exception as e:
             if isinstance(e, ModelError):
                 raise
             raise PersistenceError(f"Failed to load model: {str(e)}", context={'path': path, 'error': str(e)})
     
+    def wait_for_verification(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until deferred artifact verification finishes
+        
+        Raises:
+            PersistenceError: If verification failed (the model is quarantined)
+        """
+        if self._verification is not None:
+            try:
+                self._verification.result(timeout)
+            except Exception as e:
+                raise self._as_model_error(e)
+    
+    def quarantine(self, error: ModelError) -> None:
+        """Take the model out of service after an integrity failure"""
+        self.is_trained = False
+        self.verification_error = error
+        self.metadata.status = 'quarantined'
+        
+        context = LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='quarantine',
+            timestamp=datetime.now(),
+            data={'error': str(error)}
+        )
+        self.on_quarantine(context)
+    
+    def _on_verified(self, future: Future) -> None:
+        """Done-callback of deferred verification"""
+        # Ignore results for a load that has since been superseded
+        if future is not self._verification or future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.quarantine(self._as_model_error(error))
+    
+    @staticmethod
+    def _as_model_error(error: Exception) -> ModelError:
+        if isinstance(error, ModelError):
+            return error
+        return PersistenceError(f"Artifact verification failed: {error}", context={'error': str(error)})
+    
     def get_info(self) -> Dict[str, Any]:
         """Get model information"""
         return {
@@ -438,6 +700,9 @@ class MLModelBase(ABC):
         }
 
 
+_instrument_class(MLModelBase)
+
+
 class AnomalyDetectorBase(MLModelBase):
     """Base class for anomaly detection models"""
     
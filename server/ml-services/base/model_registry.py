@@ -3,22 +3,118 @@ Model Registry for version management and model lifecycle
 Tracks all trained models, versions, and performance metrics
 """
 
-from typing import Dict, List, Optional, Any
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
+from contextlib import contextmanager
 import json
+import logging
+import os
+import sqlite3
+import threading
 from datetime import datetime
-from .ml_model_base import ModelMetadata
+from .ml_model_base import ModelManifest
+from .experiments import MetricAggregate, aggregate_results
 
 
-class ModelRegistry:
+logger = logging.getLogger(__name__)
+
+
+class RegistryBackend(ABC):
     """
-    Central registry for all ML models
-    Handles versioning, deployment, and A/B testing
+    Storage backend for the model registry
+    
+    Version, deployment and experiment records are plain dicts; backends
+    decide how they are stored and indexed.
     """
     
-    def __init__(self, registry_path: str = "models/registry.json"):
+    @abstractmethod
+    def add_version(self, model_type: str, model_id: str, version_info: Dict[str, Any]) -> None:
+        """Append a version record for a model"""
+        pass
+    
+    @abstractmethod
+    def get_versions(self, model_type: str, model_id: str) -> List[Dict[str, Any]]:
+        """All versions of a model, oldest first"""
+        pass
+    
+    @abstractmethod
+    def get_latest_version(self, model_type: str, model_id: str) -> Optional[Dict[str, Any]]:
+        """Most recently registered version of a model"""
+        pass
+    
+    @abstractmethod
+    def list_models(self, model_type: Optional[str] = None) -> Dict[str, Any]:
+        """{model_type: {model_id: {'versions': [...]}}}"""
+        pass
+    
+    @abstractmethod
+    def deploy(
+        self,
+        deployment_name: str,
+        model_type: str,
+        model_id: str,
+        version: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically point a deployment slot at a registered version
+        
+        Returns:
+            The deployment record, or None if the version is not registered
+        """
+        pass
+    
+    @abstractmethod
+    def get_deployment(self, deployment_name: str, model_type: str) -> Optional[Dict[str, Any]]:
+        """Deployment record for a slot"""
+        pass
+    
+    @abstractmethod
+    def create_experiment(self, experiment_id: str, experiment: Dict[str, Any]) -> None:
+        """Store a new experiment (without results)"""
+        pass
+    
+    @abstractmethod
+    def append_experiment_results(
+        self,
+        experiment_id: str,
+        results: List[Dict[str, Any]],
+        aggregates: Dict[Tuple[str, str], MetricAggregate]
+    ) -> bool:
+        """
+        Append results and merge their aggregates in one atomic write
+        
+        `aggregates` maps (variant_id, metric_name) to the aggregate of
+        `results` for that pair. Returns False if the experiment does not exist.
+        """
+        pass
+    
+    @abstractmethod
+    def get_experiment_aggregates(
+        self,
+        experiment_id: str
+    ) -> Optional[Dict[Tuple[str, str], MetricAggregate]]:
+        """Stored aggregates per (variant_id, metric_name); None if no such experiment"""
+        pass
+    
+    @abstractmethod
+    def get_experiment(self, experiment_id: str) -> Optional[Dict[str, Any]]:
+        """Experiment with all its results"""
+        pass
+
+
+class JSONRegistryBackend(RegistryBackend):
+    """
+    Whole-file JSON backend (the original registry.json format)
+    
+    Every write rewrites the file, so it only suits small single-process
+    registries. Writes go through a temp file and an atomic rename.
+    """
+    
+    def __init__(self, registry_path: Path):
         self.registry_path = Path(registry_path)
         self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
         self.registry = self._load_registry()
     
     def _load_registry(self) -> Dict[str, Any]:
@@ -30,56 +126,590 @@ class ModelRegistry:
     
     def _save_registry(self) -> None:
         """Save registry to disk"""
-        with open(self.registry_path, 'w') as f:
+        tmp_path = self.registry_path.with_name(self.registry_path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
             json.dump(self.registry, f, indent=2, default=str)
+        os.replace(tmp_path, self.registry_path)
+    
+    def add_version(self, model_type: str, model_id: str, version_info: Dict[str, Any]) -> None:
+        with self._lock:
+            models = self.registry['models'].setdefault(model_type, {})
+            models.setdefault(model_id, {'versions': []})['versions'].append(version_info)
+            self._save_registry()
+    
+    def get_versions(self, model_type: str, model_id: str) -> List[Dict[str, Any]]:
+        model_info = self.registry['models'].get(model_type, {}).get(model_id)
+        return list(model_info['versions']) if model_info else []
+    
+    def get_latest_version(self, model_type: str, model_id: str) -> Optional[Dict[str, Any]]:
+        versions = self.get_versions(model_type, model_id)
+        return versions[-1] if versions else None
+    
+    def list_models(self, model_type: Optional[str] = None) -> Dict[str, Any]:
+        if model_type:
+            return {model_type: self.registry['models'].get(model_type, {})}
+        return self.registry['models']
+    
+    def deploy(
+        self,
+        deployment_name: str,
+        model_type: str,
+        model_id: str,
+        version: str
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            matches = [v for v in self.get_versions(model_type, model_id) if v['version'] == version]
+            if not matches:
+                return None
+            
+            deployment = {
+                'model_id': model_id,
+                'version': version,
+                'deployed_at': datetime.now().isoformat(),
+                'model_path': matches[0]['model_path']
+            }
+            self.registry['deployments'].setdefault(deployment_name, {})[model_type] = deployment
+            self._save_registry()
+            return deployment
+    
+    def get_deployment(self, deployment_name: str, model_type: str) -> Optional[Dict[str, Any]]:
+        return self.registry['deployments'].get(deployment_name, {}).get(model_type)
+    
+    def create_experiment(self, experiment_id: str, experiment: Dict[str, Any]) -> None:
+        with self._lock:
+            self.registry['experiments'][experiment_id] = {**experiment, 'results': []}
+            self._save_registry()
+    
+    def append_experiment_results(
+        self,
+        experiment_id: str,
+        results: List[Dict[str, Any]],
+        aggregates: Dict[Tuple[str, str], MetricAggregate]
+    ) -> bool:
+        with self._lock:
+            if experiment_id not in self.registry['experiments']:
+                return False
+            stored = self._aggregates(experiment_id)
+            for (variant_id, metric_name), aggregate in aggregates.items():
+                by_metric = stored.setdefault(variant_id, {})
+                if metric_name in by_metric:
+                    aggregate = MetricAggregate.from_dict(by_metric[metric_name]).merge(aggregate)
+                by_metric[metric_name] = aggregate.to_dict()
+            self.registry['experiments'][experiment_id]['results'].extend(results)
+            self._save_registry()
+            return True
+    
+    def get_experiment(self, experiment_id: str) -> Optional[Dict[str, Any]]:
+        return self.registry['experiments'].get(experiment_id)
+    
+    def get_experiment_aggregates(
+        self,
+        experiment_id: str
+    ) -> Optional[Dict[Tuple[str, str], MetricAggregate]]:
+        with self._lock:
+            if experiment_id not in self.registry['experiments']:
+                return None
+            return {
+                (variant_id, metric_name): MetricAggregate.from_dict(state)
+                for variant_id, by_metric in self._aggregates(experiment_id).items()
+                for metric_name, state in by_metric.items()
+            }
+    
+    def _aggregates(self, experiment_id: str) -> Dict[str, Dict[str, Any]]:
+        """Aggregates of an experiment, built from its results for files written before they existed"""
+        all_aggregates = self.registry.setdefault('experiment_aggregates', {})
+        if experiment_id not in all_aggregates:
+            by_variant: Dict[str, Dict[str, Any]] = {}
+            results = self.registry['experiments'][experiment_id]['results']
+            for (variant_id, metric_name), aggregate in aggregate_results(results).items():
+                by_variant.setdefault(variant_id, {})[metric_name] = aggregate.to_dict()
+            all_aggregates[experiment_id] = by_variant
+        return all_aggregates[experiment_id]
+
+
+class SQLiteRegistryBackend(RegistryBackend):
+    """
+    SQLite backend in WAL mode
+    
+    Readers never block writers, writes are short transactions instead of
+    whole-file rewrites, and several worker processes can share one
+    database. Versions are indexed by (model_type, model_id, version),
+    deployments are keyed by (deployment_name, model_type) and experiment
+    results are append-only rows, with one running aggregate per
+    (experiment, variant, metric) updated in the same transaction.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS model_versions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            model_type TEXT NOT NULL,
+            model_id TEXT NOT NULL,
+            version TEXT NOT NULL,
+            model_path TEXT NOT NULL,
+            created_at TEXT,
+            trained_at TEXT,
+            performance_metrics TEXT,
+            hyperparameters TEXT,
+            training_samples INTEGER,
+            status TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_model_versions
+            ON model_versions (model_type, model_id, version);
+        
+        CREATE TABLE IF NOT EXISTS deployments (
+            deployment_name TEXT NOT NULL,
+            model_type TEXT NOT NULL,
+            model_id TEXT NOT NULL,
+            version TEXT NOT NULL,
+            deployed_at TEXT NOT NULL,
+            model_path TEXT NOT NULL,
+            PRIMARY KEY (deployment_name, model_type)
+        );
+        
+        CREATE TABLE IF NOT EXISTS experiments (
+            experiment_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            model_type TEXT NOT NULL,
+            variants TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            status TEXT NOT NULL
+        );
+        
+        CREATE TABLE IF NOT EXISTS experiment_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            experiment_id TEXT NOT NULL REFERENCES experiments (experiment_id),
+            variant_id TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            metric_value REAL,
+            timestamp TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_experiment_results
+            ON experiment_results (experiment_id);
+        
+        CREATE TABLE IF NOT EXISTS experiment_aggregates (
+            experiment_id TEXT NOT NULL REFERENCES experiments (experiment_id),
+            variant_id TEXT NOT NULL,
+            metric_name TEXT NOT NULL,
+            state TEXT NOT NULL,
+            PRIMARY KEY (experiment_id, variant_id, metric_name)
+        );
+        
+        CREATE TABLE IF NOT EXISTS registry_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    _VERSION_COLUMNS = (
+        'version, model_path, created_at, trained_at, performance_metrics, '
+        'hyperparameters, training_samples, status'
+    )
+    
+    def __init__(self, db_path: Path, busy_timeout_ms: int = 5000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+        self._backfill_aggregates()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection in autocommit mode (transactions are explicit)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def _write(self):
+        """Write transaction; takes the write lock up front to avoid upgrade deadlocks"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def close(self) -> None:
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    def add_version(self, model_type: str, model_id: str, version_info: Dict[str, Any]) -> None:
+        with self._write() as conn:
+            self._insert_version(conn, model_type, model_id, version_info)
+    
+    def get_versions(self, model_type: str, model_id: str) -> List[Dict[str, Any]]:
+        rows = self._connection().execute(
+            f"SELECT {self._VERSION_COLUMNS} FROM model_versions "
+            "WHERE model_type = ? AND model_id = ? ORDER BY id",
+            (model_type, model_id)
+        ).fetchall()
+        return [self._version_from_row(row) for row in rows]
+    
+    def get_latest_version(self, model_type: str, model_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            f"SELECT {self._VERSION_COLUMNS} FROM model_versions "
+            "WHERE model_type = ? AND model_id = ? ORDER BY id DESC LIMIT 1",
+            (model_type, model_id)
+        ).fetchone()
+        return self._version_from_row(row) if row else None
+    
+    def list_models(self, model_type: Optional[str] = None) -> Dict[str, Any]:
+        query = f"SELECT model_type, model_id, {self._VERSION_COLUMNS} FROM model_versions"
+        params: tuple = ()
+        if model_type:
+            query += " WHERE model_type = ?"
+            params = (model_type,)
+        
+        models: Dict[str, Any] = {model_type: {}} if model_type else {}
+        for row in self._connection().execute(query + " ORDER BY id", params):
+            by_id = models.setdefault(row['model_type'], {})
+            by_id.setdefault(row['model_id'], {'versions': []})['versions'].append(
+                self._version_from_row(row)
+            )
+        return models
+    
+    def deploy(
+        self,
+        deployment_name: str,
+        model_type: str,
+        model_id: str,
+        version: str
+    ) -> Optional[Dict[str, Any]]:
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT model_path FROM model_versions "
+                "WHERE model_type = ? AND model_id = ? AND version = ? ORDER BY id LIMIT 1",
+                (model_type, model_id, version)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            deployment = {
+                'model_id': model_id,
+                'version': version,
+                'deployed_at': datetime.now().isoformat(),
+                'model_path': row['model_path']
+            }
+            conn.execute(
+                "INSERT INTO deployments "
+                "(deployment_name, model_type, model_id, version, deployed_at, model_path) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (deployment_name, model_type) DO UPDATE SET "
+                "model_id = excluded.model_id, version = excluded.version, "
+                "deployed_at = excluded.deployed_at, model_path = excluded.model_path",
+                (deployment_name, model_type, model_id, version,
+                 deployment['deployed_at'], deployment['model_path'])
+            )
+            return deployment
+    
+    def get_deployment(self, deployment_name: str, model_type: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT model_id, version, deployed_at, model_path FROM deployments "
+            "WHERE deployment_name = ? AND model_type = ?",
+            (deployment_name, model_type)
+        ).fetchone()
+        return dict(row) if row else None
+    
+    def create_experiment(self, experiment_id: str, experiment: Dict[str, Any]) -> None:
+        with self._write() as conn:
+            self._insert_experiment(conn, experiment_id, experiment)
+    
+    def append_experiment_results(
+        self,
+        experiment_id: str,
+        results: List[Dict[str, Any]],
+        aggregates: Dict[Tuple[str, str], MetricAggregate]
+    ) -> bool:
+        with self._write() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM experiments WHERE experiment_id = ?", (experiment_id,)
+            ).fetchone()
+            if not exists:
+                return False
+            self._insert_results(conn, experiment_id, results)
+            self._merge_aggregates(conn, experiment_id, aggregates)
+            return True
+    
+    def get_experiment_aggregates(
+        self,
+        experiment_id: str
+    ) -> Optional[Dict[Tuple[str, str], MetricAggregate]]:
+        conn = self._connection()
+        exists = conn.execute(
+            "SELECT 1 FROM experiments WHERE experiment_id = ?", (experiment_id,)
+        ).fetchone()
+        if not exists:
+            return None
+        rows = conn.execute(
+            "SELECT variant_id, metric_name, state FROM experiment_aggregates "
+            "WHERE experiment_id = ?",
+            (experiment_id,)
+        )
+        return {
+            (row['variant_id'], row['metric_name']): MetricAggregate.from_dict(json.loads(row['state']))
+            for row in rows
+        }
+    
+    def _backfill_aggregates(self) -> None:
+        """Build aggregates once for results recorded before they were maintained"""
+        with self._write() as conn:
+            done = conn.execute(
+                "SELECT value FROM registry_meta WHERE key = 'aggregates_backfilled'"
+            ).fetchone()
+            if done:
+                return
+            
+            experiment_ids = [
+                row['experiment_id']
+                for row in conn.execute("SELECT experiment_id FROM experiments")
+            ]
+            for experiment_id in experiment_ids:
+                results = conn.execute(
+                    "SELECT variant_id, metric_name, metric_value FROM experiment_results "
+                    "WHERE experiment_id = ?",
+                    (experiment_id,)
+                ).fetchall()
+                self._merge_aggregates(conn, experiment_id, aggregate_results(results))
+            
+            conn.execute(
+                "INSERT INTO registry_meta (key, value) VALUES ('aggregates_backfilled', ?)",
+                (datetime.now().isoformat(),)
+            )
+    
+    def get_experiment(self, experiment_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT name, model_type, variants, created_at, status FROM experiments "
+            "WHERE experiment_id = ?",
+            (experiment_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        results = conn.execute(
+            "SELECT variant_id, metric_name, metric_value, timestamp FROM experiment_results "
+            "WHERE experiment_id = ? ORDER BY id",
+            (experiment_id,)
+        ).fetchall()
+        return {
+            'name': row['name'],
+            'model_type': row['model_type'],
+            'variants': json.loads(row['variants']),
+            'created_at': row['created_at'],
+            'status': row['status'],
+            'results': [dict(r) for r in results]
+        }
+    
+    def import_json(self, json_path: Path) -> bool:
+        """
+        One-time import of a legacy registry.json
+        
+        Runs in a single transaction and is recorded in registry_meta, so
+        concurrent workers import it exactly once.
+        
+        Returns:
+            True if this call performed the import
+        """
+        with self._write() as conn:
+            done = conn.execute(
+                "SELECT value FROM registry_meta WHERE key = 'migrated_from_json'"
+            ).fetchone()
+            if done or not json_path.exists():
+                return False
+            
+            with open(json_path, 'r') as f:
+                legacy = json.load(f)
+            
+            for model_type, models in legacy.get('models', {}).items():
+                for model_id, model_info in models.items():
+                    for version_info in model_info.get('versions', []):
+                        self._insert_version(conn, model_type, model_id, version_info)
+            
+            for deployment_name, slots in legacy.get('deployments', {}).items():
+                for model_type, d in slots.items():
+                    conn.execute(
+                        "INSERT OR REPLACE INTO deployments "
+                        "(deployment_name, model_type, model_id, version, deployed_at, model_path) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (deployment_name, model_type, d['model_id'], d['version'],
+                         d.get('deployed_at', ''), d['model_path'])
+                    )
+            
+            for experiment_id, experiment in legacy.get('experiments', {}).items():
+                results = experiment.get('results', [])
+                self._insert_experiment(conn, experiment_id, experiment)
+                self._insert_results(conn, experiment_id, results)
+                self._merge_aggregates(conn, experiment_id, aggregate_results(results))
+            
+            conn.execute(
+                "INSERT INTO registry_meta (key, value) VALUES ('migrated_from_json', ?)",
+                (str(json_path),)
+            )
+            return True
+    
+    @staticmethod
+    def _insert_version(conn: sqlite3.Connection, model_type: str, model_id: str, v: Dict[str, Any]) -> None:
+        conn.execute(
+            "INSERT INTO model_versions (model_type, model_id, version, model_path, created_at, "
+            "trained_at, performance_metrics, hyperparameters, training_samples, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (model_type, model_id, v['version'], v['model_path'], v.get('created_at'),
+             v.get('trained_at'), json.dumps(v.get('performance_metrics', {}), default=str),
+             json.dumps(v.get('hyperparameters', {}), default=str),
+             v.get('training_samples', 0), v.get('status'))
+        )
+    
+    @staticmethod
+    def _insert_experiment(conn: sqlite3.Connection, experiment_id: str, e: Dict[str, Any]) -> None:
+        conn.execute(
+            "INSERT INTO experiments (experiment_id, name, model_type, variants, created_at, status) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (experiment_id, e['name'], e['model_type'], json.dumps(e.get('variants', [])),
+             e['created_at'], e.get('status', 'active'))
+        )
+    
+    @staticmethod
+    def _insert_results(conn: sqlite3.Connection, experiment_id: str, results: List[Dict[str, Any]]) -> None:
+        conn.executemany(
+            "INSERT INTO experiment_results "
+            "(experiment_id, variant_id, metric_name, metric_value, timestamp) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (experiment_id, r['variant_id'], r['metric_name'], r['metric_value'], r['timestamp'])
+                for r in results
+            ]
+        )
+    
+    @staticmethod
+    def _merge_aggregates(
+        conn: sqlite3.Connection,
+        experiment_id: str,
+        aggregates: Dict[Tuple[str, str], MetricAggregate]
+    ) -> None:
+        """Merge into the stored aggregates; call inside a write transaction"""
+        for (variant_id, metric_name), aggregate in aggregates.items():
+            row = conn.execute(
+                "SELECT state FROM experiment_aggregates "
+                "WHERE experiment_id = ? AND variant_id = ? AND metric_name = ?",
+                (experiment_id, variant_id, metric_name)
+            ).fetchone()
+            if row is not None:
+                aggregate = MetricAggregate.from_dict(json.loads(row['state'])).merge(aggregate)
+            conn.execute(
+                "INSERT OR REPLACE INTO experiment_aggregates "
+                "(experiment_id, variant_id, metric_name, state) VALUES (?, ?, ?, ?)",
+                (experiment_id, variant_id, metric_name, json.dumps(aggregate.to_dict()))
+            )
+    
+    @staticmethod
+    def _version_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'version': row['version'],
+            'model_path': row['model_path'],
+            'created_at': row['created_at'],
+            'trained_at': row['trained_at'],
+            'performance_metrics': json.loads(row['performance_metrics'] or '{}'),
+            'hyperparameters': json.loads(row['hyperparameters'] or '{}'),
+            'training_samples': row['training_samples'],
+            'status': row['status']
+        }
+
+
+class ModelRegistry:
+    """
+    Central registry for all ML models
+    Handles versioning, deployment, and A/B testing
+    
+    Storage is pluggable; by default a SQLite database next to
+    `registry_path`. A legacy registry.json at the same location is
+    imported on first open and renamed to registry.json.migrated; a
+    registry.json that shows up after that is left alone with a warning.
+    """
+    
+    def __init__(
+        self,
+        registry_path: str = "models/registry.db",
+        backend: Optional[RegistryBackend] = None
+    ):
+        self.registry_path = Path(registry_path)
+        if backend is None:
+            backend = SQLiteRegistryBackend(self.registry_path.with_suffix('.db'))
+            self._migrate_json(backend, self.registry_path.with_suffix('.json'))
+        self.backend = backend
+    
+    @staticmethod
+    def _migrate_json(backend: SQLiteRegistryBackend, json_path: Path) -> None:
+        """Import a legacy registry.json once, then move it aside"""
+        if not json_path.exists():
+            return
+        if not backend.import_json(json_path):
+            # Already migrated (or another worker is migrating right now). A
+            # file written since, e.g. by a not-yet-upgraded worker during a
+            # rolling deploy, holds registrations the database lacks: keep it
+            if json_path.exists():
+                logger.warning(
+                    "Legacy registry %s was not imported: the registry was already migrated from JSON. "
+                    "Registrations in it are not in %s; the file is left in place",
+                    json_path, json_path.with_suffix('.db')
+                )
+            return
+        try:
+            os.replace(json_path, json_path.with_name(json_path.name + '.migrated'))
+        except FileNotFoundError:
+            # Another worker moved it first
+            pass
     
     def register_model(
         self,
         model_id: str,
         model_type: str,
         version: str,
-        metadata: ModelMetadata,
+        metadata: ModelManifest,
         model_path: str
     ) -> None:
         """Register a trained model"""
-        if model_type not in self.registry['models']:
-            self.registry['models'][model_type] = {}
-        
-        if model_id not in self.registry['models'][model_type]:
-            self.registry['models'][model_type][model_id] = {'versions': []}
+        trained_at = metadata.trained_at
+        if isinstance(trained_at, datetime):
+            trained_at = trained_at.isoformat()
         
         version_info = {
             'version': version,
             'model_path': model_path,
             'created_at': datetime.now().isoformat(),
-            'trained_at': metadata.trained_at.isoformat() if metadata.trained_at else None,
+            'trained_at': trained_at or None,
             'performance_metrics': metadata.performance_metrics,
             'hyperparameters': metadata.hyperparameters,
             'training_samples': metadata.training_samples,
             'status': metadata.status
         }
         
-        self.registry['models'][model_type][model_id]['versions'].append(version_info)
-        self._save_registry()
+        self.backend.add_version(model_type, model_id, version_info)
     
     def get_model_info(self, model_type: str, model_id: str) -> Optional[Dict[str, Any]]:
         """Get information about a model"""
-        if model_type in self.registry['models']:
-            return self.registry['models'][model_type].get(model_id)
-        return None
+        versions = self.backend.get_versions(model_type, model_id)
+        return {'versions': versions} if versions else None
     
     def get_latest_version(self, model_type: str, model_id: str) -> Optional[Dict[str, Any]]:
         """Get latest version of a model"""
-        model_info = self.get_model_info(model_type, model_id)
-        if model_info and model_info['versions']:
-            return model_info['versions'][-1]
-        return None
+        return self.backend.get_latest_version(model_type, model_id)
     
     def list_models(self, model_type: Optional[str] = None) -> Dict[str, Any]:
         """List all models, optionally filtered by type"""
-        if model_type:
-            return {model_type: self.registry['models'].get(model_type, {})}
-        return self.registry['models']
+        return self.backend.list_models(model_type)
     
     def deploy_model(
         self,
@@ -89,33 +719,7 @@ class ModelRegistry:
         deployment_name: str = 'production'
     ) -> bool:
         """Deploy a specific model version"""
-        model_info = self.get_model_info(model_type, model_id)
-        if not model_info:
-            return False
-        
-        # Find version
-        version_info = None
-        for v in model_info['versions']:
-            if v['version'] == version:
-                version_info = v
-                break
-        
-        if not version_info:
-            return False
-        
-        # Deploy
-        if deployment_name not in self.registry['deployments']:
-            self.registry['deployments'][deployment_name] = {}
-        
-        self.registry['deployments'][deployment_name][model_type] = {
-            'model_id': model_id,
-            'version': version,
-            'deployed_at': datetime.now().isoformat(),
-            'model_path': version_info['model_path']
-        }
-        
-        self._save_registry()
-        return True
+        return self.backend.deploy(deployment_name, model_type, model_id, version) is not None
     
     def get_deployed_model(
         self,
@@ -123,9 +727,7 @@ class ModelRegistry:
         deployment_name: str = 'production'
     ) -> Optional[Dict[str, Any]]:
         """Get currently deployed model for a type"""
-        if deployment_name in self.registry['deployments']:
-            return self.registry['deployments'][deployment_name].get(model_type)
-        return None
+        return self.backend.get_deployment(deployment_name, model_type)
     
     def create_experiment(
         self,
@@ -136,16 +738,14 @@ class ModelRegistry:
         """Create A/B test experiment"""
         experiment_id = f"{experiment_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        self.registry['experiments'][experiment_id] = {
+        self.backend.create_experiment(experiment_id, {
             'name': experiment_name,
             'model_type': model_type,
             'variants': variants,
             'created_at': datetime.now().isoformat(),
-            'status': 'active',
-            'results': []
-        }
+            'status': 'active'
+        })
         
-        self._save_registry()
         return experiment_id
     
     def record_experiment_result(
@@ -155,19 +755,58 @@ class ModelRegistry:
         metric_name: str,
         metric_value: float
     ) -> None:
-        """Record experiment result"""
-        if experiment_id in self.registry['experiments']:
-            self.registry['experiments'][experiment_id]['results'].append({
-                'variant_id': variant_id,
-                'metric_name': metric_name,
-                'metric_value': metric_value,
-                'timestamp': datetime.now().isoformat()
-            })
-            self._save_registry()
+        """
+        Record experiment result
+        
+        For high-volume recording use ExperimentRecorder, which batches
+        results into record_experiment_results.
+        """
+        self.record_experiment_results(experiment_id, [{
+            'variant_id': variant_id,
+            'metric_name': metric_name,
+            'metric_value': metric_value,
+            'timestamp': datetime.now().isoformat()
+        }])
+    
+    def record_experiment_results(self, experiment_id: str, results: List[Dict[str, Any]]) -> bool:
+        """
+        Record a batch of results in one write
+        
+        Each result has variant_id, metric_name, metric_value and timestamp.
+        Per-variant aggregates are updated in the same transaction.
+        
+        Returns:
+            False if the experiment does not exist
+        """
+        if not results:
+            return True
+        return self.backend.append_experiment_results(
+            experiment_id, results, aggregate_results(results)
+        )
     
     def get_experiment_results(self, experiment_id: str) -> Optional[Dict[str, Any]]:
         """Get experiment results"""
-        return self.registry['experiments'].get(experiment_id)
+        return self.backend.get_experiment(experiment_id)
+    
+    def get_experiment_summary(self, experiment_id: str) -> Optional[Dict[str, Dict[str, Dict[str, float]]]]:
+        """
+        Per-variant statistics read from the running aggregates
+        
+        Costs O(variants x metrics) regardless of how many results were
+        recorded.
+        
+        Returns:
+            {variant_id: {metric_name: {count, mean, variance, std, min, max,
+            p50, p90, p95, p99}}}, or None if the experiment does not exist
+        """
+        aggregates = self.backend.get_experiment_aggregates(experiment_id)
+        if aggregates is None:
+            return None
+        
+        summary: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (variant_id, metric_name), aggregate in aggregates.items():
+            summary.setdefault(variant_id, {})[metric_name] = aggregate.summary()
+        return summary
 
 
 # Global registry instance
@@ -0,0 +1,216 @@
+"""
+Serving-side holders for deployed models
+Keeps the model behind a deployment slot warm and swaps in new versions atomically
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+from dataclasses import dataclass
+import threading
+import time
+
+from .ml_model_base import MLModelBase, ValidationError
+from .model_registry import ModelRegistry, get_registry
+
+
+@dataclass(frozen=True)
+class LoadedDeployment:
+    """A deployed version that is loaded and validated"""
+    model: MLModelBase
+    model_id: str
+    version: str
+    model_path: str
+    deployed_at: str
+    loaded_at: float
+
+
+class DeployedModelHolder:
+    """
+    Holds the loaded model of one deployment slot
+    
+    A watcher thread polls the registry's deployment pointer. When it moves,
+    the new version is loaded, its checksums verified and an optional
+    `validate(model)` check run, all off the request path; only then is the
+    live reference replaced. Requests take one snapshot with get() and use
+    it to the end, so in-flight requests finish on the old model and the
+    next request gets the new one. If a new version fails to load, the
+    current one keeps serving and that pointer is not retried until it
+    moves again.
+    """
+    
+    def __init__(
+        self,
+        model_type: str,
+        factory: Callable[[str], MLModelBase],
+        deployment_name: str = 'production',
+        registry: Optional[ModelRegistry] = None,
+        poll_interval: Optional[float] = 5.0,
+        validate: Optional[Callable[[MLModelBase], None]] = None
+    ):
+        """
+        Args:
+            model_type: Registry model type of the slot
+            factory: Builds an unloaded model for a model_id
+            deployment_name: Deployment slot to follow
+            registry: Registry to watch (defaults to the global one)
+            poll_interval: Seconds between pointer checks; None disables the
+                watcher and leaves refreshing to refresh()
+            validate: Extra check on a loaded model; raise to reject it
+        """
+        self.model_type = model_type
+        self.factory = factory
+        self.deployment_name = deployment_name
+        self.poll_interval = poll_interval
+        self.validate = validate
+        self.swap_count = 0
+        self.last_error: Optional[str] = None
+        
+        self._registry = registry
+        self._live: Optional[LoadedDeployment] = None
+        self._failed_pointer: Optional[Tuple[str, str, str]] = None
+        self._refresh_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def registry(self) -> ModelRegistry:
+        if self._registry is None:
+            self._registry = get_registry()
+        return self._registry
+    
+    def get(self, model_id: Optional[str] = None) -> Optional[LoadedDeployment]:
+        """
+        Snapshot of the live deployment
+        
+        The first call loads the current deployment synchronously and starts
+        the watcher; later calls only read a reference.
+        
+        Args:
+            model_id: Only return the deployment if it serves this model
+        
+        Returns:
+            The loaded deployment, or None if the slot is empty, failed to
+            load or serves a different model
+        """
+        if self._thread is None and self.poll_interval:
+            self.start()
+        elif self._live is None and self._failed_pointer is None:
+            self.refresh()
+        
+        live = self._live
+        if live is None or (model_id is not None and live.model_id != model_id):
+            return None
+        return live
+    
+    def refresh(self) -> bool:
+        """
+        Check the deployment pointer and swap in a newly deployed version
+        
+        Returns:
+            True if a new version was swapped in
+        """
+        with self._refresh_lock:
+            deployed = self.registry.get_deployed_model(self.model_type, self.deployment_name)
+            if deployed is None:
+                return False
+            
+            pointer = (deployed['model_id'], deployed['version'], deployed['model_path'])
+            live = self._live
+            if live is not None and pointer == (live.model_id, live.version, live.model_path):
+                return False
+            if pointer == self._failed_pointer:
+                return False
+            
+            try:
+                model = self._load(deployed)
+            except Exception as e:
+                self._failed_pointer = pointer
+                self.last_error = f"{deployed['model_id']} {deployed['version']}: {e}"
+                return False
+            
+            self._live = LoadedDeployment(
+                model=model,
+                model_id=deployed['model_id'],
+                version=deployed['version'],
+                model_path=deployed['model_path'],
+                deployed_at=deployed['deployed_at'],
+                loaded_at=time.time()
+            )
+            self._failed_pointer = None
+            self.last_error = None
+            self.swap_count += 1
+            return True
+    
+    def start(self) -> None:
+        """Load the current deployment and start watching for new ones"""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self.refresh()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._watch, name=f"deployment-{self.model_type}", daemon=True
+            )
+            self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the watcher; the live model stays loaded"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def status(self) -> Dict[str, Any]:
+        """Live version and watcher state for health reporting"""
+        live = self._live
+        return {
+            'model_type': self.model_type,
+            'deployment_name': self.deployment_name,
+            'model_id': live.model_id if live else None,
+            'version': live.version if live else None,
+            'loaded_at': live.loaded_at if live else None,
+            'swap_count': self.swap_count,
+            'watching': self._thread is not None,
+            'last_error': self.last_error
+        }
+    
+    def _load(self, deployed: Dict[str, Any]) -> MLModelBase:
+        """Load and fully validate a deployed version"""
+        model = self.factory(deployed['model_id'])
+        # Verification happens here, off the request path, so never defer it
+        model.deferred_verification = False
+        model.load(deployed['model_path'])
+        if not model.is_trained:
+            raise ValidationError(
+                "Loaded model is not trained", context={'model_path': deployed['model_path']}
+            )
+        if self.validate is not None:
+            self.validate(model)
+        return model
+    
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Registry unavailable; keep serving and retry on the next tick
+                self.last_error = str(e)
+
+
+# Holders shared by the serving functions, keyed by (model_type, deployment_name)
+_holders: Dict[Tuple[str, str], DeployedModelHolder] = {}
+_holders_lock = threading.Lock()
+
+def get_model_holder(
+    model_type: str,
+    factory: Callable[[str], MLModelBase],
+    deployment_name: str = 'production'
+) -> DeployedModelHolder:
+    """Get the process-wide holder for a deployment slot"""
+    key = (model_type, deployment_name)
+    with _holders_lock:
+        holder = _holders.get(key)
+        if holder is None:
+            holder = DeployedModelHolder(model_type, factory, deployment_name)
+            _holders[key] = holder
+        return holder
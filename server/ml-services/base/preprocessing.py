@@ -4,11 +4,21 @@ Shared feature extraction, normalization, and encoding
 """
 
 import numpy as np
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime
-import hashlib
 from dataclasses import dataclass
 
+from .windowing import sliding_windows
+from .columnar import (
+    factorize,
+    get_column,
+    hash_strings,
+    hour_and_weekday,
+    parse_timestamps,
+    stack_features,
+    to_float,
+)
+
 
 @dataclass
 class FeatureConfig:
@@ -23,71 +33,187 @@ class DeterministicEncoder:
     """
     Deterministic encoding for categorical variables
     Uses consistent hashing instead of random hashing
+    
+    The vocabulary is a sorted string array; a category's code is its
+    position modulo max_categories. Columns are factorized and only the
+    distinct values are looked up (np.searchsorted) or, if unseen, hashed
+    (FNV-1a, see columnar.hash_strings).
+    
+    partial_fit() and merge() grow the vocabulary, so fitting in chunks or
+    on several workers ends with the same vocabulary as one fit() over all
+    the data. Codes of known categories can shift while it grows.
     """
     
+    # Encoders pickled before per-category counts were kept
+    counts: Optional[np.ndarray] = None
+    
     def __init__(self, max_categories: int = 1000):
         self.max_categories = max_categories
-        self.category_mappings = {}
+        self.vocabulary = np.empty(0, dtype=np.str_)
+        self.counts = np.empty(0, dtype=np.int64)
         self.is_fitted = False
     
-    def fit(self, categories: List[str]) -> 'DeterministicEncoder':
+    @property
+    def category_mappings(self) -> Dict[str, int]:
+        """Vocabulary as {category: code}"""
+        codes = np.arange(len(self.vocabulary)) % self.max_categories
+        return dict(zip(self.vocabulary.tolist(), codes.tolist()))
+    
+    def fit(self, categories: Iterable[str]) -> 'DeterministicEncoder':
         """Learn category mappings from data"""
-        unique_categories = sorted(set(categories))  # Sort for determinism
-        
-        for idx, category in enumerate(unique_categories):
-            self.category_mappings[category] = idx % self.max_categories
-        
-        self.is_fitted = True
+        self.vocabulary = np.empty(0, dtype=np.str_)
+        self.counts = np.empty(0, dtype=np.int64)
+        return self.partial_fit(categories)
+    
+    def partial_fit(self, categories: Iterable[str]) -> 'DeterministicEncoder':
+        """Add the categories of one chunk to the vocabulary"""
+        codes, uniques = factorize(categories)
+        self._add_vocabulary(uniques, np.bincount(codes, minlength=len(uniques)))
+        return self
+    
+    def merge(self, other: 'DeterministicEncoder') -> 'DeterministicEncoder':
+        """Add the vocabulary of an encoder fitted elsewhere"""
+        self._add_vocabulary(other.vocabulary, other.counts)
         return self
     
-    def transform(self, categories: List[str]) -> np.ndarray:
+    def code_statistics(self) -> Tuple[float, float]:
+        """
+        Mean and variance of the codes of all categories seen while fitting
+        
+        Derived from category counts, so they stay exact as codes shift
+        while the vocabulary grows.
+        """
+        total = self.counts.sum()
+        if total == 0:
+            return 0.0, 0.0
+        codes = np.arange(len(self.vocabulary)) % self.max_categories
+        mean = float((self.counts * codes).sum() / total)
+        var = float((self.counts * (codes - mean) ** 2).sum() / total)
+        return mean, var
+    
+    def transform(self, categories: Iterable[str]) -> np.ndarray:
         """Transform categories to numerical codes"""
         if not self.is_fitted:
             raise ValueError("Encoder must be fitted before transform")
         
-        encoded = []
-        for cat in categories:
-            if cat in self.category_mappings:
-                encoded.append(self.category_mappings[cat])
-            else:
-                # Use deterministic hash for unseen categories
-                encoded.append(self._hash_string(cat) % self.max_categories)
+        codes, uniques = factorize(categories)
+        return self.encode_unique(uniques)[codes]
+    
+    def encode_unique(self, uniques: np.ndarray) -> np.ndarray:
+        """Codes for an array of distinct categories"""
+        uniques = np.asarray(uniques, dtype=np.str_)
+        n_known = len(self.vocabulary)
+        position = np.searchsorted(self.vocabulary, uniques)
+        if n_known:
+            known = self.vocabulary[np.minimum(position, n_known - 1)] == uniques
+        else:
+            known = np.zeros(len(uniques), dtype=bool)
         
-        return np.array(encoded)
+        encoded = position % self.max_categories
+        if not known.all():
+            # Use deterministic hash for unseen categories
+            unseen = hash_strings(uniques[~known]) % np.uint64(self.max_categories)
+            encoded[~known] = unseen.astype(np.int64)
+        return encoded
     
-    def fit_transform(self, categories: List[str]) -> np.ndarray:
+    def fit_transform(self, categories: Iterable[str]) -> np.ndarray:
         """Fit and transform in one step"""
-        return self.fit(categories).transform(categories)
+        codes, uniques = factorize(categories)
+        self.vocabulary = uniques
+        self.counts = np.bincount(codes, minlength=len(uniques))
+        self.is_fitted = True
+        return np.arange(len(uniques))[codes] % self.max_categories
+    
+    def _add_vocabulary(self, uniques: np.ndarray, counts: np.ndarray) -> None:
+        """Union a sorted array of categories (with counts) into the vocabulary"""
+        if self.counts is None:
+            raise ValueError("Encoder was fitted before incremental fitting was supported; refit it")
+        vocabulary = np.union1d(self.vocabulary, uniques)
+        merged = np.zeros(len(vocabulary), dtype=np.int64)
+        merged[np.searchsorted(vocabulary, self.vocabulary)] += self.counts
+        merged[np.searchsorted(vocabulary, uniques)] += counts
+        self.vocabulary, self.counts = vocabulary, merged
+        self.is_fitted = True
     
-    def _hash_string(self, s: str) -> int:
-        """Deterministic hash function"""
-        return int(hashlib.md5(s.encode()).hexdigest(), 16)
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Encoders pickled before the array vocabulary stored a dict
+        if 'category_mappings' in state:
+            mappings = state.pop('category_mappings')
+            state['vocabulary'] = np.array(sorted(mappings), dtype=np.str_)
+        self.__dict__.update(state)
 
 
 class StandardScaler:
     """
     Standard scaler for normalization
     Saves mean and std for consistent scaling
+    
+    Statistics are float64 count/mean/M2 per column. partial_fit() folds in
+    one chunk at a time and merge() combines scalers fitted on different
+    workers (Chan et al.'s parallel update), matching fit() on all rows.
     """
     
+    # Scalers pickled before incremental statistics were kept
+    n_samples_seen = 0
+    _m2: Optional[np.ndarray] = None
+    
     def __init__(self):
         self.mean = None
         self.std = None
+        self.n_samples_seen = 0
+        self._m2 = None
         self.is_fitted = False
     
     def fit(self, data: np.ndarray) -> 'StandardScaler':
         """Learn mean and std from data"""
-        self.mean = np.mean(data, axis=0)
-        self.std = np.std(data, axis=0)
-        self.is_fitted = True
+        self.mean = self.std = self._m2 = None
+        self.n_samples_seen = 0
+        self.is_fitted = False
+        return self.partial_fit(data)
+    
+    def partial_fit(self, data: np.ndarray) -> 'StandardScaler':
+        """Update mean and std with a chunk of rows"""
+        data = np.asarray(data, dtype=np.float64)
+        if len(data) == 0:
+            return self
+        batch_mean = data.mean(axis=0)
+        batch_m2 = ((data - batch_mean) ** 2).sum(axis=0)
+        self._combine(len(data), batch_mean, batch_m2)
         return self
     
+    def merge(self, other: 'StandardScaler') -> 'StandardScaler':
+        """Fold in the statistics of a scaler fitted on other rows"""
+        if other.n_samples_seen:
+            self._combine(other.n_samples_seen, other.mean, other._m2)
+        return self
+    
+    def set_statistics(self, column: int, mean: float, var: float) -> None:
+        """Overwrite one column's statistics (over the rows seen so far)"""
+        self.mean[column] = mean
+        self._m2[column] = var * self.n_samples_seen
+        self.std[column] = np.sqrt(var)
+    
+    def _combine(self, n: int, mean: np.ndarray, m2: np.ndarray) -> None:
+        if self.is_fitted and self._m2 is None:
+            raise ValueError("Scaler was fitted before incremental fitting was supported; refit it")
+        
+        if self.n_samples_seen == 0:
+            self.mean, self._m2 = np.array(mean, dtype=np.float64), np.array(m2, dtype=np.float64)
+        else:
+            total = self.n_samples_seen + n
+            delta = mean - self.mean
+            self.mean = self.mean + delta * (n / total)
+            self._m2 = self._m2 + m2 + delta ** 2 * (self.n_samples_seen * n / total)
+        self.n_samples_seen += n
+        self.std = np.sqrt(self._m2 / self.n_samples_seen)
+        self.is_fitted = True
+    
     def transform(self, data: np.ndarray) -> np.ndarray:
         """Transform data using learned statistics"""
         if not self.is_fitted:
             raise ValueError("Scaler must be fitted before transform")
         
-        return (data - self.mean) / (self.std + 1e-8)
+        return ((data - self.mean) / (self.std + 1e-8)).astype(self._dtype(data), copy=False)
     
     def fit_transform(self, data: np.ndarray) -> np.ndarray:
         """Fit and transform in one step"""
@@ -98,13 +224,24 @@ class StandardScaler:
         if not self.is_fitted:
             raise ValueError("Scaler must be fitted before inverse_transform")
         
-        return data * self.std + self.mean
+        return (data * self.std + self.mean).astype(self._dtype(data), copy=False)
+    
+    @staticmethod
+    def _dtype(data: np.ndarray) -> np.dtype:
+        """Keep float inputs in their precision (statistics are float64)"""
+        dtype = np.asarray(data).dtype
+        return dtype if np.issubdtype(dtype, np.floating) else np.dtype(np.float64)
 
 
 class FeatureExtractor:
     """
     Consistent feature extraction from event logs
     Ensures deterministic and reproducible features
+    
+    Besides fit(), partial_fit() fits chunk by chunk and merge() combines
+    extractors fitted on different workers, so large histories never need
+    to be in memory at once. Both end in the same state as fit() on all
+    events.
     """
     
     def __init__(self, config: Optional[FeatureConfig] = None):
@@ -121,21 +258,51 @@ class FeatureExtractor:
     
     def fit(self, events: List[Dict[str, Any]]) -> 'FeatureExtractor':
         """Learn feature extraction parameters from data"""
-        # Fit categorical encoders
+        self.categorical_encoders = {}
+        self.scaler = StandardScaler() if self.config.use_normalization else None
+        self.is_fitted = False
+        return self.partial_fit(events)
+    
+    def partial_fit(self, events: List[Dict[str, Any]]) -> 'FeatureExtractor':
+        """Update feature extraction parameters with a chunk of events"""
+        # Grow categorical vocabularies
         for cat_feature in self.config.categorical_features:
-            categories = [str(event.get(cat_feature, '')) for event in events]
-            encoder = DeterministicEncoder()
-            encoder.fit(categories)
-            self.categorical_encoders[cat_feature] = encoder
+            encoder = self.categorical_encoders.setdefault(cat_feature, DeterministicEncoder())
+            encoder.partial_fit(get_column(events, cat_feature, ''))
         
-        # Fit scaler if needed
+        # Update scaler if needed
         if self.scaler is not None:
-            features = self._extract_raw_features(events)
-            self.scaler.fit(features)
+            self.scaler.partial_fit(self._extract_raw_features(events))
+            self._sync_categorical_statistics()
         
         self.is_fitted = True
         return self
     
+    def merge(self, other: 'FeatureExtractor') -> 'FeatureExtractor':
+        """Combine with an extractor fitted on other events"""
+        for cat_feature, encoder in other.categorical_encoders.items():
+            self.categorical_encoders.setdefault(cat_feature, DeterministicEncoder()).merge(encoder)
+        if self.scaler is not None and other.scaler is not None:
+            self.scaler.merge(other.scaler)
+            self._sync_categorical_statistics()
+        
+        self.is_fitted = self.is_fitted or other.is_fitted
+        return self
+    
+    def _sync_categorical_statistics(self) -> None:
+        """
+        Recompute scaler statistics of the categorical columns from counts
+        
+        Category codes shift while vocabularies grow, so statistics merged
+        chunk by chunk are stale for these columns.
+        """
+        if not self.scaler.is_fitted:
+            return
+        offset = len(self.config.numerical_features)
+        for i, cat_feature in enumerate(self.config.categorical_features):
+            mean, var = self.categorical_encoders[cat_feature].code_statistics()
+            self.scaler.set_statistics(offset + i, mean, var)
+    
     def transform(self, events: List[Dict[str, Any]]) -> np.ndarray:
         """Extract features from events"""
         if not self.is_fitted:
@@ -154,43 +321,36 @@ class FeatureExtractor:
     
     def _extract_raw_features(self, events: List[Dict[str, Any]]) -> np.ndarray:
         """Extract raw features before scaling"""
-        feature_matrix = []
+        columns = []
         
-        for event in events:
-            feature_vec = []
-            
-            # Numerical features
-            for num_feature in self.config.numerical_features:
-                value = event.get(num_feature, 0.0)
-                feature_vec.append(float(value) if value is not None else 0.0)
-            
-            # Categorical features (encoded)
-            for cat_feature in self.config.categorical_features:
-                category = str(event.get(cat_feature, ''))
-                if cat_feature in self.categorical_encoders:
-                    encoded = self.categorical_encoders[cat_feature].transform([category])[0]
-                else:
-                    # Use deterministic hash if not fitted
-                    encoded = int(hashlib.md5(category.encode()).hexdigest(), 16) % 1000
-                feature_vec.append(float(encoded))
-            
-            # Temporal features
-            for temp_feature in self.config.temporal_features:
-                timestamp = event.get(temp_feature)
-                if timestamp:
-                    if isinstance(timestamp, datetime):
-                        feature_vec.append(float(timestamp.hour))
-                        feature_vec.append(float(timestamp.weekday()))
-                    else:
-                        feature_vec.append(0.0)
-                        feature_vec.append(0.0)
-                else:
-                    feature_vec.append(0.0)
-                    feature_vec.append(0.0)
-            
-            feature_matrix.append(feature_vec)
+        # Numerical features
+        for num_feature in self.config.numerical_features:
+            columns.append(to_float(get_column(events, num_feature, 0.0)))
         
-        return np.array(feature_matrix)
+        # Categorical features (encoded once per distinct value)
+        for cat_feature in self.config.categorical_features:
+            codes, uniques = factorize(get_column(events, cat_feature, ''))
+            if cat_feature in self.categorical_encoders:
+                encoded = self.categorical_encoders[cat_feature].encode_unique(uniques)
+            else:
+                # Use deterministic hash if not fitted
+                encoded = (hash_strings(uniques) % np.uint64(1000)).astype(np.int64)
+            columns.append(encoded[codes] if len(codes) else np.empty(0))
+        
+        # Temporal features (only datetime values contribute)
+        for temp_feature in self.config.temporal_features:
+            timestamps = get_column(events, temp_feature)
+            is_datetime = np.fromiter(
+                (isinstance(ts, datetime) for ts in timestamps), dtype=bool, count=len(timestamps)
+            )
+            hour = np.zeros(len(events))
+            weekday = np.zeros(len(events))
+            if is_datetime.any():
+                parsed = parse_timestamps(timestamps[is_datetime])
+                hour[is_datetime], weekday[is_datetime] = hour_and_weekday(parsed.wall)
+            columns.extend([hour, weekday])
+        
+        return stack_features(columns)
 
 
 class TimeSeriesPreprocessor:
@@ -285,12 +445,6 @@ class TimeSeriesPreprocessor:
             forecast_horizon: Number of steps to forecast
         
         Returns:
-            (X, y) sequences
+            (X, y) sequences as read-only views into `data`
         """
-        X, y = [], []
-        
-        for i in range(len(data) - sequence_length - forecast_horizon + 1):
-            X.append(data[i:i + sequence_length])
-            y.append(data[i + sequence_length:i + sequence_length + forecast_horizon])
-        
-        return np.array(X), np.array(y)
+        return sliding_windows(data, sequence_length, forecast_horizon)
@@ -8,6 +8,15 @@ from dataclasses import dataclass
 from datetime import datetime
 import numpy as np
 
+from .columnar import (
+    get_column,
+    hour_and_weekday,
+    map_uniques,
+    parse_timestamps,
+    stack_features,
+    to_float,
+)
+
 
 @dataclass
 class EventLogSchema:
@@ -56,17 +65,23 @@ class AnomalyDetectionInput:
     
     def to_feature_matrix(self) -> np.ndarray:
         """Convert events to feature matrix"""
-        features = []
-        for event in self.events:
-            feature_vec = [
-                event.duration if event.duration is not None else 0.0,
-                hash(event.resource) % 1000 if event.resource else 0.0,
-                event.cost if event.cost is not None else 0.0,
-                event.timestamp.hour if event.timestamp else 0,
-                event.timestamp.weekday() if event.timestamp else 0
-            ]
-            features.append(feature_vec)
-        return np.array(features)
+        if not self.events:
+            return np.array([])
+        
+        resources = get_column(self.events, 'resource')
+        has_resource = resources.astype(bool)
+        resource_hash = np.where(has_resource, map_uniques(resources, lambda r: hash(r) % 1000), 0.0)
+        
+        parsed = parse_timestamps(get_column(self.events, 'timestamp'))
+        hour, weekday = hour_and_weekday(parsed.wall)
+        
+        return stack_features([
+            to_float(get_column(self.events, 'duration')),
+            resource_hash,
+            to_float(get_column(self.events, 'cost')),
+            np.where(parsed.valid, hour, 0),
+            np.where(parsed.valid, weekday, 0),
+        ])
 
 
 @dataclass
@@ -4,9 +4,15 @@ Persistence testing, backtesting, and evaluation framework
 """
 
 import numpy as np
-from typing import Any, Dict, List, Callable, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Callable, Optional, Tuple
 from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import queue
 import tempfile
+import time
 import json
 
 
@@ -88,6 +94,288 @@ class PersistenceTest:
         return results
 
 
+@dataclass
+class FoldResult:
+    """Outcome of one backtest fold; train is data[train_start:train_end], test data[train_end:test_end]"""
+    fold: int
+    train_start: int
+    train_end: int
+    test_end: int
+    predictions: List[float] = field(default_factory=list)
+    metrics: Dict[str, float] = field(default_factory=dict)
+    warm_started: bool = False
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class BacktestSummary:
+    """Pooled error metrics over all test points, updated as folds arrive"""
+    
+    def __init__(self):
+        self.n_points = 0
+        self.abs_error = 0.0
+        self.sq_error = 0.0
+        self.pct_error = 0.0
+        self.folds: List[FoldResult] = []
+    
+    def add(self, result: FoldResult, actuals: np.ndarray) -> None:
+        self.folds.append(result)
+        if result.error is not None:
+            return
+        diff = np.asarray(result.predictions) - actuals
+        self.n_points += len(diff)
+        self.abs_error += float(np.abs(diff).sum())
+        self.sq_error += float((diff ** 2).sum())
+        self.pct_error += float(np.abs(diff / (actuals + 1e-10)).sum())
+    
+    def metrics(self) -> Dict[str, float]:
+        if not self.n_points:
+            return {}
+        return {
+            'mae': self.abs_error / self.n_points,
+            'rmse': float(np.sqrt(self.sq_error / self.n_points)),
+            'mape': self.pct_error / self.n_points * 100
+        }
+
+
+# Result queue of a backtest worker process, set by _init_backtest_worker
+_FOLD_QUEUE = None
+
+
+def _init_backtest_worker(fold_queue) -> None:
+    global _FOLD_QUEUE
+    _FOLD_QUEUE = fold_queue
+
+
+def _run_fold_chain_in_worker(*args) -> None:
+    _run_fold_chain(*args, emit=_FOLD_QUEUE.put)
+
+
+def _run_fold_chain(
+    model_class: type,
+    model_kwargs: Dict[str, Any],
+    data: np.ndarray,
+    folds: List[Tuple[int, int, int, int]],
+    warm_start: bool,
+    emit: Callable[[FoldResult], None]
+) -> None:
+    """
+    Fit and forecast a run of consecutive folds, emitting each result
+    
+    With warm_start the first fold is fitted from scratch and each later
+    fold updates the previous model with the points its training window
+    gained; a failed update falls back to a fresh fit.
+    """
+    model = None
+    fitted_end = None
+    
+    for fold, train_start, train_end, test_end in folds:
+        started = time.perf_counter()
+        result = FoldResult(fold, train_start, train_end, test_end)
+        train_data = data[train_start:train_end]
+        try:
+            if not warm_start:
+                model = None
+            elif model is not None:
+                try:
+                    model.update(data[fitted_end:train_end])
+                    result.warm_started = True
+                except Exception:
+                    model = None
+            
+            if model is None:
+                model = model_class(model_id=f"backtest_{fold}", **model_kwargs)
+                training = model.train(train_data)
+                if not training.success:
+                    raise RuntimeError(f"Training failed - {training.error}")
+            fitted_end = train_end
+            
+            forecast = model.forecast(train_data, horizon=test_end - train_end)
+            pred_values = forecast.get('forecast', []) if isinstance(forecast, dict) else forecast
+            predictions = np.asarray(pred_values, dtype=np.float64)
+            actuals = data[train_end:test_end]
+            
+            result.predictions = predictions.tolist()
+            result.metrics = {
+                'mae': float(np.mean(np.abs(predictions - actuals))),
+                'rmse': float(np.sqrt(np.mean((predictions - actuals) ** 2))),
+                'mape': float(np.mean(np.abs((predictions - actuals) / (actuals + 1e-10))) * 100)
+            }
+        except Exception as e:
+            model = None
+            result.error = str(e)
+        
+        result.seconds = time.perf_counter() - started
+        emit(result)
+
+
+class BacktestEngine:
+    """
+    Rolling-origin backtesting with folds run in parallel worker processes
+    
+    Folds are split into contiguous chains, one per worker. With an
+    expanding window and a model class that implements `update(new_data)`,
+    each chain fits its first fold once and warm-starts the rest. Results
+    are yielded per fold as soon as they finish.
+    """
+    
+    def __init__(
+        self,
+        model_class: type,
+        model_kwargs: Optional[Dict[str, Any]] = None,
+        window: str = 'expanding',
+        max_workers: Optional[int] = None,
+        warm_start: bool = True
+    ):
+        if window not in ('expanding', 'sliding'):
+            raise ValueError(f"Unknown window type: {window}")
+        
+        self.model_class = model_class
+        self.model_kwargs = model_kwargs or {}
+        self.window = window
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Updates only add points, so they cannot reproduce a sliding window
+        self.warm_start = warm_start and window == 'expanding' and hasattr(model_class, 'update')
+    
+    def folds(
+        self,
+        n_points: int,
+        window_size: int,
+        horizon: int,
+        n_splits: int,
+        step: Optional[int] = None
+    ) -> List[Tuple[int, int, int, int]]:
+        """(fold, train_start, train_end, test_end) for every fold that fits in the data"""
+        step = step or horizon
+        folds = []
+        for i in range(n_splits):
+            train_end = window_size + i * step
+            test_end = train_end + horizon
+            if test_end > n_points:
+                break
+            train_start = train_end - window_size if self.window == 'sliding' else 0
+            folds.append((i, train_start, train_end, test_end))
+        return folds
+    
+    def iter_folds(
+        self,
+        data: np.ndarray,
+        window_size: int,
+        horizon: int,
+        n_splits: int = 5,
+        step: Optional[int] = None
+    ) -> Iterator[FoldResult]:
+        """Run the backtest, yielding fold results in completion order"""
+        data = np.asarray(data, dtype=np.float64)
+        folds = self.folds(len(data), window_size, horizon, n_splits, step)
+        if not folds:
+            return
+        
+        n_chains = min(self.max_workers, len(folds))
+        chains = [list(chain) for chain in np.array_split(np.array(folds), n_chains)]
+        chains = [[tuple(int(v) for v in fold) for fold in chain] for chain in chains]
+        
+        if n_chains == 1:
+            results: List[FoldResult] = []
+            _run_fold_chain(self.model_class, self.model_kwargs, data, chains[0], self.warm_start, results.append)
+            yield from results
+            return
+        
+        # Spawn: TensorFlow and BLAS thread pools are not fork-safe
+        ctx = multiprocessing.get_context('spawn')
+        fold_queue = ctx.Queue()
+        reported = set()
+        
+        with ProcessPoolExecutor(
+            max_workers=n_chains,
+            mp_context=ctx,
+            initializer=_init_backtest_worker,
+            initargs=(fold_queue,)
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _run_fold_chain_in_worker,
+                    self.model_class, self.model_kwargs, data, chain, self.warm_start
+                ): chain
+                for chain in chains
+            }
+            
+            while len(reported) < len(folds):
+                try:
+                    result = fold_queue.get(timeout=0.1)
+                except queue.Empty:
+                    # A crashed worker never reports the rest of its chain
+                    for future, chain in futures.items():
+                        if future.done() and future.exception() is not None:
+                            for fold in chain:
+                                if fold[0] not in reported:
+                                    reported.add(fold[0])
+                                    yield FoldResult(*fold, error=f"Worker failed: {future.exception()}")
+                    continue
+                reported.add(result.fold)
+                yield result
+    
+    def run(
+        self,
+        data: np.ndarray,
+        window_size: int,
+        horizon: int,
+        n_splits: int = 5,
+        step: Optional[int] = None,
+        on_fold: Optional[Callable[[FoldResult], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the backtest and pool the metrics over all test points
+        
+        Args:
+            data: Full time series
+            window_size: Training points of the first fold (of every fold for sliding windows)
+            horizon: Forecast horizon per fold
+            n_splits: Maximum number of folds
+            step: Points the forecast origin moves between folds (default horizon)
+            on_fold: Called with each fold result as soon as it finishes
+        
+        Returns:
+            Backtest results with pooled and per-fold metrics
+        """
+        data = np.asarray(data, dtype=np.float64)
+        summary = BacktestSummary()
+        
+        for result in self.iter_folds(data, window_size, horizon, n_splits, step):
+            summary.add(result, data[result.train_end:result.test_end])
+            if on_fold is not None:
+                on_fold(result)
+        
+        folds = sorted(summary.folds, key=lambda r: r.fold)
+        errors = [f"Split {r.fold}: {r.error}" for r in folds if r.error is not None]
+        if not summary.n_points:
+            return {
+                'passed': False,
+                'errors': errors + ["No successful predictions"]
+            }
+        
+        return {
+            'passed': len(errors) == 0,
+            'n_splits': len(folds),
+            'successful_splits': len(folds) - len(errors),
+            'warm_started_splits': sum(r.warm_started for r in folds),
+            'window': self.window,
+            'metrics': summary.metrics(),
+            'folds': [
+                {
+                    'fold': r.fold,
+                    'train_start': r.train_start,
+                    'train_end': r.train_end,
+                    'metrics': r.metrics,
+                    'warm_started': r.warm_started,
+                    'seconds': r.seconds
+                }
+                for r in folds if r.error is None
+            ],
+            'errors': errors
+        }
+
+
 class BacktestFramework:
     """Backtesting framework for time series models"""
     
@@ -97,7 +385,8 @@ class BacktestFramework:
         data: np.ndarray,
         window_size: int,
         horizon: int,
-        n_splits: int = 5
+        n_splits: int = 5,
+        max_workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Perform rolling window backtesting
@@ -108,6 +397,7 @@ class BacktestFramework:
             window_size: Size of training window
             horizon: Forecast horizon
             n_splits: Number of test splits
+            max_workers: Worker processes (1 runs the folds in-process)
         
         Returns:
             Backtest results with metrics
@@ -115,66 +405,8 @@ class BacktestFramework:
         if len(data) < window_size + horizon * n_splits:
             raise ValueError("Insufficient data for backtesting")
         
-        predictions = []
-        actuals = []
-        errors = []
-        
-        for i in range(n_splits):
-            start_idx = i * horizon
-            train_end = start_idx + window_size
-            test_end = train_end + horizon
-            
-            if test_end > len(data):
-                break
-            
-            # Split data
-            train_data = data[start_idx:train_end]
-            test_data = data[train_end:test_end]
-            
-            try:
-                # Train model
-                model = model_class(model_id=f"backtest_{i}")
-                result = model.train(train_data)
-                
-                if not result.success:
-                    errors.append(f"Split {i}: Training failed - {result.error}")
-                    continue
-                
-                # Forecast
-                forecast = model.forecast(train_data, horizon=len(test_data))
-                pred_values = forecast.get('forecast', []) if isinstance(forecast, dict) else forecast
-                
-                predictions.extend(pred_values)
-                actuals.extend(test_data.tolist())
-                
-            except Exception as e:
-                errors.append(f"Split {i}: {str(e)}")
-        
-        # Calculate overall metrics
-        if predictions and actuals:
-            predictions = np.array(predictions)
-            actuals = np.array(actuals)
-            
-            mae = float(np.mean(np.abs(predictions - actuals)))
-            rmse = float(np.sqrt(np.mean((predictions - actuals) ** 2)))
-            mape = float(np.mean(np.abs((predictions - actuals) / (actuals + 1e-10))) * 100)
-            
-            return {
-                'passed': len(errors) == 0,
-                'n_splits': n_splits,
-                'successful_splits': n_splits - len(errors),
-                'metrics': {
-                    'mae': mae,
-                    'rmse': rmse,
-                    'mape': mape
-                },
-                'errors': errors
-            }
-        else:
-            return {
-                'passed': False,
-                'errors': errors + ["No successful predictions"]
-            }
+        engine = BacktestEngine(model_class, window='sliding', max_workers=max_workers)
+        return engine.run(data, window_size, horizon, n_splits)
 
 
 class AnomalyDetectionEvaluator:
@@ -0,0 +1,159 @@
+"""
+tf.data input pipeline for Keras model training
+Streams batches of samples or windows gathered from the scaled series
+"""
+
+import numpy as np
+from typing import Any, List, Optional, Tuple
+from dataclasses import dataclass
+
+
+@dataclass
+class PipelineConfig:
+    """
+    Training input pipeline settings
+    
+    cache: None disables caching, '' caches batches in memory and any other
+    string is a cache file path. With a cache, batch composition is fixed
+    after the first epoch and only batch order is reshuffled.
+    """
+    batch_size: int = 32
+    validation_split: float = 0.0
+    early_stopping_patience: Optional[int] = None
+    shuffle: bool = True
+    cache: Optional[str] = None
+    seed: Optional[int] = None
+    
+    def hyperparameters(self) -> dict:
+        return {
+            'batch_size': self.batch_size,
+            'validation_split': self.validation_split,
+            'early_stopping_patience': self.early_stopping_patience
+        }
+
+
+def make_datasets(
+    series: np.ndarray,
+    config: PipelineConfig,
+    input_length: Optional[int] = None,
+    target_length: int = 0,
+    autoencoder: bool = False
+) -> Tuple[Any, Optional[Any]]:
+    """
+    Build training and validation datasets over a scaled series
+    
+    The series is held once as a tensor. The datasets iterate over sample
+    indices and a parallel map gathers each batch of samples from it, so
+    only batch-sized tensors are ever materialized.
+    
+    Args:
+        series: Array of shape (T, *features)
+        config: Pipeline settings
+        input_length: Window length; None makes each row one sample
+        target_length: Steps following each window used as the target,
+            flattened to (batch, target_length * features)
+        autoencoder: Use the input as its own target
+    
+    Returns:
+        (train, validation); validation is the last `validation_split` of
+        the samples in time order, or None
+    """
+    import tensorflow as tf
+    
+    if input_length is None and target_length:
+        raise ValueError("target_length needs windowed samples (input_length)")
+    
+    series = np.asarray(series, dtype=np.float32)
+    span = (input_length or 1) + target_length
+    n_samples = len(series) - span + 1
+    n_val = int(n_samples * config.validation_split)
+    n_train = n_samples - n_val
+    if n_train <= 0:
+        raise ValueError(f"Not enough data for a training batch: {len(series)} rows")
+    
+    values = tf.constant(series)
+    offsets = tf.range(span, dtype=tf.int64)
+    
+    def gather(index):
+        if input_length is None:
+            x = tf.gather(values, index)
+        else:
+            windows = tf.gather(values, index[:, None] + offsets[None, :])
+            x = windows[:, :input_length]
+        if autoencoder:
+            return x, x
+        if not target_length:
+            return x
+        y = windows[:, input_length:]
+        return x, tf.reshape(y, [tf.shape(y)[0], -1])
+    
+    def build(start: int, stop: int, training: bool):
+        dataset = tf.data.Dataset.range(start, stop)
+        shuffle = training and config.shuffle
+        if shuffle and config.cache is None:
+            dataset = dataset.shuffle(stop - start, seed=config.seed, reshuffle_each_iteration=True)
+        dataset = dataset.batch(config.batch_size).map(
+            gather, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle
+        )
+        if config.cache is not None:
+            dataset = dataset.cache(config.cache)
+            if shuffle:
+                n_batches = -(-(stop - start) // config.batch_size)
+                dataset = dataset.shuffle(n_batches, seed=config.seed, reshuffle_each_iteration=True)
+        return dataset.prefetch(tf.data.AUTOTUNE)
+    
+    train = build(0, n_train, training=True)
+    validation = build(n_train, n_samples, training=False) if n_val else None
+    return train, validation
+
+
+def training_callbacks(config: PipelineConfig, has_validation: bool) -> List[Any]:
+    """Early stopping on validation loss, if configured and a validation split exists"""
+    if not has_validation or config.early_stopping_patience is None:
+        return []
+    
+    from tensorflow import keras
+    return [
+        keras.callbacks.EarlyStopping(
+            monitor='val_loss',
+            patience=config.early_stopping_patience,
+            restore_best_weights=True
+        )
+    ]
+
+
+def fit_on_series(
+    model: Any,
+    series: np.ndarray,
+    epochs: int,
+    config: PipelineConfig,
+    input_length: Optional[int] = None,
+    target_length: int = 0,
+    autoencoder: bool = False
+) -> Any:
+    """
+    Fit a compiled Keras model through the input pipeline
+    
+    Returns:
+        The Keras History
+    """
+    train, validation = make_datasets(
+        series, config, input_length=input_length,
+        target_length=target_length, autoencoder=autoencoder
+    )
+    return model.fit(
+        train,
+        validation_data=validation,
+        epochs=epochs,
+        callbacks=training_callbacks(config, validation is not None),
+        verbose=0
+    )
+
+
+def history_metrics(history: Any) -> dict:
+    """Epochs run and final losses from a Keras History"""
+    losses = history.history
+    metrics = {'epochs_trained': len(losses.get('loss', []))}
+    if losses.get('val_loss'):
+        metrics['best_val_loss'] = float(min(losses['val_loss']))
+    return metrics
@@ -0,0 +1,103 @@
+"""
+Sliding-window utilities for sequence models
+Zero-copy window views that are materialized one batch at a time
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Callable, Iterator, Optional, Tuple
+
+
+# Windows materialized per model call when scoring a whole series
+PREDICT_BATCH_SIZE = 4096
+
+
+def sliding_windows(
+    data: np.ndarray,
+    input_length: int,
+    target_length: int = 0
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    All windows of `input_length` steps, each followed by `target_length` target steps
+    
+    Both results are read-only strided views into `data`: window i is
+    data[i:i + input_length] and its target the next `target_length` rows.
+    Nothing is copied; use iter_batches() or predict_in_batches() to
+    materialize batches for a model.
+    
+    Args:
+        data: Series of shape (T,) or (T, *features)
+        input_length: Steps per input window
+        target_length: Steps per target (0 for no targets)
+    
+    Returns:
+        (inputs, targets) with shapes (n, input_length, *features) and
+        (n, target_length, *features), n = T - input_length - target_length + 1;
+        targets is None when target_length is 0
+    """
+    data = np.asarray(data)
+    total = input_length + target_length
+    n = len(data) - total + 1
+    
+    if n <= 0:
+        windows = np.empty((0, total) + data.shape[1:], dtype=data.dtype)
+    else:
+        # sliding_window_view puts the window axis last; move it after the window index
+        windows = np.moveaxis(sliding_window_view(data, total, axis=0), -1, 1)
+    
+    inputs = windows[:, :input_length]
+    targets = windows[:, input_length:] if target_length else None
+    return inputs, targets
+
+
+def iter_batches(
+    *arrays: np.ndarray,
+    batch_size: int = 32,
+    shuffle: bool = False,
+    seed: Optional[int] = None
+) -> Iterator[Tuple[np.ndarray, ...]]:
+    """
+    Yield aligned batches of one or more window arrays as contiguous copies
+    
+    Only one batch per array is materialized at a time, so peak memory is
+    O(batch_size x window) regardless of the number of windows.
+    """
+    n = len(arrays[0])
+    order = np.random.default_rng(seed).permutation(n) if shuffle else None
+    
+    for start in range(0, n, batch_size):
+        if order is None:
+            index = slice(start, start + batch_size)
+            yield tuple(np.ascontiguousarray(a[index]) for a in arrays)
+        else:
+            index = order[start:start + batch_size]
+            yield tuple(a[index] for a in arrays)
+
+
+def predict_in_batches(
+    predict: Callable[[np.ndarray], np.ndarray],
+    windows: np.ndarray,
+    batch_size: int = PREDICT_BATCH_SIZE,
+    reduce: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Run a model over window views one materialized batch at a time
+    
+    Args:
+        predict: Model call on a contiguous (batch, ...) array
+        windows: Window views (e.g. from sliding_windows)
+        batch_size: Windows materialized per call
+        reduce: Optional reduce(batch, output) applied per batch (e.g. a
+            per-window error) so full-size outputs are never held either
+    
+    Returns:
+        Concatenated per-batch results
+    """
+    results = []
+    for (batch,) in iter_batches(windows, batch_size=batch_size):
+        output = predict(batch)
+        results.append(reduce(batch, output) if reduce is not None else output)
+    
+    if not results:
+        return np.empty(0)
+    return np.concatenate(results)
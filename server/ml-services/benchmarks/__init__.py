@@ -0,0 +1 @@
+# ML Services benchmarks
@@ -0,0 +1,117 @@
+"""
+Synthetic benchmark datasets
+Event logs and metric series shaped like sample_event_log.csv and
+sample_performance_metrics.csv, generated vectorized at any scale
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterator
+
+
+EVENT_LOG_COLUMNS = ['case_id', 'activity', 'timestamp', 'resource', 'cost', 'department', 'priority']
+METRICS_COLUMNS = [
+    'date', 'process_name', 'cycle_time_hours', 'throughput', 'conformance_rate',
+    'cost', 'resource_utilization', 'bottleneck_activity', 'sla_compliance'
+]
+
+ACTIVITIES = np.array([
+    'Submit Purchase Request', 'Validate Budget', 'Manager Approval', 'Vendor Selection',
+    'Create Purchase Order', 'Send PO to Vendor', 'Confirm Order', 'Receive Goods',
+    'Goods Inspection', 'Post Goods Receipt', 'Receive Invoice', 'Match 3-Way',
+    'Approve Payment', 'Process Payment', 'Close Case'
+])
+REWORK_ACTIVITIES = np.array(['Revise Request', 'Return Goods', 'Receive Replacement', 'Vendor Delay Notification'])
+RESOURCES = np.array([
+    'John Smith', 'Sarah Johnson', 'Mike Davis', 'Jane Doe', 'Alice Brown', 'Bob Wilson',
+    'Finance System', 'ERP System', 'Procurement System', 'Quality Control', 'AP Clerk', 'CFO'
+])
+DEPARTMENTS = np.array(['Procurement', 'Finance', 'Management', 'Operations', 'Quality', 'IT'])
+PRIORITIES = np.array(['High', 'Medium', 'Low'])
+PROCESSES = np.array(['Purchase Order Process', 'Invoice Processing', 'Order Fulfillment'])
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+
+def parse_scale(scale: str) -> int:
+    """Row count of a scale name ('1k', '10m') or a plain integer"""
+    scale = str(scale).lower()
+    if scale in SCALES:
+        return SCALES[scale]
+    return int(scale)
+
+
+def synthetic_event_log(n_events: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Purchase-to-pay style event log with exactly `n_events` rows
+    
+    Cases of 3-15 events walk the activity sequence in order with about 5%
+    rework steps mixed in; timestamps increase within each case.
+    """
+    rng = np.random.default_rng(seed)
+    
+    # Enough cases to cover n_events, then trim the last one
+    lengths = rng.integers(3, len(ACTIVITIES) + 1, size=n_events // 3 + 1)
+    lengths = lengths[:np.searchsorted(np.cumsum(lengths), n_events) + 1]
+    case = np.repeat(np.arange(len(lengths)), lengths)[:n_events]
+    case_start = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    position = np.arange(n_events) - case_start[case]
+    
+    activity = ACTIVITIES[position % len(ACTIVITIES)]
+    rework = rng.random(n_events) < 0.05
+    activity[rework] = REWORK_ACTIVITIES[rng.integers(0, len(REWORK_ACTIVITIES), rework.sum())]
+    
+    # Cases start across a year; steps are 5 minutes to a few days apart
+    start = np.datetime64('2024-01-01T08:00') + rng.integers(0, 365 * 24 * 60, size=len(lengths)).astype('timedelta64[m]')
+    gaps = rng.exponential(240, size=n_events).astype(np.int64) + 5
+    gaps[position == 0] = 0
+    offsets = np.cumsum(gaps)
+    offsets -= offsets[case_start[case]]
+    timestamp = start[case] + offsets.astype('timedelta64[m]')
+    
+    case_priority = PRIORITIES[rng.integers(0, len(PRIORITIES), size=len(lengths))]
+    
+    return pd.DataFrame({
+        'case_id': np.char.add('CASE', np.char.zfill(case.astype(str), 7)),
+        'activity': activity,
+        'timestamp': pd.to_datetime(timestamp),
+        'resource': RESOURCES[rng.integers(0, len(RESOURCES), size=n_events)],
+        'cost': np.round(rng.lognormal(3.8, 0.6, size=n_events)).astype(np.int64),
+        'department': DEPARTMENTS[rng.integers(0, len(DEPARTMENTS), size=n_events)],
+        'priority': case_priority[case]
+    }, columns=EVENT_LOG_COLUMNS)
+
+
+def synthetic_metrics(n_points: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Process performance metrics with trend, weekly seasonality and noise
+    
+    Rows are hourly so that 10M points still fit pandas' timestamp range.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_points)
+    weekly = np.sin(2 * np.pi * t / (24 * 7))
+    daily = np.sin(2 * np.pi * t / 24)
+    
+    cycle_time = 150 + 0.0005 * t + 8 * weekly + 3 * daily + rng.normal(0, 5, n_points)
+    throughput = np.maximum(0, np.round(13 - 2 * weekly + rng.normal(0, 1.5, n_points)))
+    conformance = np.clip(0.92 + 0.02 * weekly + rng.normal(0, 0.015, n_points), 0, 1)
+    utilization = np.clip(0.8 + 0.05 * weekly + rng.normal(0, 0.03, n_points), 0, 1)
+    
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=n_points, freq='h'),
+        'process_name': PROCESSES[t % len(PROCESSES)],
+        'cycle_time_hours': np.round(cycle_time, 1),
+        'throughput': throughput.astype(np.int64),
+        'conformance_rate': np.round(conformance, 2),
+        'cost': np.round(throughput * 650 + rng.normal(0, 300, n_points)),
+        'resource_utilization': np.round(utilization, 2),
+        'bottleneck_activity': ACTIVITIES[rng.integers(0, len(ACTIVITIES), size=n_points)],
+        'sla_compliance': np.round(np.clip(conformance - 0.01 + rng.normal(0, 0.01, n_points), 0, 1), 2)
+    }, columns=METRICS_COLUMNS)
+
+
+def iter_records(log: pd.DataFrame, chunk_size: int = 100_000) -> Iterator[list]:
+    """Event log as lists of record dicts, one chunk at a time"""
+    for start in range(0, len(log), chunk_size):
+        yield log.iloc[start:start + chunk_size].to_dict('records')
@@ -0,0 +1,312 @@
+"""
+Benchmark harness for ML Services models
+Times train, predict, save and load per model and scale, with peak RSS
+and traced allocations, each case in a fresh process
+"""
+
+import importlib.util
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+for _path in (ROOT, ROOT / "anomaly-detection", ROOT / "forecasting"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from benchmarks.datasets import iter_records, parse_scale, synthetic_event_log, synthetic_metrics
+
+
+PHASES = ('train', 'predict', 'save', 'load')
+FORECAST_HORIZON = 30
+
+
+@dataclass
+class ModelSpec:
+    """
+    One benchmarked model
+    
+    kind: 'detector' (trained on an event feature matrix), 'forecaster'
+    (trained on the cycle-time series) or 'features' (the event-log
+    FeatureExtractor itself). Scales above max_rows, and models whose
+    `requires` packages are not installed, are skipped.
+    """
+    name: str
+    kind: str
+    module: str
+    cls: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    max_rows: Optional[int] = None
+    requires: Tuple[str, ...] = ()
+
+
+MODELS: Dict[str, ModelSpec] = {spec.name: spec for spec in [
+    ModelSpec('feature_extractor', 'features', 'base.preprocessing', 'FeatureExtractor'),
+    ModelSpec('isolation_forest', 'detector', 'isolation_forest_prod', 'IsolationForestAnomalyDetector'),
+    ModelSpec('dbscan', 'detector', 'dbscan_prod', 'DBSCANAnomalyDetector', max_rows=100_000),
+    ModelSpec('oneclass_svm', 'detector', 'oneclass_svm_prod', 'OneClassSVMAnomalyDetector', max_rows=100_000),
+    ModelSpec('lstm_autoencoder', 'detector', 'lstm_autoencoder_prod', 'LSTMAutoencoderDetector',
+              {'epochs': 2}, max_rows=1_000_000, requires=('tensorflow',)),
+    ModelSpec('vae', 'detector', 'vae_prod', 'VAEAnomalyDetector', {'epochs': 2},
+              max_rows=1_000_000, requires=('tensorflow',)),
+    ModelSpec('arima', 'forecaster', 'arima_prod', 'ARIMAForecaster', max_rows=100_000, requires=('pmdarima',)),
+    ModelSpec('prophet', 'forecaster', 'prophet_prod', 'ProphetForecaster', max_rows=100_000, requires=('prophet',)),
+    ModelSpec('xgboost', 'forecaster', 'xgboost_prod', 'XGBoostForecaster', requires=('xgboost',)),
+    ModelSpec('lstm', 'forecaster', 'lstm_prod', 'LSTMForecaster', {'epochs': 2},
+              max_rows=1_000_000, requires=('tensorflow',)),
+    ModelSpec('gru', 'forecaster', 'gru_prod', 'GRUForecaster', {'epochs': 2},
+              max_rows=1_000_000, requires=('tensorflow',)),
+    ModelSpec('hybrid_arima_lstm', 'forecaster', 'hybrid_arima_lstm_prod', 'HybridARIMALSTMForecaster',
+              max_rows=100_000, requires=('pmdarima', 'tensorflow')),
+]}
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's resident set size"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def environment() -> Dict[str, Any]:
+    """Machine and code version the results were measured on"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': multiprocessing.cpu_count(),
+        'commit': commit
+    }
+
+
+def _import_model(spec: ModelSpec) -> type:
+    module = __import__(spec.module, fromlist=[spec.cls])
+    return getattr(module, spec.cls)
+
+
+def _prepare(spec: ModelSpec, n_rows: int, seed: int) -> Tuple[Any, Any]:
+    """Training and scoring inputs for a model at a scale"""
+    if spec.kind == 'forecaster':
+        series = synthetic_metrics(n_rows, seed)['cycle_time_hours'].to_numpy()
+        return series, series
+    
+    log = synthetic_event_log(n_rows, seed)
+    if spec.kind == 'features':
+        return log, log
+    
+    # Detectors score the same event features they were trained on
+    from base.preprocessing import FeatureExtractor
+    extractor = FeatureExtractor()
+    for records in iter_records(log):
+        extractor.partial_fit(records)
+    X = np.concatenate([extractor.transform(records) for records in iter_records(log)])
+    return X, X
+
+
+def _phase_functions(spec: ModelSpec, train_data: Any, score_data: Any, workdir: Path) -> Dict[str, Callable[[], Any]]:
+    """Zero-argument callables for each phase; later phases use state from earlier ones"""
+    model_class = _import_model(spec)
+    state: Dict[str, Any] = {}
+    
+    if spec.kind == 'features':
+        from base.ml_model_base import ArtifactStore
+        path = workdir / 'feature_extractor.joblib'
+        
+        def train():
+            state['model'] = model_class(**spec.kwargs)
+            for records in iter_records(train_data):
+                state['model'].partial_fit(records)
+        
+        def predict():
+            for records in iter_records(score_data):
+                state['model'].transform(records)
+        
+        def save():
+            ArtifactStore.save(state['model'], path, 'joblib')
+        
+        def load():
+            ArtifactStore.load(path, 'joblib')
+    else:
+        path = workdir / spec.name
+        
+        def train():
+            state['model'] = model_class(model_id=f"bench_{spec.name}", **spec.kwargs)
+            result = state['model'].train(train_data)
+            if not result.success:
+                raise RuntimeError(f"Training failed: {result.error}")
+        
+        if spec.kind == 'forecaster':
+            def predict():
+                state['model'].predict(score_data, horizon=FORECAST_HORIZON)
+        else:
+            def predict():
+                state['model'].predict(score_data)
+        
+        def save():
+            state['model'].save(str(path))
+        
+        def load():
+            model_class(model_id=f"bench_{spec.name}", **spec.kwargs).load(str(path))
+    
+    return {'train': train, 'predict': predict, 'save': save, 'load': load}
+
+
+def measure_case(name: str, scale: str, seed: int = 0, trace_allocations: bool = True) -> Dict[str, Any]:
+    """
+    Run every phase of one model at one scale in this process
+    
+    Phase timings are wall-clock. `peak_rss_mb` is the process high-water
+    mark after the phase, so run each case in a fresh process (run_case)
+    for comparable numbers. With trace_allocations, tracemalloc's peak of
+    traced Python and NumPy allocations is recorded per phase; tracing
+    slows Python-heavy code, so only compare runs with the same setting.
+    """
+    spec = MODELS[name]
+    n_rows = parse_scale(scale)
+    result: Dict[str, Any] = {'model': name, 'kind': spec.kind, 'scale': scale, 'rows': n_rows}
+    
+    if spec.max_rows is not None and n_rows > spec.max_rows:
+        result.update(status='skipped', reason=f"above max_rows ({spec.max_rows})")
+        return result
+    missing = [package for package in spec.requires if importlib.util.find_spec(package) is None]
+    if missing:
+        result.update(status='skipped', reason=f"missing dependency: {', '.join(missing)}")
+        return result
+    
+    try:
+        started = time.perf_counter()
+        train_data, score_data = _prepare(spec, n_rows, seed)
+        result['prepare_seconds'] = time.perf_counter() - started
+        result['data_rss_mb'] = peak_rss_mb()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            phases = _phase_functions(spec, train_data, score_data, Path(tmpdir))
+            result['phases'] = {}
+            for phase in PHASES:
+                if trace_allocations:
+                    tracemalloc.start()
+                started = time.perf_counter()
+                try:
+                    phases[phase]()
+                    seconds = time.perf_counter() - started
+                finally:
+                    if trace_allocations:
+                        _, peak = tracemalloc.get_traced_memory()
+                        tracemalloc.stop()
+                
+                measured = {'seconds': seconds, 'peak_rss_mb': peak_rss_mb()}
+                if trace_allocations:
+                    measured['peak_alloc_mb'] = peak / (1024 * 1024)
+                if phase in ('train', 'predict'):
+                    measured['rows_per_second'] = n_rows / seconds if seconds > 0 else None
+                result['phases'][phase] = measured
+        
+        result['status'] = 'ok'
+    except Exception as e:
+        result.update(status='error', reason=f"{type(e).__name__}: {e}")
+    
+    return result
+
+
+def _case_worker(conn, name: str, scale: str, seed: int, trace_allocations: bool) -> None:
+    conn.send(measure_case(name, scale, seed, trace_allocations))
+    conn.close()
+
+
+def run_case(
+    name: str,
+    scale: str,
+    seed: int = 0,
+    trace_allocations: bool = True,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """Measure one case in a freshly spawned process so peak RSS is its own"""
+    ctx = multiprocessing.get_context('spawn')
+    receiver, sender = ctx.Pipe(duplex=False)
+    # Not a daemon: daemonic processes cannot start the joblib workers sklearn uses
+    process = ctx.Process(target=_case_worker, args=(sender, name, scale, seed, trace_allocations))
+    process.start()
+    sender.close()
+    
+    try:
+        if receiver.poll(timeout):
+            return receiver.recv()
+        reason = f"timed out after {timeout}s"
+    except EOFError:
+        process.join()
+        reason = f"worker exited with code {process.exitcode}"
+    finally:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        receiver.close()
+    
+    return {'model': name, 'kind': MODELS[name].kind, 'scale': scale, 'rows': parse_scale(scale),
+            'status': 'error', 'reason': reason}
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float = 0.25,
+    min_seconds: float = 0.05
+) -> List[Dict[str, Any]]:
+    """
+    Phases that got slower or grew in memory against a baseline run
+    
+    A phase regresses when a metric exceeds the baseline by more than
+    `tolerance` (relative). Timing changes below `min_seconds` are ignored
+    as noise. Cases that errored now but passed in the baseline are
+    reported too.
+    """
+    previous = {(r['model'], r['scale']): r for r in baseline}
+    regressions = []
+    
+    for result in results:
+        before = previous.get((result['model'], result['scale']))
+        if before is None or before.get('status') != 'ok':
+            continue
+        if result.get('status') != 'ok':
+            regressions.append({
+                'model': result['model'], 'scale': result['scale'], 'phase': None,
+                'metric': 'status', 'baseline': 'ok', 'current': result.get('status')
+            })
+            continue
+        
+        for phase, now in result['phases'].items():
+            then = before['phases'].get(phase)
+            if then is None:
+                continue
+            for metric in ('seconds', 'peak_rss_mb', 'peak_alloc_mb'):
+                if metric not in now or metric not in then:
+                    continue
+                limit = then[metric] * (1 + tolerance)
+                if metric == 'seconds':
+                    limit = max(limit, then[metric] + min_seconds)
+                if now[metric] > limit:
+                    regressions.append({
+                        'model': result['model'], 'scale': result['scale'], 'phase': phase,
+                        'metric': metric, 'baseline': then[metric], 'current': now[metric],
+                        'change': now[metric] / then[metric] - 1 if then[metric] else None
+                    })
+    
+    return regressions
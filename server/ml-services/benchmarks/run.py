@@ -0,0 +1,93 @@
+"""
+Run the ML Services benchmark suite
+
+    python -m benchmarks.run --scales 1k,100k --output results.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.run --models isolation_forest,xgboost --update-baseline
+
+Exits with status 1 when a phase regressed against the baseline.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.harness import MODELS, compare, environment, run_case
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--models', default='all', help="Comma-separated model names or 'all'")
+    parser.add_argument('--scales', default='1k,100k', help="Comma-separated scales: 1k, 100k, 1m, 10m or row counts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=None, help="Seconds allowed per case")
+    parser.add_argument('--no-trace', action='store_true', help="Skip tracemalloc allocation tracking")
+    parser.add_argument('--output', type=Path, help="Write results JSON here")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative slowdown or growth")
+    args = parser.parse_args(argv)
+    
+    names = list(MODELS) if args.models == 'all' else args.models.split(',')
+    unknown = [name for name in names if name not in MODELS]
+    if unknown:
+        parser.error(f"Unknown models: {', '.join(unknown)} (available: {', '.join(MODELS)})")
+    
+    results = []
+    for scale in args.scales.split(','):
+        for name in names:
+            result = run_case(name, scale, seed=args.seed, trace_allocations=not args.no_trace, timeout=args.timeout)
+            results.append(result)
+            _print_result(result)
+    
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'seed': args.seed,
+        'trace_allocations': not args.no_trace,
+        'environment': environment(),
+        'results': results
+    }
+    
+    exit_code = 0
+    if args.baseline.exists() and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('trace_allocations') != report['trace_allocations']:
+            print("warning: baseline was recorded with a different allocation tracing setting", file=sys.stderr)
+        report['regressions'] = compare(results, baseline['results'], tolerance=args.tolerance)
+        for regression in report['regressions']:
+            print(f"REGRESSION {regression['model']} @ {regression['scale']} {regression['phase'] or ''} "
+                  f"{regression['metric']}: {regression['baseline']} -> {regression['current']}")
+        exit_code = 1 if report['regressions'] else 0
+    
+    if args.output:
+        _write(args.output, report)
+    if args.update_baseline:
+        _write(args.baseline, report)
+    
+    return exit_code
+
+
+def _print_result(result) -> None:
+    label = f"{result['model']:<20} {result['scale']:>6}"
+    if result['status'] != 'ok':
+        print(f"{label}  {result['status']}: {result['reason']}")
+        return
+    phases = "  ".join(f"{phase} {m['seconds']:.3f}s" for phase, m in result['phases'].items())
+    peak = max(m['peak_rss_mb'] for m in result['phases'].values())
+    print(f"{label}  {phases}  peak RSS {peak:.0f} MB")
+
+
+def _write(path: Path, report) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,137 +3,258 @@ Monte Carlo Simulation for Digital Twin
 Probabilistic simulation with risk quantification and confidence intervals
 """
 
+import multiprocessing
+import os
 import numpy as np
-from typing import List, Dict, Any, Callable
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Callable, Optional
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Runs per vectorized chunk; fixed so results do not depend on worker count
+DEFAULT_CHUNK_SIZE = 250_000
+
+# Below this many runs a vectorized simulation stays in-process
+PARALLEL_MIN_RUNS = 2_000_000
+
+PERCENTILE_LEVELS = (2.5, 5, 25, 50, 75, 95, 97.5)
+
+
+def sample_parameter_arrays(
+    param_distributions: Dict[str, Dict[str, Any]],
+    n: int,
+    rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """
+    Sample `n` values of every parameter as float64 arrays
+    
+    Distribution configs match MonteCarloSimulator: normal (mean, std),
+    uniform (low, high), poisson (lambda) and beta (alpha, beta); unknown
+    types fall back to normal(1, 0.1).
+    """
+    sampled = {}
+    
+    for param_name, dist_config in param_distributions.items():
+        dist_type = dist_config.get('type', 'normal')
+        
+        if dist_type == 'normal':
+            values = rng.normal(dist_config.get('mean', 0), dist_config.get('std', 1), n)
+        elif dist_type == 'uniform':
+            values = rng.uniform(dist_config.get('low', 0), dist_config.get('high', 1), n)
+        elif dist_type == 'poisson':
+            values = rng.poisson(dist_config.get('lambda', 1), n)
+        elif dist_type == 'beta':
+            values = rng.beta(dist_config.get('alpha', 2), dist_config.get('beta', 2), n)
+        else:
+            values = rng.normal(1, 0.1, n)
+        
+        sampled[param_name] = values.astype(np.float64, copy=False)
+    
+    return sampled
+
+
+def _run_vectorized_chunk(
+    simulation_func: Callable,
+    param_distributions: Dict[str, Dict[str, Any]],
+    n: int,
+    seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    """Sample and simulate one chunk of runs (module-level so workers can unpickle it)"""
+    rng = np.random.default_rng(seed)
+    params = sample_parameter_arrays(param_distributions, n, rng)
+    outputs = simulation_func(rng=rng, **params)
+    return {key: np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)) for key, value in outputs.items()}
+
+
+def _run_scalar_chunk(simulation_func: Callable, sampled_runs: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+    """Run per-run simulations for a batch of sampled parameters, skipping failed runs"""
+    results = []
+    for sampled_params in sampled_runs:
+        try:
+            results.append(simulation_func(**sampled_params))
+        except Exception:
+            pass  # Skip failed runs
+    return results
 
 
 class MonteCarloSimulator:
     """
     Monte Carlo simulation for process digital twin
     Runs thousands of simulations to understand outcome distributions
+    
+    In vectorized mode each parameter is sampled as one array per chunk
+    of runs from a seeded np.random.Generator, and the simulation function
+    maps those arrays to arrays of outcomes, so a million runs cost a few
+    array operations instead of a million Python calls.
     """
     
-    def __init__(self, n_runs: int = 1000):
+    def __init__(
+        self,
+        n_runs: int = 1000,
+        seed: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: Optional[int] = None
+    ):
         """
         Initialize Monte Carlo Simulator
         
         Args:
             n_runs: Number of simulation runs
+            seed: Seed for reproducible sampling (None draws fresh entropy)
+            chunk_size: Runs per vectorized chunk; each chunk has its own
+                child seed, so results are identical serially or in parallel
+            max_workers: Worker processes for parallel runs (default: all cores)
         """
         self.n_runs = n_runs
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
         self.results = None
+        self._rng = np.random.default_rng(seed)
         
     def run_simulation(
         self,
         simulation_func: Callable,
         param_distributions: Dict[str, Dict[str, Any]],
-        parallel: bool = True
+        parallel: bool = True,
+        vectorized: bool = False
     ) -> Dict[str, Any]:
         """
         Run Monte Carlo simulation
         
         Args:
-            simulation_func: Simulation function to run
+            simulation_func: Simulation function to run. Per-run functions
+                take scalar parameters as keywords and return a dict of
+                scalars. With vectorized=True it takes arrays of shape
+                (n,) plus an `rng` keyword (np.random.Generator for any
+                noise of its own) and returns a dict of arrays; runs with
+                non-finite outputs count as failed.
             param_distributions: Parameter distributions (mean, std, type)
-            parallel: Use parallel processing
+            parallel: Spread chunks of runs over worker processes; needs a
+                module-level (picklable) simulation_func
+            vectorized: Sample and simulate whole arrays of runs
             
         Returns:
             Statistical results
         """
-        results = []
+        if vectorized:
+            self.results = self._run_vectorized(simulation_func, param_distributions, parallel)
+            return self._analyze_arrays(self.results)
         
-        if parallel and self.n_runs >= 100:
-            # Parallel execution
-            with ProcessPoolExecutor() as executor:
-                futures = []
-                for _ in range(self.n_runs):
-                    sampled_params = self._sample_parameters(param_distributions)
-                    futures.append(executor.submit(simulation_func, **sampled_params))
-                
-                for future in as_completed(futures):
-                    try:
-                        results.append(future.result())
-                    except Exception as e:
-                        pass  # Skip failed runs
+        sampled_runs = [self._sample_parameters(param_distributions) for _ in range(self.n_runs)]
+        
+        if parallel and self.n_runs >= 100 and self._workers() > 1:
+            # One task per chunk of runs, not per run
+            chunks = np.array_split(np.arange(self.n_runs), self._workers() * 4)
+            with self._executor() as executor:
+                futures = [
+                    executor.submit(_run_scalar_chunk, simulation_func, [sampled_runs[i] for i in chunk])
+                    for chunk in chunks if len(chunk)
+                ]
+                results = [result for future in futures for result in future.result()]
         else:
-            # Sequential execution
-            for _ in range(self.n_runs):
-                sampled_params = self._sample_parameters(param_distributions)
-                try:
-                    result = simulation_func(**sampled_params)
-                    results.append(result)
-                except Exception as e:
-                    pass  # Skip failed runs
+            results = _run_scalar_chunk(simulation_func, sampled_runs)
         
         self.results = results
         return self._analyze_results(results)
     
-    def _sample_parameters(self, param_distributions: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
-        """Sample parameters from distributions"""
-        sampled = {}
+    def _run_vectorized(
+        self,
+        simulation_func: Callable,
+        param_distributions: Dict[str, Dict[str, Any]],
+        parallel: bool
+    ) -> Dict[str, np.ndarray]:
+        """Outcome arrays of all successful runs, chunk by chunk"""
+        sizes = [min(self.chunk_size, self.n_runs - start) for start in range(0, self.n_runs, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
         
-        for param_name, dist_config in param_distributions.items():
-            dist_type = dist_config.get('type', 'normal')
-            
-            if dist_type == 'normal':
-                mean = dist_config.get('mean', 0)
-                std = dist_config.get('std', 1)
-                sampled[param_name] = float(np.random.normal(mean, std))
-                
-            elif dist_type == 'uniform':
-                low = dist_config.get('low', 0)
-                high = dist_config.get('high', 1)
-                sampled[param_name] = float(np.random.uniform(low, high))
-                
-            elif dist_type == 'poisson':
-                lam = dist_config.get('lambda', 1)
-                sampled[param_name] = float(np.random.poisson(lam))
-                
-            elif dist_type == 'beta':
-                alpha = dist_config.get('alpha', 2)
-                beta = dist_config.get('beta', 2)
-                sampled[param_name] = float(np.random.beta(alpha, beta))
-                
-            else:
-                # Default to normal
-                sampled[param_name] = float(np.random.normal(1, 0.1))
+        if parallel and self.n_runs >= PARALLEL_MIN_RUNS and len(sizes) > 1 and self._workers() > 1:
+            with self._executor() as executor:
+                chunks = list(executor.map(
+                    _run_vectorized_chunk,
+                    [simulation_func] * len(sizes), [param_distributions] * len(sizes), sizes, seeds
+                ))
+        else:
+            chunks = [
+                _run_vectorized_chunk(simulation_func, param_distributions, size, seed)
+                for size, seed in zip(sizes, seeds)
+            ]
         
-        return sampled
+        if not chunks:
+            return {}
+        outputs = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+        if not outputs:
+            return outputs
+        finite = np.logical_and.reduce([np.isfinite(values) for values in outputs.values()])
+        return outputs if finite.all() else {key: values[finite] for key, values in outputs.items()}
+    
+    def _workers(self) -> int:
+        return self.max_workers or os.cpu_count() or 1
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        # Spawn: TensorFlow and BLAS thread pools are not fork-safe
+        return ProcessPoolExecutor(max_workers=self._workers(), mp_context=multiprocessing.get_context('spawn'))
+    
+    def _sample_parameters(self, param_distributions: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+        """Sample parameters from distributions"""
+        return {
+            name: float(values[0])
+            for name, values in sample_parameter_arrays(param_distributions, 1, self._rng).items()
+        }
     
     def _analyze_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze simulation results"""
         if not results:
             return {'error': 'No successful simulation runs'}
         
-        # Extract metrics
-        metrics = {}
+        arrays = {}
         for key in results[0].keys():
             values = [r.get(key, 0) for r in results if key in r]
             if values:
-                metrics[key] = {
-                    'mean': float(np.mean(values)),
-                    'median': float(np.median(values)),
-                    'std': float(np.std(values)),
-                    'min': float(np.min(values)),
-                    'max': float(np.max(values)),
-                    'p5': float(np.percentile(values, 5)),
-                    'p25': float(np.percentile(values, 25)),
-                    'p75': float(np.percentile(values, 75)),
-                    'p95': float(np.percentile(values, 95)),
-                    'confidence_interval_95': {
-                        'lower': float(np.percentile(values, 2.5)),
-                        'upper': float(np.percentile(values, 97.5))
-                    }
+                arrays[key] = np.asarray(values, dtype=np.float64)
+        
+        return self._summary(arrays, len(results))
+    
+    def _analyze_arrays(self, outputs: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Analyze vectorized simulation results"""
+        completed = len(next(iter(outputs.values()))) if outputs else 0
+        if not completed:
+            return {'error': 'No successful simulation runs'}
+        return self._summary(outputs, completed)
+    
+    def _summary(self, arrays: Dict[str, np.ndarray], completed: int) -> Dict[str, Any]:
+        metrics = {}
+        for key, values in arrays.items():
+            # One partition pass for all percentiles
+            p2_5, p5, p25, median, p75, p95, p97_5 = np.percentile(values, PERCENTILE_LEVELS)
+            metrics[key] = {
+                'mean': float(np.mean(values)),
+                'median': float(median),
+                'std': float(np.std(values)),
+                'min': float(np.min(values)),
+                'max': float(np.max(values)),
+                'p5': float(p5),
+                'p25': float(p25),
+                'p75': float(p75),
+                'p95': float(p95),
+                'confidence_interval_95': {
+                    'lower': float(p2_5),
+                    'upper': float(p97_5)
                 }
+            }
         
         return {
-            'runs_completed': len(results),
+            'runs_completed': completed,
             'runs_requested': self.n_runs,
-            'success_rate': len(results) / self.n_runs,
+            'success_rate': completed / self.n_runs,
             'metrics': metrics
         }
     
+    def _metric_values(self, metric_name: str) -> np.ndarray:
+        """All successful runs' values of one metric (empty if absent)"""
+        if isinstance(self.results, dict):
+            return np.asarray(self.results.get(metric_name, []), dtype=np.float64)
+        return np.asarray([r.get(metric_name, 0) for r in self.results if metric_name in r], dtype=np.float64)
+    
     def calculate_risk_metrics(self, threshold: float, metric_name: str = 'cycle_time') -> Dict[str, Any]:
         """
         Calculate risk metrics
@@ -145,32 +266,60 @@ class MonteCarloSimulator:
         Returns:
             Risk analysis
         """
-        if not self.results:
+        if self.results is None or len(self.results) == 0:
             return {'error': 'No simulation results available'}
         
-        values = [r.get(metric_name, 0) for r in self.results if metric_name in r]
+        values = self._metric_values(metric_name)
         
-        if not values:
+        if not len(values):
             return {'error': f'Metric {metric_name} not found in results'}
         
-        violations = [v for v in values if v > threshold]
+        p5, p50, p95 = np.percentile(values, [5, 50, 95])
+        tail = values[values > p95]
         
         return {
             'threshold': threshold,
-            'probability_of_violation': len(violations) / len(values),
+            'probability_of_violation': float(np.count_nonzero(values > threshold) / len(values)),
             'expected_value': float(np.mean(values)),
-            'worst_case_p95': float(np.percentile(values, 95)),
-            'best_case_p5': float(np.percentile(values, 5)),
-            'value_at_risk_95': float(np.percentile(values, 95) - np.percentile(values, 50)),
-            'expected_shortfall': float(np.mean([v for v in values if v > np.percentile(values, 95)])) if any(v > np.percentile(values, 95) for v in values) else 0
+            'worst_case_p95': float(p95),
+            'best_case_p5': float(p5),
+            'value_at_risk_95': float(p95 - p50),
+            'expected_shortfall': float(np.mean(tail)) if len(tail) else 0
         }
 
 
+def simulate_process_runs(
+    duration: np.ndarray,
+    resource_count: np.ndarray,
+    arrival_rate: np.ndarray,
+    rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized process model: outcome arrays for arrays of sampled parameters
+    
+    Runs without resources divide by zero; their non-finite outcomes mark
+    them as failed.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cycle_time = duration / resource_count + rng.exponential(10, len(duration))
+        throughput = arrival_rate * resource_count / duration
+        utilization = np.minimum(0.95, arrival_rate / (resource_count * 10))
+    
+    return {
+        'cycle_time': cycle_time,
+        'throughput': throughput,
+        'cost': resource_count * 100 + duration * 10,
+        'quality': np.clip(0.95 - (resource_count - 5) * 0.02, 0.85, 0.99),
+        'resource_utilization': utilization
+    }
+
+
 def run_monte_carlo_process_simulation(
     process_model: Dict[str, Any],
     scenario_params: Dict[str, Any],
     n_runs: int = 1000,
-    sla_threshold: float = None
+    sla_threshold: float = None,
+    seed: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Run Monte Carlo simulation for process
@@ -180,31 +329,11 @@ def run_monte_carlo_process_simulation(
         scenario_params: Scenario parameter distributions
         n_runs: Number of Monte Carlo runs
         sla_threshold: SLA threshold for risk analysis
+        seed: Seed for reproducible runs
         
     Returns:
         Comprehensive statistical analysis
     """
-    def simulate_single_run(**params):
-        """Single simulation run"""
-        # Extract parameters
-        duration = params.get('duration', 100)
-        resource_count = params.get('resource_count', 5)
-        arrival_rate = params.get('arrival_rate', 10)
-        
-        # Simple process simulation
-        cycle_time = duration / resource_count + np.random.exponential(10)
-        throughput = arrival_rate * resource_count / duration
-        cost = resource_count * 100 + duration * 10
-        quality = max(0.85, min(0.99, 0.95 - (resource_count - 5) * 0.02))
-        
-        return {
-            'cycle_time': cycle_time,
-            'throughput': throughput,
-            'cost': cost,
-            'quality': quality,
-            'resource_utilization': min(0.95, arrival_rate / (resource_count * 10))
-        }
-    
     # Define parameter distributions
     param_distributions = {
         'duration': {
@@ -223,11 +352,11 @@ def run_monte_carlo_process_simulation(
     }
     
     # Run Monte Carlo simulation
-    simulator = MonteCarloSimulator(n_runs=n_runs)
+    simulator = MonteCarloSimulator(n_runs=n_runs, seed=seed)
     results = simulator.run_simulation(
-        simulate_single_run,
+        simulate_process_runs,
         param_distributions,
-        parallel=False  # Set to True for production
+        vectorized=True
     )
     
     # Calculate risk metrics if threshold provided
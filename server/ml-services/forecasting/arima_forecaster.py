@@ -96,6 +96,18 @@ class ARIMAForecaster:
                 'error': str(e)
             }
     
+    def update(self, new_observations: np.ndarray) -> None:
+        """
+        Extend the fitted model with observations that follow the training data
+        
+        Keeps the estimated parameters and only runs the state-space filter
+        over the new points, so it is much cheaper than retraining.
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained first")
+        
+        self.model_fit = self.model_fit.append(np.asarray(new_observations), refit=False)
+    
     def forecast(self, horizon: int = 30) -> Dict[str, Any]:
         """
         Generate forecast
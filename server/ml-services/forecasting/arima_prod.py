@@ -22,6 +22,7 @@ from base.ml_model_base import (
     ArtifactStore,
     PersistenceError
 )
+from base.instrumentation import input_stats
 
 
 class ARIMAForecaster(ForecasterBase):
@@ -126,8 +127,14 @@ class ARIMAForecaster(ForecasterBase):
             
             self.metadata.performance_metrics = metrics
             
-            # Invoke after_train hook
-            self.after_train(context)
+            # Invoke after_train hook (fresh context carrying the input size)
+            self.after_train(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='train',
+                timestamp=datetime.now(),
+                data=input_stats(data)
+            ))
             
             return TrainingResult(
                 success=True,
@@ -142,6 +149,20 @@ class ARIMAForecaster(ForecasterBase):
             self.metadata.status = 'failed'
             raise TrainingError(f"Unexpected training error: {str(e)}", context={'error': str(e)})
     
+    def update(self, new_data: Any) -> None:
+        """
+        Extend the fitted model with observations that follow its training data
+        
+        pmdarima refines the existing parameters over the new points
+        instead of re-running the order search.
+        """
+        if not self.is_trained:
+            raise TrainingError("Model must be trained before update")
+        
+        new_data = np.asarray(new_data)
+        self.model.update(new_data)
+        self.metadata.training_samples += len(new_data)
+    
     def predict(self, data: Any, horizon: Optional[int] = None, **kwargs) -> PredictionResult:
         """Generate forecast with proper lifecycle"""
         if not self.is_trained:
@@ -174,8 +195,14 @@ class ARIMAForecaster(ForecasterBase):
                 'model_order': str(self.order)
             }
             
-            # Invoke after_predict hook
-            self.after_predict(context)
+            # Invoke after_predict hook (fresh context carrying the input size)
+            self.after_predict(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='predict',
+                timestamp=datetime.now(),
+                data=input_stats(data)
+            ))
             
             return PredictionResult(
                 predictions=results,
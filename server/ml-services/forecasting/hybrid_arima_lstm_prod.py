@@ -7,10 +7,14 @@ import numpy as np
 from typing import Dict, Any, Optional
 import sys
 from pathlib import Path
+from datetime import datetime
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from base.ml_model_base import ForecasterBase, TrainingResult, PredictionResult, TrainingError
+from base.ml_model_base import ForecasterBase, TrainingResult, PredictionResult, TrainingError, LifecycleContext
+from base.instrumentation import input_stats
+from base.training_pipeline import PipelineConfig, fit_on_series
+from base.autoregressive import rollout_forecast
 
 
 class HybridARIMALSTMForecaster(ForecasterBase):
@@ -20,17 +24,20 @@ class HybridARIMALSTMForecaster(ForecasterBase):
         self,
         model_id: str = "hybrid_arima_lstm_default",
         horizon: int = 30,
-        sequence_length: int = 10
+        sequence_length: int = 10,
+        pipeline: Optional[PipelineConfig] = None
     ):
         super().__init__(model_id, "hybrid_arima_lstm", horizon)
         self.sequence_length = sequence_length
+        self.pipeline = pipeline or PipelineConfig()
         self.arima_model = None
         self.lstm_model = None
         self.scaler_mean = None
         self.scaler_std = None
         
         self.metadata.hyperparameters.update({
-            'sequence_length': sequence_length
+            'sequence_length': sequence_length,
+            **self.pipeline.hyperparameters()
         })
     
     def _scale_data(self, data: np.ndarray, fit: bool = False) -> np.ndarray:
@@ -40,16 +47,15 @@ class HybridARIMALSTMForecaster(ForecasterBase):
             self.scaler_std = np.std(data)
         return (data - self.scaler_mean) / (self.scaler_std + 1e-8)
     
-    def _create_sequences(self, data: np.ndarray) -> tuple:
-        """Create sequences"""
-        X, y = [], []
-        for i in range(len(data) - self.sequence_length):
-            X.append(data[i:i + self.sequence_length])
-            y.append(data[i + self.sequence_length])
-        return np.array(X), np.array(y)
-    
     def train(self, data: Any, **kwargs) -> TrainingResult:
         """Train hybrid model"""
+        self.before_train(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='train',
+            timestamp=datetime.now()
+        ))
+        
         try:
             from pmdarima import auto_arima
             import tensorflow as tf
@@ -81,8 +87,6 @@ class HybridARIMALSTMForecaster(ForecasterBase):
         
         # Train LSTM on residuals
         scaled_residuals = self._scale_data(residuals, fit=True)
-        X, y = self._create_sequences(scaled_residuals)
-        X = X.reshape(X.shape[0], X.shape[1], 1)
         
         self.lstm_model = keras.Sequential([
             keras.layers.LSTM(32, input_shape=(self.sequence_length, 1)),
@@ -90,7 +94,10 @@ class HybridARIMALSTMForecaster(ForecasterBase):
         ])
         
         self.lstm_model.compile(optimizer='adam', loss='mse')
-        self.lstm_model.fit(X, y, epochs=30, batch_size=32, verbose=0)
+        fit_on_series(
+            self.lstm_model, scaled_residuals[:, np.newaxis], 30, self.pipeline,
+            input_length=self.sequence_length, target_length=1
+        )
         
         self.is_trained = True
         self.metadata.status = 'trained'
@@ -102,6 +109,14 @@ class HybridARIMALSTMForecaster(ForecasterBase):
         
         self.metadata.performance_metrics = metrics
         
+        self.after_train(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='train',
+            timestamp=datetime.now(),
+            data=input_stats(data)
+        ))
+        
         return TrainingResult(
             success=True,
             metrics=metrics,
@@ -113,6 +128,13 @@ class HybridARIMALSTMForecaster(ForecasterBase):
         if not self.is_trained:
             raise ValueError("Model must be trained first")
         
+        self.before_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now()
+        ))
+        
         if isinstance(data, list):
             data = np.array(data)
         
@@ -124,17 +146,10 @@ class HybridARIMALSTMForecaster(ForecasterBase):
         # LSTM forecast on residuals
         residuals = data - self.arima_model.predict_in_sample()
         scaled_residuals = self._scale_data(residuals, fit=False)
-        current_seq = scaled_residuals[-self.sequence_length:].tolist()
-        
-        lstm_forecast = []
-        for _ in range(h):
-            X = np.array([current_seq[-self.sequence_length:]])
-            X = X.reshape(1, self.sequence_length, 1)
-            pred = self.lstm_model.predict(X, verbose=0)[0, 0]
-            lstm_forecast.append(pred)
-            current_seq.append(pred)
+        seed = scaled_residuals[np.newaxis, -self.sequence_length:]
         
-        lstm_forecast = np.array(lstm_forecast) * self.scaler_std + self.scaler_mean
+        lstm_forecast = rollout_forecast(self.lstm_model, seed, h)[0]
+        lstm_forecast = lstm_forecast * self.scaler_std + self.scaler_mean
         
         # Combine forecasts
         hybrid_forecast = arima_forecast + lstm_forecast
@@ -145,6 +160,14 @@ class HybridARIMALSTMForecaster(ForecasterBase):
             'lstm_component': lstm_forecast.tolist()
         }
         
+        self.after_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now(),
+            data=input_stats(data)
+        ))
+        
         return PredictionResult(
             predictions=results,
             metadata={'model_type': 'hybrid_arima_lstm', 'horizon': h}
@@ -3,8 +3,14 @@ Hybrid Forecasting Models
 Combines multiple algorithms for superior accuracy
 """
 
+import multiprocessing
+import os
+import pickle
+import time
+from multiprocessing.connection import wait
+
 import numpy as np
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 
 class ARIMALSTMHybrid:
@@ -68,6 +74,13 @@ class ARIMALSTMHybrid:
                 'error': str(e)
             }
     
+    def update(self, new_observations: np.ndarray) -> None:
+        """Extend the ARIMA component with new points; the LSTM reads recent data at forecast time"""
+        if not self.is_trained:
+            raise ValueError("Model must be trained first")
+        
+        self.arima_model.update(new_observations)
+    
     def forecast(self, recent_data: np.ndarray, horizon: int = 30) -> Dict[str, Any]:
         """Generate hybrid forecast"""
         if not self.is_trained:
@@ -185,12 +198,129 @@ class ProphetXGBoostHybrid:
         }
 
 
+def _fit_lstm(series: np.ndarray, horizon: int) -> Any:
+    from .lstm_forecaster import LSTMForecaster
+    model = LSTMForecaster(
+        sequence_length=min(30, len(series) // 3),
+        forecast_horizon=horizon,
+        use_gru=False
+    )
+    model.train(series, epochs=50)
+    return model
+
+
+def _forecast_lstm(model: Any, history: np.ndarray, horizon: int) -> List[float]:
+    if horizon > model.forecast_horizon:
+        raise ValueError(f"LSTM was trained for {model.forecast_horizon} steps, not {horizon}")
+    return model.forecast(history)['forecast'][:horizon]
+
+
+def _fit_arima(series: np.ndarray, horizon: int) -> Any:
+    from .arima_forecaster import ARIMAForecaster
+    model = ARIMAForecaster()
+    result = model.train(series)
+    if not result.get('successful', False):
+        raise ValueError(result.get('error', 'ARIMA training failed'))
+    return model
+
+
+def _fit_prophet(series: np.ndarray, horizon: int) -> Any:
+    from .prophet_forecaster import ProphetForecaster
+    model = ProphetForecaster()
+    result = model.train(series)
+    if not result.get('successful', False):
+        raise ValueError(result.get('error', 'Prophet training failed'))
+    return model
+
+
+def _forecast_horizon_only(model: Any, history: np.ndarray, horizon: int) -> List[float]:
+    return model.forecast(horizon)['forecast']
+
+
+def _fit_xgboost(series: np.ndarray, horizon: int) -> Any:
+    from .xgboost_forecaster import XGBoostForecaster
+    model = XGBoostForecaster()
+    result = model.train(series)
+    if not result.get('successful', False):
+        raise ValueError(result.get('error', 'XGBoost training failed'))
+    return model
+
+
+def _fit_arima_lstm_hybrid(series: np.ndarray, horizon: int) -> Any:
+    model = ARIMALSTMHybrid()
+    result = model.train(series)
+    if not result.get('successful', False):
+        raise ValueError(result.get('error', 'ARIMA-LSTM training failed'))
+    return model
+
+
+def _forecast_from_history(model: Any, history: np.ndarray, horizon: int) -> List[float]:
+    return model.forecast(history, horizon)['forecast']
+
+
+# name -> (fit(series, horizon) -> model, forecast(model, history, horizon) -> values).
+# Module-level functions so they can be sent to worker processes.
+DEFAULT_CANDIDATES: Dict[str, Tuple[Callable, Callable]] = {
+    'LSTM': (_fit_lstm, _forecast_lstm),
+    'ARIMA': (_fit_arima, _forecast_horizon_only),
+    'Prophet': (_fit_prophet, _forecast_horizon_only),
+    'XGBoost': (_fit_xgboost, _forecast_from_history),
+    'ARIMA_LSTM_Hybrid': (_fit_arima_lstm_hybrid, _forecast_from_history),
+}
+
+
+def _evaluate_candidate(conn, candidate: Tuple[Callable, Callable], train_data: np.ndarray, val_data: np.ndarray) -> None:
+    """Worker: fit one candidate, score it on the validation points and send back the fitted model"""
+    fit, forecast = candidate
+    try:
+        model = fit(train_data, len(val_data))
+        predictions = np.asarray(forecast(model, train_data, len(val_data)), dtype=np.float64)
+        result = {
+            'rmse': float(np.sqrt(np.mean((predictions - val_data) ** 2))),
+            'forecast': predictions.tolist()
+        }
+        try:
+            result['fitted'] = pickle.dumps(model)
+        except Exception:
+            # Unpicklable models are refit in the parent if they win
+            result['fitted'] = None
+    except Exception as e:
+        result = {'error': str(e)}
+    
+    conn.send(result)
+    conn.close()
+
+
 class AutoForecastSelector:
     """
     Automatically selects best forecasting model
-    Compares all 10 methods and picks optimal one
+    
+    Candidates are fitted concurrently, one worker process each, under an
+    optional wall-clock budget; candidates still running or queued when the
+    budget runs out are dropped. The fitted winner is kept so the final
+    forecast only needs an incremental update with the validation points.
+    
+    `abandon_factor` trades accuracy for speed and is off by default: once
+    some candidate has a score, any candidate still running after
+    `abandon_factor` times the winner-so-far's runtime is terminated, even
+    though it might have had the lower RMSE.
     """
     
+    def __init__(
+        self,
+        candidates: Optional[Dict[str, Tuple[Callable, Callable]]] = None,
+        max_workers: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        abandon_factor: Optional[float] = None
+    ):
+        self.candidates = dict(candidates or DEFAULT_CANDIDATES)
+        self.max_workers = max_workers or min(len(self.candidates), os.cpu_count() or 1)
+        self.time_budget = time_budget
+        self.abandon_factor = abandon_factor
+        self.best_model_name: Optional[str] = None
+        self._best_fitted: Optional[bytes] = None
+        self._validation_horizon = 0
+    
     def select_best_model(
         self,
         historical_data: List[float],
@@ -206,6 +336,9 @@ class AutoForecastSelector:
         Returns:
             Best model information and forecast
         """
+        self.best_model_name = None
+        self._best_fitted = None
+        
         if len(historical_data) < 50:
             return {
                 'best_model': 'HoltWinters',
@@ -214,42 +347,25 @@ class AutoForecastSelector:
             }
         
         # Split data
-        train_data = historical_data[:-validation_horizon]
-        val_data = historical_data[-validation_horizon:]
-        
-        results = {}
+        series = np.asarray(historical_data, dtype=np.float64)
+        train_data = series[:-validation_horizon]
+        val_data = series[-validation_horizon:]
+        self._validation_horizon = validation_horizon
         
-        # Try all models
-        models_to_try = [
-            ('LSTM', self._try_lstm),
-            ('ARIMA', self._try_arima),
-            ('Prophet', self._try_prophet),
-            ('XGBoost', self._try_xgboost),
-            ('ARIMA_LSTM_Hybrid', self._try_arima_lstm_hybrid)
-        ]
-        
-        for model_name, model_func in models_to_try:
-            try:
-                forecast = model_func(train_data, validation_horizon)
-                if forecast is not None:
-                    rmse = np.sqrt(np.mean((np.array(forecast) - np.array(val_data)) ** 2))
-                    results[model_name] = {
-                        'rmse': float(rmse),
-                        'forecast': forecast
-                    }
-            except Exception as e:
-                results[model_name] = {
-                    'error': str(e)
-                }
+        started = time.monotonic()
+        results, fitted = self._run_candidates(train_data, val_data)
         
         # Select best model
         valid_results = {k: v for k, v in results.items() if 'rmse' in v}
         if valid_results:
             best_model = min(valid_results.items(), key=lambda x: x[1]['rmse'])
+            self.best_model_name = best_model[0]
+            self._best_fitted = fitted.get(best_model[0])
             return {
                 'best_model': best_model[0],
                 'rmse': best_model[1]['rmse'],
                 'all_results': results,
+                'selection_seconds': time.monotonic() - started,
                 'recommendation': f'Use {best_model[0]} for {round(best_model[1]["rmse"], 2)} RMSE'
             }
         else:
@@ -259,42 +375,138 @@ class AutoForecastSelector:
                 'results': results
             }
     
-    def _try_lstm(self, train_data: List[float], horizon: int) -> List[float]:
-        """Try LSTM forecast"""
-        from .lstm_forecaster import forecast_process_metrics
-        result = forecast_process_metrics(train_data, horizon=horizon)
-        return result.get('forecast')
-    
-    def _try_arima(self, train_data: List[float], horizon: int) -> List[float]:
-        """Try ARIMA forecast"""
-        from .arima_forecaster import forecast_with_arima
-        result = forecast_with_arima(train_data, horizon=horizon)
-        return result.get('forecast')
-    
-    def _try_prophet(self, train_data: List[float], horizon: int) -> List[float]:
-        """Try Prophet forecast"""
-        from .prophet_forecaster import forecast_with_prophet
-        result = forecast_with_prophet(train_data, horizon=horizon)
-        return result.get('forecast')
+    def forecast_best(self, historical_data: List[float], horizon: int = 30) -> Dict[str, Any]:
+        """
+        Forecast the full history with the model chosen by select_best_model
+        
+        The fitted winner is reused: models with an `update` method are
+        extended with the validation points they were not fitted on, and
+        the rest forecast directly from the full history. The winner is
+        only refit from scratch if it was not returned by its worker or
+        cannot produce this horizon.
+        """
+        name = self.best_model_name
+        if name is None:
+            return {'forecast': None, 'model_type': name}
+        
+        fit, forecast = self.candidates[name]
+        series = np.asarray(historical_data, dtype=np.float64)
+        
+        if self._best_fitted is not None:
+            model = pickle.loads(self._best_fitted)
+            self._best_fitted = None
+            try:
+                update = getattr(model, 'update', None)
+                if update is not None:
+                    update(series[-self._validation_horizon:])
+                return {
+                    'forecast': list(forecast(model, series, horizon)),
+                    'model_type': name,
+                    'refit': 'incremental' if update is not None else 'reused'
+                }
+            except ValueError:
+                pass
+        
+        model = fit(series, horizon)
+        return {
+            'forecast': list(forecast(model, series, horizon)),
+            'model_type': name,
+            'refit': 'full'
+        }
     
-    def _try_xgboost(self, train_data: List[float], horizon: int) -> List[float]:
-        """Try XGBoost forecast"""
-        from .xgboost_forecaster import forecast_with_xgboost
-        result = forecast_with_xgboost(train_data, horizon=horizon)
-        return result.get('forecast')
+    def _run_candidates(
+        self,
+        train_data: np.ndarray,
+        val_data: np.ndarray
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, bytes]]:
+        """Fit candidates in worker processes, abandoning slow ones"""
+        # Spawn: TensorFlow and BLAS thread pools are not fork-safe
+        ctx = multiprocessing.get_context('spawn')
+        queued = list(self.candidates)
+        running = {}  # connection -> (name, process, start time)
+        results: Dict[str, Dict[str, Any]] = {}
+        fitted: Dict[str, bytes] = {}
+        best_elapsed: Optional[float] = None
+        
+        start = time.monotonic()
+        deadline = start + self.time_budget if self.time_budget is not None else None
+        
+        try:
+            while queued or running:
+                while queued and len(running) < self.max_workers:
+                    name = queued.pop(0)
+                    receiver, sender = ctx.Pipe(duplex=False)
+                    process = ctx.Process(
+                        target=_evaluate_candidate,
+                        args=(sender, self.candidates[name], train_data, val_data),
+                        daemon=True
+                    )
+                    process.start()
+                    sender.close()
+                    running[receiver] = (name, process, time.monotonic())
+                
+                # Sleep until a result arrives or the next cutoff passes
+                cutoffs = [deadline] if deadline is not None else []
+                if best_elapsed is not None and self.abandon_factor is not None:
+                    cutoffs += [t0 + self.abandon_factor * best_elapsed for _, _, t0 in running.values()]
+                timeout = max(0.0, min(cutoffs) - time.monotonic()) if cutoffs else None
+                
+                for conn in wait(list(running), timeout):
+                    name, process, t0 = running.pop(conn)
+                    try:
+                        result = conn.recv()
+                    except EOFError:
+                        result = {'error': f'Worker exited with code {process.exitcode}'}
+                    conn.close()
+                    process.join()
+                    
+                    result['seconds'] = time.monotonic() - t0
+                    model_bytes = result.pop('fitted', None)
+                    if model_bytes is not None:
+                        fitted[name] = model_bytes
+                    if 'rmse' in result:
+                        best_rmse = min((r['rmse'] for r in results.values() if 'rmse' in r), default=None)
+                        if best_rmse is None or result['rmse'] < best_rmse:
+                            best_elapsed = result['seconds']
+                    results[name] = result
+                
+                now = time.monotonic()
+                out_of_time = deadline is not None and now >= deadline
+                for conn, (name, process, t0) in list(running.items()):
+                    too_slow = (
+                        best_elapsed is not None and self.abandon_factor is not None
+                        and now - t0 >= self.abandon_factor * best_elapsed
+                    )
+                    if out_of_time or too_slow:
+                        del running[conn]
+                        self._stop(conn, process)
+                        results[name] = {
+                            'error': 'Time budget exhausted' if out_of_time else 'Abandoned: slower than the current best',
+                            'abandoned': True,
+                            'seconds': now - t0
+                        }
+                if out_of_time:
+                    for name in queued:
+                        results[name] = {'error': 'Time budget exhausted', 'abandoned': True}
+                    queued = []
+        finally:
+            for conn, (_, process, _) in running.items():
+                self._stop(conn, process)
+        
+        return results, fitted
     
-    def _try_arima_lstm_hybrid(self, train_data: List[float], horizon: int) -> List[float]:
-        """Try ARIMA-LSTM hybrid"""
-        model = ARIMALSTMHybrid()
-        model.train(np.array(train_data))
-        result = model.forecast(np.array(train_data), horizon)
-        return result.get('forecast')
+    @staticmethod
+    def _stop(conn, process) -> None:
+        process.terminate()
+        process.join()
+        conn.close()
 
 
 def get_best_forecast(
     historical_data: List[float],
     metric_name: str = 'cycle_time',
-    horizon: int = 30
+    horizon: int = 30,
+    time_budget: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Automatically select and use best forecasting model
@@ -303,33 +515,26 @@ def get_best_forecast(
         historical_data: Historical metric values
         metric_name: Name of metric
         horizon: Forecast horizon
+        time_budget: Wall-clock seconds allowed for model selection
         
     Returns:
         Best forecast results
     """
-    selector = AutoForecastSelector()
+    selector = AutoForecastSelector(time_budget=time_budget)
     
     # Select best model using validation
     selection_result = selector.select_best_model(historical_data, validation_horizon=10)
     
     best_model = selection_result.get('best_model', 'ARIMA')
     
-    # Generate final forecast with full data
-    if best_model == 'ARIMA_LSTM_Hybrid':
-        model = ARIMALSTMHybrid()
-        model.train(np.array(historical_data))
-        forecast_result = model.forecast(np.array(historical_data), horizon)
-    else:
-        # Use individual model
-        forecast_result = {
-            'forecast': None,
-            'model_type': best_model
-        }
+    # Generate final forecast with full data, reusing the fitted winner
+    forecast_result = selector.forecast_best(historical_data, horizon)
     
     return {
         'algorithm': f'Auto_Selected_{best_model}',
         'metric': metric_name,
         'selection_details': selection_result,
         'forecast': forecast_result.get('forecast'),
+        'refit': forecast_result.get('refit'),
         'horizon': horizon
     }
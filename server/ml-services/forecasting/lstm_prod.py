@@ -4,13 +4,18 @@ Deep learning time series forecasting
 """
 
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 import sys
 from pathlib import Path
+from datetime import datetime
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from base.ml_model_base import ForecasterBase, TrainingResult, PredictionResult, TrainingError
+from base.ml_model_base import ForecasterBase, TrainingResult, PredictionResult, TrainingError, LifecycleContext
+from base.instrumentation import input_stats
+from base.windowing import sliding_windows, predict_in_batches
+from base.training_pipeline import PipelineConfig, fit_on_series, history_metrics
+from base.autoregressive import rollout_forecast
 
 
 class LSTMForecaster(ForecasterBase):
@@ -22,19 +27,22 @@ class LSTMForecaster(ForecasterBase):
         horizon: int = 30,
         sequence_length: int = 10,
         hidden_units: int = 50,
-        epochs: int = 50
+        epochs: int = 50,
+        pipeline: Optional[PipelineConfig] = None
     ):
         super().__init__(model_id, "lstm", horizon)
         self.sequence_length = sequence_length
         self.hidden_units = hidden_units
         self.epochs = epochs
+        self.pipeline = pipeline or PipelineConfig()
         self.scaler_mean = None
         self.scaler_std = None
         
         self.metadata.hyperparameters.update({
             'sequence_length': sequence_length,
             'hidden_units': hidden_units,
-            'epochs': epochs
+            'epochs': epochs,
+            **self.pipeline.hyperparameters()
         })
     
     def _scale_data(self, data: np.ndarray, fit: bool = False) -> np.ndarray:
@@ -50,17 +58,19 @@ class LSTMForecaster(ForecasterBase):
         return data * self.scaler_std + self.scaler_mean
     
     def _create_sequences(self, data: np.ndarray) -> tuple:
-        """Create LSTM sequences"""
-        X, y = [], []
-        
-        for i in range(len(data) - self.sequence_length):
-            X.append(data[i:i + self.sequence_length])
-            y.append(data[i + self.sequence_length])
-        
-        return np.array(X), np.array(y)
+        """Create LSTM sequences (read-only window views)"""
+        X, y = sliding_windows(data, self.sequence_length, 1)
+        return X, y[:, 0]
     
     def train(self, data: Any, **kwargs) -> TrainingResult:
         """Train LSTM model"""
+        self.before_train(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='train',
+            timestamp=datetime.now()
+        ))
+        
         try:
             import tensorflow as tf
             from tensorflow import keras
@@ -80,7 +90,7 @@ class LSTMForecaster(ForecasterBase):
         
         # Create sequences
         X, y = self._create_sequences(scaled_data)
-        X = X.reshape(X.shape[0], X.shape[1], 1)
+        X = X[..., np.newaxis]
         
         self.metadata.training_samples = len(X)
         
@@ -93,18 +103,16 @@ class LSTMForecaster(ForecasterBase):
         self.model.compile(optimizer='adam', loss='mse')
         
         # Train
-        self.model.fit(
-            X, y,
-            epochs=self.epochs,
-            batch_size=32,
-            verbose=0
+        history = fit_on_series(
+            self.model, scaled_data[:, np.newaxis], self.epochs, self.pipeline,
+            input_length=self.sequence_length, target_length=1
         )
         
         self.is_trained = True
         self.metadata.status = 'trained'
         
         # Calculate metrics
-        predictions = self.model.predict(X, verbose=0).flatten()
+        predictions = predict_in_batches(lambda batch: self.model.predict(batch, verbose=0), X).flatten()
         mae = float(np.mean(np.abs(predictions - y)))
         rmse = float(np.sqrt(np.mean((predictions - y) ** 2)))
         
@@ -112,50 +120,77 @@ class LSTMForecaster(ForecasterBase):
             'training_samples': len(X),
             'sequence_length': self.sequence_length,
             'mae': mae,
-            'rmse': rmse
+            'rmse': rmse,
+            **history_metrics(history)
         }
         
         self.metadata.performance_metrics = metrics
         
+        self.after_train(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='train',
+            timestamp=datetime.now(),
+            data=input_stats(X)
+        ))
+        
         return TrainingResult(
             success=True,
             metrics=metrics,
             metadata=self.metadata
         )
     
+    def _seed_windows(self, histories: Sequence[Any]) -> np.ndarray:
+        """Scaled last `sequence_length` points of every series, shape (n_series, sequence_length)"""
+        windows = np.empty((len(histories), self.sequence_length))
+        for row, history in enumerate(histories):
+            history = np.asarray(history, dtype=np.float64)
+            if len(history) < self.sequence_length:
+                raise ValueError(f"Need at least {self.sequence_length} points per series")
+            windows[row] = history[-self.sequence_length:]
+        return self._scale_data(windows, fit=False)
+    
+    def forecast_many(self, histories: Sequence[Any], horizon: Optional[int] = None) -> np.ndarray:
+        """
+        Forecast many series in one compiled rollout
+        
+        Returns:
+            Forecasts of shape (n_series, horizon) in original units
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained first")
+        
+        h = horizon or self.horizon
+        scaled = rollout_forecast(self.model, self._seed_windows(histories), h)
+        return self._inverse_scale(scaled)
+    
     def predict(self, data: Any, horizon: Optional[int] = None, **kwargs) -> PredictionResult:
         """Generate forecast"""
         if not self.is_trained:
             raise ValueError("Model must be trained first")
         
-        if isinstance(data, list):
-            data = np.array(data)
+        self.before_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now()
+        ))
         
         h = horizon or self.horizon
-        
-        # Scale last sequence
-        scaled_data = self._scale_data(data, fit=False)
-        current_seq = scaled_data[-self.sequence_length:].tolist()
-        
-        # Generate forecast
-        forecast = []
-        for _ in range(h):
-            # Predict next point
-            X = np.array([current_seq[-self.sequence_length:]])
-            X = X.reshape(1, self.sequence_length, 1)
-            pred = self.model.predict(X, verbose=0)[0, 0]
-            forecast.append(pred)
-            
-            # Update sequence
-            current_seq.append(pred)
-        
-        # Inverse scale
-        forecast = self._inverse_scale(np.array(forecast))
+        forecast = self.forecast_many([data], h)[0]
         
         results = {
             'forecast': forecast.tolist()
         }
         
+        self.after_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now(),
+            data=input_stats(np.asarray(data))
+        ))
+        
         return PredictionResult(
             predictions=results,
             metadata={'model_type': 'lstm', 'horizon': h}
@@ -86,6 +86,42 @@ class ProphetForecaster:
                 'error': str(e)
             }
     
+    def update(self, new_observations: np.ndarray, freq: str = 'D') -> None:
+        """
+        Refit on the history plus observations that follow it, warm-started
+        
+        Prophet cannot extend a fitted model, so the refit is initialized
+        from the current parameters and converges in far fewer iterations.
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained first")
+        
+        from prophet import Prophet
+        
+        previous = self.model
+        history = previous.history[['ds', 'y']]
+        new_dates = pd.date_range(history['ds'].iloc[-1], periods=len(new_observations) + 1, freq=freq)[1:]
+        df = pd.concat(
+            [history, pd.DataFrame({'ds': new_dates, 'y': np.asarray(new_observations)})],
+            ignore_index=True
+        )
+        
+        self.model = Prophet(
+            daily_seasonality=self.daily_seasonality,
+            weekly_seasonality=self.weekly_seasonality,
+            yearly_seasonality=len(df) >= 730,
+            changepoint_prior_scale=0.05
+        )
+        
+        fit_kwargs = {}
+        # Seasonality terms (and so beta's shape) change once yearly kicks in
+        if (len(df) >= 730) == (len(history) >= 730):
+            # Prophet's documented warm start: scalars [0][0], vectors [0]
+            init = {name: previous.params[name][0][0] for name in ('k', 'm', 'sigma_obs')}
+            init.update({name: previous.params[name][0] for name in ('delta', 'beta')})
+            fit_kwargs['init'] = init
+        self.model.fit(df, **fit_kwargs)
+    
     def forecast(self, horizon: int = 30, freq: str = 'D') -> Dict[str, Any]:
         """
         Generate forecast
@@ -12,9 +12,11 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from base.ml_model_base import ForecasterBase, TrainingResult, PredictionResult
+from base.ml_model_base import ForecasterBase, TrainingResult, PredictionResult, LifecycleContext
+from base.instrumentation import input_stats
 from base.schemas import ForecastingInput, ForecastingOutput
 from base.model_registry import get_registry
+from base.model_serving import get_model_holder
 
 
 class ProphetForecaster(ForecasterBase):
@@ -58,6 +60,13 @@ class ProphetForecaster(ForecasterBase):
         Returns:
             TrainingResult with success status and metrics
         """
+        self.before_train(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='train',
+            timestamp=datetime.now()
+        ))
+        
         try:
             # Import Prophet
             try:
@@ -140,6 +149,14 @@ class ProphetForecaster(ForecasterBase):
             
             self.metadata.performance_metrics = metrics
             
+            self.after_train(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='train',
+                timestamp=datetime.now(),
+                data=input_stats(df[['y']].to_numpy())
+            ))
+            
             return TrainingResult(
                 success=True,
                 metrics=metrics,
@@ -169,6 +186,13 @@ class ProphetForecaster(ForecasterBase):
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction. Call train() first.")
         
+        self.before_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now()
+        ))
+        
         h = horizon or self.horizon
         
         # Create future dataframe
@@ -204,6 +228,14 @@ class ProphetForecaster(ForecasterBase):
         if 'yearly' in forecast.columns:
             results['components']['yearly'] = forecast['yearly'].tail(h).values.tolist()
         
+        self.after_predict(LifecycleContext(
+            model_id=self.model_id,
+            model_type=self.model_type,
+            operation='predict',
+            timestamp=datetime.now(),
+            data=input_stats(data)
+        ))
+        
         return PredictionResult(
             predictions=results,
             metadata={
@@ -343,17 +375,16 @@ def forecast_with_prophet(
     Returns:
         ForecastingOutput with forecast
     """
-    # Try to load from registry
-    registry = get_registry()
-    deployed = registry.get_deployed_model('prophet', 'production')
-    
-    forecaster = ProphetForecaster(model_id=model_id, horizon=horizon)
+    # Deployed model, kept warm and hot-swapped by the holder
+    deployed = get_model_holder(
+        'prophet', lambda mid: ProphetForecaster(model_id=mid)
+    ).get(model_id)
     
-    if deployed and deployed['model_id'] == model_id:
-        # Load deployed model
-        forecaster.load(deployed['model_path'])
+    if deployed is not None:
+        forecaster = deployed.model
     elif train_if_not_exists:
         # Train new model
+        forecaster = ProphetForecaster(model_id=model_id, horizon=horizon)
         result = forecaster.train(historical_values, timestamps)
         if not result.success:
             raise ValueError(f"Training failed: {result.error}")
@@ -5,7 +5,7 @@ FIXED: Uses lifecycle hooks, deterministic features, proper artifact storage
 """
 
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -22,6 +22,8 @@ from base.ml_model_base import (
     ArtifactStore,
     PersistenceError
 )
+from base.instrumentation import input_stats
+from base.windowing import sliding_windows
 
 
 class XGBoostForecaster(ForecasterBase):
@@ -32,27 +34,25 @@ class XGBoostForecaster(ForecasterBase):
         model_id: str = "xgboost_default",
         horizon: int = 30,
         n_lags: int = 7,
-        n_estimators: int = 100
+        n_estimators: int = 100,
+        use_inplace_predict: bool = True
     ):
         super().__init__(model_id, "xgboost", horizon)
         self.n_lags = n_lags
         self.n_estimators = n_estimators
+        self.use_inplace_predict = use_inplace_predict
         self.training_data = None  # Store for future predictions
         
         self.metadata.hyperparameters.update({
             'n_lags': n_lags,
-            'n_estimators': n_estimators
+            'n_estimators': n_estimators,
+            'use_inplace_predict': use_inplace_predict
         })
     
     def _create_features(self, data: np.ndarray) -> tuple:
-        """Create deterministic lag features"""
-        X, y = [], []
-        
-        for i in range(self.n_lags, len(data)):
-            X.append(data[i-self.n_lags:i])
-            y.append(data[i])
-        
-        return np.array(X), np.array(y)
+        """Create deterministic lag features (read-only window views)"""
+        X, y = sliding_windows(data, self.n_lags, 1)
+        return X, y[:, 0]
     
     def before_train(self, context: LifecycleContext) -> None:
         """Lifecycle hook before training"""
@@ -125,13 +125,20 @@ class XGBoostForecaster(ForecasterBase):
                 'mae': mae,
                 'rmse': rmse,
                 'mape': mape,
-                'n_estimators': self.n_estimators
+                'n_estimators': self.n_estimators,
+                'total_trees': self.n_estimators
             }
             
             self.metadata.performance_metrics = metrics
             
-            # Invoke after_train hook
-            self.after_train(context)
+            # Invoke after_train hook (fresh context carrying the input size)
+            self.after_train(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='train',
+                timestamp=datetime.now(),
+                data=input_stats(X)
+            ))
             
             return TrainingResult(
                 success=True,
@@ -146,6 +153,76 @@ class XGBoostForecaster(ForecasterBase):
             self.metadata.status = 'failed'
             raise TrainingError(f"Unexpected training error: {str(e)}", context={'error': str(e)})
     
+    def update(self, new_data: Any, n_rounds: int = 10) -> None:
+        """
+        Continue boosting on the training series extended with `new_data`
+        
+        Adds `n_rounds` trees to the existing booster rather than
+        retraining all `n_estimators` from scratch. The regressor keeps its
+        configured `n_estimators`; the booster's total tree count is
+        recorded as performance_metrics['total_trees'].
+        """
+        if not self.is_trained:
+            raise TrainingError("Model must be trained before update")
+        
+        self.training_data = np.concatenate([np.asarray(self.training_data), np.asarray(new_data)])
+        X, y = self._create_features(self.training_data)
+        
+        booster = self.model.get_booster()
+        self.model.set_params(n_estimators=n_rounds)
+        try:
+            self.model.fit(X, y, xgb_model=booster)
+        finally:
+            self.model.set_params(n_estimators=self.n_estimators)
+        self.metadata.training_samples = len(X)
+        self.metadata.performance_metrics['total_trees'] = self.model.get_booster().num_boosted_rounds()
+    
+    def _predict_step(self, X: np.ndarray) -> np.ndarray:
+        """One booster call on an (n_series, n_lags) lag matrix"""
+        if self.use_inplace_predict and hasattr(self.model, 'get_booster'):
+            # Skips building a DMatrix for every horizon step
+            return self.model.get_booster().inplace_predict(X)
+        return self.model.predict(X)
+    
+    def forecast_many(self, histories: Sequence[Any], horizon: Optional[int] = None) -> np.ndarray:
+        """
+        Recursive forecast of many series at once
+        
+        The lag windows of all series live in one mirrored ring buffer of
+        shape (n_series, 2 * n_lags). Each new value is written at `pos` and
+        `pos + n_lags`, so the current window is always the slice
+        [pos + 1, pos + 1 + n_lags) and every horizon step is a single
+        booster call over all series.
+        
+        Returns:
+            Forecasts of shape (n_series, horizon)
+        """
+        if not self.is_trained:
+            raise PredictionError("Model must be trained before prediction")
+        
+        h = horizon or self.horizon
+        n_lags = self.n_lags
+        
+        ring = np.empty((len(histories), 2 * n_lags), dtype=np.float32)
+        for row, history in enumerate(histories):
+            history = np.asarray(history)
+            if len(history) < n_lags:
+                raise PredictionError(
+                    f"Need at least {n_lags} points per series, got {len(history)}",
+                    context={'series': row, 'n_lags': n_lags}
+                )
+            ring[row, :n_lags] = history[-n_lags:]
+        ring[:, n_lags:] = ring[:, :n_lags]
+        
+        forecast = np.empty((len(histories), h))
+        pos = n_lags - 1  # Column of the newest value
+        for step in range(h):
+            forecast[:, step] = self._predict_step(ring[:, pos + 1:pos + 1 + n_lags])
+            pos = (pos + 1) % n_lags
+            ring[:, pos] = ring[:, pos + n_lags] = forecast[:, step]
+        
+        return forecast
+    
     def predict(self, data: Any, horizon: Optional[int] = None, **kwargs) -> PredictionResult:
         """Generate forecast with proper lifecycle"""
         if not self.is_trained:
@@ -161,32 +238,25 @@ class XGBoostForecaster(ForecasterBase):
         self.before_predict(context)
         
         try:
-            if isinstance(data, list):
-                data = np.array(data)
-            
             h = horizon or self.horizon
             
             # Use last n_lags points as seed
-            forecast = []
-            current_window = data[-self.n_lags:].tolist()
-            
-            for _ in range(h):
-                # Predict next point
-                X = np.array([current_window[-self.n_lags:]])
-                pred = self.model.predict(X)[0]
-                forecast.append(float(pred))
-                
-                # Update window
-                current_window.append(pred)
+            forecast = self.forecast_many([data], h)[0]
             
             results = {
-                'forecast': forecast,
+                'forecast': forecast.tolist(),
                 'horizon': h,
                 'n_lags_used': self.n_lags
             }
             
-            # Invoke after_predict hook
-            self.after_predict(context)
+            # Invoke after_predict hook (fresh context carrying the input size)
+            self.after_predict(LifecycleContext(
+                model_id=self.model_id,
+                model_type=self.model_type,
+                operation='predict',
+                timestamp=datetime.now(),
+                data=input_stats(data)
+            ))
             
             return PredictionResult(
                 predictions=results,
@@ -240,11 +310,11 @@ class XGBoostForecaster(ForecasterBase):
         # Get the model artifact from parent save
         model_artifact = self.metadata.artifacts[0]
         
-        # Save training data for future forecasting
+        # Save training data for future forecasting (memory-mapped on load)
         if self.training_data is not None:
             training_data_path = artifact_dir / "training_data.joblib"
             training_data_spec = ArtifactStore.save(
-                self.training_data, training_data_path, 'joblib', name='training_data'
+                self.training_data, training_data_path, 'joblib_mmap', name='training_data'
             )
             
             # Replace artifacts list with complete set (prevents accumulation on repeated saves)
@@ -0,0 +1,115 @@
+"""
+Tests for ArtifactStore persistence and manifest verification
+Memory-mapped artifact types, checksum caching and deferred verification
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from base.ml_model_base import (
+    ArtifactStore,
+    ManifestValidator,
+    MLModelBase,
+    ModelManifest,
+    PersistenceError,
+    PredictionResult,
+    TrainingResult,
+)
+
+
+class _ArrayModel(MLModelBase):
+    """Minimal concrete model for persistence tests"""
+    
+    def train(self, data, **kwargs):
+        self.model = np.asarray(data)
+        self.is_trained = True
+        return TrainingResult(success=True, metrics={}, metadata=self.metadata)
+    
+    def predict(self, data, **kwargs):
+        return PredictionResult(predictions=list(self.model[:len(data)]))
+    
+    def evaluate(self, data, labels, **kwargs):
+        return {}
+
+
+def test_npy_artifact_loads_memory_mapped(tmp_path):
+    data = np.arange(10000, dtype=np.float64).reshape(100, 100)
+    spec = ArtifactStore.save(data, tmp_path / "weights.npy", 'npy')
+    
+    assert spec.artifact_type == 'npy'
+    assert spec.checksum == ManifestValidator._calculate_checksum(tmp_path / "weights.npy")
+    
+    loaded = ArtifactStore.load(tmp_path / spec.filename, spec.artifact_type)
+    assert isinstance(loaded, np.memmap)
+    assert not loaded.flags.writeable
+    np.testing.assert_array_equal(loaded, data)
+
+
+def test_joblib_mmap_artifact_is_checksum_validated(tmp_path):
+    payload = {'series': np.linspace(0, 1, 5000), 'n_lags': 7}
+    spec = ArtifactStore.save(payload, tmp_path / "training_data.joblib", 'joblib_mmap')
+    
+    loaded = ArtifactStore.load(tmp_path / spec.filename, spec.artifact_type)
+    assert isinstance(loaded['series'], np.memmap)
+    assert loaded['n_lags'] == 7
+    
+    manifest = ModelManifest(model_id="m", model_type="t", artifacts=[spec])
+    ManifestValidator.validate(manifest, tmp_path)
+    
+    with open(tmp_path / spec.filename, 'r+b') as f:
+        f.seek(-8, 2)
+        f.write(b'\xff' * 8)
+    with pytest.raises(PersistenceError):
+        ManifestValidator.validate(manifest, tmp_path)
+
+
+def test_checksum_cache_skips_rehash_until_file_changes(tmp_path, monkeypatch):
+    spec = ArtifactStore.save(np.arange(1000), tmp_path / "a.npy", 'npy')
+    manifest = ModelManifest(model_id="m", model_type="t", artifacts=[spec])
+    
+    calls = []
+    original = ManifestValidator._calculate_checksum.__func__
+    monkeypatch.setattr(
+        ManifestValidator, '_calculate_checksum',
+        classmethod(lambda cls, path: calls.append(path) or original(cls, path))
+    )
+    
+    ManifestValidator.validate(manifest, tmp_path)
+    ManifestValidator.validate(manifest, tmp_path)
+    assert calls == []
+    
+    np.save(tmp_path / "a.npy", np.arange(1001))
+    with pytest.raises(PersistenceError):
+        ManifestValidator.validate(manifest, tmp_path)
+    assert len(calls) == 1
+
+
+def test_deferred_verification_quarantines_corrupt_model(tmp_path):
+    model = _ArrayModel("m", "array")
+    model.train(np.arange(5000.0))
+    model.save(str(tmp_path))
+    
+    restored = _ArrayModel("m", "array")
+    restored.deferred_verification = True
+    restored.load(str(tmp_path))
+    restored.wait_for_verification(timeout=5)
+    assert restored.is_trained
+    
+    artifact = tmp_path / "artifacts" / "model.joblib"
+    # Flip a byte inside the array payload: still loadable, wrong checksum
+    data = bytearray(artifact.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    artifact.write_bytes(bytes(data))
+    
+    corrupted = _ArrayModel("m", "array")
+    corrupted.deferred_verification = True
+    corrupted.load(str(tmp_path))
+    with pytest.raises(PersistenceError):
+        corrupted.wait_for_verification(timeout=5)
+    assert not corrupted.is_trained
+    assert corrupted.metadata.status == 'quarantined'
@@ -0,0 +1,93 @@
+"""
+Tests for the parallel forecast model selector
+Slow candidates are abandoned and the fitted winner is reused
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "forecasting"))
+
+from hybrid_forecaster import AutoForecastSelector
+
+
+class _Drift:
+    """Last value plus the average step"""
+    
+    def __init__(self, series):
+        self.last = float(series[-1])
+        self.step = float(np.mean(np.diff(series)))
+    
+    def update(self, new_observations):
+        self.last = float(new_observations[-1])
+
+
+def _fit_drift(series, horizon):
+    return _Drift(series)
+
+
+def _forecast_drift(model, history, horizon):
+    return model.last + model.step * np.arange(1, horizon + 1)
+
+
+def _fit_mean(series, horizon):
+    return float(np.mean(series))
+
+
+def _forecast_mean(model, history, horizon):
+    return [model] * horizon
+
+
+def _fit_slow(series, horizon):
+    time.sleep(60)
+    return 0.0
+
+
+def _fit_broken(series, horizon):
+    raise ValueError("cannot fit")
+
+
+def test_slow_candidates_are_abandoned_and_winner_reused():
+    selector = AutoForecastSelector(
+        candidates={
+            'Drift': (_fit_drift, _forecast_drift),
+            'Mean': (_fit_mean, _forecast_mean),
+            'Slow': (_fit_slow, _forecast_mean),
+            'Broken': (_fit_broken, _forecast_mean),
+        },
+        max_workers=4,
+        abandon_factor=3.0
+    )
+    series = np.arange(60.0)
+    
+    started = time.monotonic()
+    selection = selector.select_best_model(series.tolist(), validation_horizon=10)
+    assert time.monotonic() - started < 30
+    
+    assert selection['best_model'] == 'Drift'
+    assert selection['rmse'] == 0.0
+    results = selection['all_results']
+    assert results['Slow']['abandoned']
+    assert results['Broken']['error'] == 'cannot fit'
+    assert results['Mean']['rmse'] > 0
+    
+    final = selector.forecast_best(series.tolist(), horizon=5)
+    assert final['refit'] == 'incremental'
+    np.testing.assert_allclose(final['forecast'], np.arange(60.0, 65.0))
+
+
+def test_time_budget_drops_unfinished_candidates():
+    selector = AutoForecastSelector(
+        candidates={'Slow': (_fit_slow, _forecast_mean), 'Slower': (_fit_slow, _forecast_mean)},
+        max_workers=1,
+        time_budget=1.0
+    )
+    
+    selection = selector.select_best_model(list(range(60)), validation_horizon=10)
+    assert selection['best_model'] == 'None'
+    assert all(r['error'] == 'Time budget exhausted' for r in selection['results'].values())
+    assert selector.forecast_best(list(range(60)))['forecast'] is None
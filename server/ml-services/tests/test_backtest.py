@@ -0,0 +1,88 @@
+"""
+Tests for the rolling-origin backtest engine
+Fold layout, warm starts and parallel runs matching serial ones
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from base.testing import BacktestEngine, BacktestFramework
+
+
+class _Result:
+    def __init__(self, success, error=None):
+        self.success = success
+        self.error = error
+
+
+class _MeanForecaster:
+    """Forecasts the mean of everything it has been fitted on"""
+    
+    def __init__(self, model_id):
+        self.model_id = model_id
+    
+    def train(self, data):
+        self.total = float(np.sum(data))
+        self.count = len(data)
+        return _Result(True)
+    
+    def update(self, new_data):
+        self.total += float(np.sum(new_data))
+        self.count += len(new_data)
+    
+    def forecast(self, historical_data, horizon=None):
+        return {'forecast': [self.total / self.count] * horizon}
+
+
+class _NoUpdateForecaster:
+    def __init__(self, model_id):
+        self.model_id = model_id
+    
+    def train(self, data):
+        if len(data) > 60:
+            return _Result(False, "too long")
+        self.last = float(data[-1])
+        return _Result(True)
+    
+    def forecast(self, historical_data, horizon=None):
+        return {'forecast': [self.last] * horizon}
+
+
+def test_expanding_warm_start_matches_fresh_fits_in_parallel():
+    data = np.sin(np.arange(200) / 7.0) + np.arange(200) * 0.01
+    
+    engine = BacktestEngine(_MeanForecaster, window='expanding', max_workers=1)
+    assert engine.folds(200, 50, 10, n_splits=3, step=20) == [(0, 0, 50, 60), (1, 0, 70, 80), (2, 0, 90, 100)]
+    serial = engine.run(data, window_size=50, horizon=10, n_splits=12)
+    assert serial['warm_started_splits'] == 11
+    
+    # Updating with the new points gives the same mean as a fresh fit
+    expected = [np.mean(np.abs(data[:50 + 10 * i].mean() - data[50 + 10 * i:60 + 10 * i])) for i in range(12)]
+    np.testing.assert_allclose([f['metrics']['mae'] for f in serial['folds']], expected)
+    
+    streamed = []
+    parallel = BacktestEngine(_MeanForecaster, max_workers=3).run(
+        data, window_size=50, horizon=10, n_splits=12, on_fold=streamed.append
+    )
+    assert len(streamed) == 12
+    assert parallel['warm_started_splits'] == 9
+    for name, value in serial['metrics'].items():
+        np.testing.assert_allclose(parallel['metrics'][name], value)
+
+
+def test_sliding_window_backtest_reports_failed_splits():
+    data = np.arange(120.0)
+    engine = BacktestEngine(_NoUpdateForecaster, window='sliding', max_workers=1)
+    assert engine.folds(120, 40, 10, n_splits=2) == [(0, 0, 40, 50), (1, 10, 50, 60)]
+    
+    result = BacktestFramework.rolling_window_backtest(_NoUpdateForecaster, data, 50, 10, n_splits=3, max_workers=2)
+    assert result['passed'] and result['successful_splits'] == 3
+    assert result['metrics']['mae'] == np.mean(np.arange(1, 11))
+    
+    result = BacktestFramework.rolling_window_backtest(_NoUpdateForecaster, data, 70, 10, n_splits=3, max_workers=1)
+    assert not result['passed']
+    assert result['errors'][0] == "Split 0: Training failed - too long"
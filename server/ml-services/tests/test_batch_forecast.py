@@ -0,0 +1,100 @@
+"""
+Tests for the vectorized multi-series forecasting kernels
+Batch results must match a per-series scalar reference
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.columnar_transport import CONTENT_TYPE, decode_frame, encode_frame
+from api.forecast_batch import forecast_batch, pad_series
+from api.main import app
+
+
+def _ragged_series(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [
+        list(100 + np.cumsum(rng.normal(0.5, 3, size=n)))
+        for n in (3, 4, 15, 40, 7, 120, 5)
+    ]
+
+
+def _holt_winters_reference(values, horizon, alpha=0.3, beta=0.1):
+    level, trend = values[0], 0.0
+    for x in values[1:]:
+        prev_level = level
+        level = alpha * x + (1 - alpha) * (level + trend)
+        trend = beta * (level - prev_level) + (1 - beta) * trend
+    steps = np.arange(1, horizon + 1)
+    return level + steps * trend, level, trend
+
+
+def test_holt_winters_matches_scalar_loop():
+    series = _ragged_series()
+    values, lengths = pad_series(series)
+    result = forecast_batch(values, lengths, 10, "holt_winters")
+    
+    for row, s in enumerate(series):
+        point, level, trend = _holt_winters_reference(s, 10)
+        np.testing.assert_allclose(result.value[row], np.maximum(0, point))
+        assert result.series_metrics(row)["level"] == pytest.approx(level)
+        assert result.series_metrics(row)["trend"] == pytest.approx(trend)
+
+
+def test_linear_regression_and_moving_average_match_reference():
+    from sklearn.linear_model import LinearRegression
+    
+    series = _ragged_series(seed=1)
+    values, lengths = pad_series(series)
+    linreg = forecast_batch(values, lengths, 5, "linear_regression")
+    moving = forecast_batch(values, lengths, 5, "moving_average")
+    
+    for row, s in enumerate(series):
+        y = np.array(s)
+        X = np.arange(len(y)).reshape(-1, 1)
+        model = LinearRegression().fit(X, y)
+        expected = model.predict(np.arange(len(y), len(y) + 5).reshape(-1, 1))
+        np.testing.assert_allclose(linreg.value[row], np.maximum(0, expected))
+        assert linreg.series_metrics(row)["r_squared"] == pytest.approx(model.score(X, y))
+        
+        window = min(7, len(y) // 2)
+        assert moving.series_metrics(row)["window_size"] == window
+        np.testing.assert_allclose(moving.value[row], np.mean(y[-window:]))
+
+
+def test_batch_endpoint_json_and_columnar():
+    client = TestClient(app)
+    series = {f"process-{i}": s for i, s in enumerate(_ragged_series(seed=2))}
+    
+    response = client.post(
+        "/forecast/batch",
+        json={"series": series, "horizon": 4, "algorithm": "holt_winters"}
+    )
+    assert response.status_code == 200
+    forecasts = response.json()["forecasts"]
+    assert list(forecasts) == list(series)
+    
+    single = client.post("/forecast", json={"values": series["process-3"], "horizon": 4}).json()
+    assert forecasts["process-3"]["forecast"] == single["forecast"]
+    
+    ids = np.concatenate([[name] * len(s) for name, s in series.items()]).astype(object)
+    frame = encode_frame(
+        {"series_id": ids, "values": np.concatenate(list(series.values()))},
+        {"horizon": 4, "algorithm": "holt_winters"}
+    )
+    response = client.post("/forecast/batch", content=frame, headers={"content-type": CONTENT_TYPE})
+    columns, metadata = decode_frame(response.content)
+    row = metadata["series"].index("process-3")
+    np.testing.assert_allclose(
+        columns["value"][row * 4:(row + 1) * 4],
+        [p["value"] for p in single["forecast"]]
+    )
+    
+    short = client.post("/forecast/batch", json={"series": {"a": [1.0, 2.0]}})
+    assert short.status_code == 400
@@ -0,0 +1,44 @@
+"""
+Tests for the benchmark harness
+Synthetic datasets match the sample files and regressions are flagged
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.datasets import parse_scale, synthetic_event_log, synthetic_metrics
+from benchmarks.harness import compare, measure_case
+
+SAMPLES = Path(__file__).parent.parent.parent.parent
+
+
+def test_datasets_match_sample_files():
+    log = synthetic_event_log(5000, seed=1)
+    assert list(log.columns) == list(pd.read_csv(SAMPLES / "sample_event_log.csv", nrows=1).columns)
+    assert len(log) == 5000
+    assert (log.groupby('case_id')['timestamp'].diff().dropna() > pd.Timedelta(0)).all()
+    assert log.equals(synthetic_event_log(5000, seed=1))
+    
+    metrics = synthetic_metrics(2000)
+    assert list(metrics.columns) == list(pd.read_csv(SAMPLES / "sample_performance_metrics.csv", nrows=1).columns)
+    assert parse_scale('10m') == 10_000_000 and parse_scale('2500') == 2500
+
+
+def test_measure_case_and_regression_check():
+    result = measure_case('feature_extractor', '2000')
+    assert result['status'] == 'ok'
+    assert set(result['phases']) == {'train', 'predict', 'save', 'load'}
+    assert result['phases']['predict']['rows_per_second'] > 0
+    assert result['phases']['train']['peak_alloc_mb'] > 0
+    
+    slower = {**result, 'phases': {**result['phases'], 'train': {
+        **result['phases']['train'], 'seconds': result['phases']['train']['seconds'] * 2 + 1
+    }}}
+    assert compare([result], [result]) == []
+    regressions = compare([slower], [result])
+    assert [(r['phase'], r['metric']) for r in regressions] == [('train', 'seconds')]
+    assert compare([{**result, 'status': 'error'}], [result])[0]['metric'] == 'status'
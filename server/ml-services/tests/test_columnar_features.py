@@ -0,0 +1,124 @@
+"""
+Regression test for the columnar event-log feature engine
+Checks bulk timestamp parsing and case segmentation against the
+per-event datetime semantics they replace
+"""
+
+import numpy as np
+import pickle
+import sys
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from base.columnar import (
+    factorize,
+    hash_strings,
+    hour_and_weekday,
+    parse_timestamps,
+    previous_in_case,
+    segment_cases,
+)
+from base.preprocessing import DeterministicEncoder
+
+
+def test_parse_timestamps_matches_fromisoformat():
+    """Bulk parse agrees with datetime.fromisoformat for common ISO variants"""
+    values = [
+        "2024-01-15T09:00:00",
+        "2024-01-15 09:30:00",
+        "2024-01-15T23:59:59.250000Z",
+        "2024-01-16T01:00:00+05:30",
+        "2024-01-16T01:00:00-02:00",
+    ]
+    parsed = parse_timestamps(values)
+    assert parsed.valid.all()
+    
+    hour, weekday = hour_and_weekday(parsed.wall)
+    for i, value in enumerate(values):
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        assert hour[i] == dt.hour
+        assert weekday[i] == dt.weekday()
+    
+    # Offsets only affect the UTC epoch
+    gap = (parsed.utc[3] - parsed.utc[4]) / 1e6
+    assert gap == -(5.5 + 2) * 3600
+
+
+def test_parse_timestamps_routes_non_extended_iso_to_fromisoformat():
+    """Basic-format dates and colon-less offsets are not left to numpy"""
+    values = ["20240115", "2024-01-15T10:30:00+0530", "2024-01-15T10:30:00"]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        parsed = parse_timestamps(values)
+    assert parsed.valid.all()
+    
+    hour, weekday = hour_and_weekday(parsed.wall)
+    assert hour.tolist() == [0, 10, 10] and weekday.tolist() == [0, 0, 0]
+    assert parsed.wall[0] == parse_timestamps(["2024-01-15"]).wall[0]
+    assert (parsed.utc[2] - parsed.utc[1]) / 1e6 == 5.5 * 3600
+
+
+def test_parse_timestamps_falls_back_and_fills_invalid():
+    """Unparseable values are masked and filled instead of raising"""
+    fill = datetime(2024, 6, 1, 12, 0, 0)
+    parsed = parse_timestamps(["2024-01-01T10:00:00", "not a date", None], fill_invalid=fill)
+    assert parsed.valid.tolist() == [True, False, False]
+    
+    hour, _ = hour_and_weekday(parsed.wall)
+    assert hour.tolist() == [10, 12, 12]
+
+
+def test_segment_cases_positions_and_previous():
+    """Stable sort by (case, key) gives per-case positions in input order"""
+    case_codes, _ = factorize(["b", "a", "b", "a", "b"])
+    order_key = np.array([30, 20, 10, 10, 20])
+    segments = segment_cases(case_codes, order_key=order_key)
+    
+    assert segments.n_cases == 2
+    assert segments.position.tolist() == [2, 1, 0, 0, 1]
+    assert segments.case_size.tolist() == [3, 2, 3, 2, 3]
+    
+    previous, has_previous = previous_in_case(order_key, segments)
+    assert has_previous.tolist() == [True, True, False, False, True]
+    assert previous[has_previous].tolist() == [20, 10, 10]
+
+
+def test_factorize_matches_str_unique():
+    """Hash-table factorize keeps the sorted str() semantics of np.unique"""
+    values = np.array(["b", "a", None, 1, "1", "b", float("nan")], dtype=object)
+    codes, uniques = factorize(values)
+    expected_uniques, expected_codes = np.unique(values.astype(np.str_), return_inverse=True)
+    assert uniques.tolist() == expected_uniques.tolist()
+    assert codes.tolist() == expected_codes.tolist()
+    
+    
+    # Fixed-width unicode columns take the hashed path and agree with it
+    strings = np.array(["review", "", "approve", "ü", "review", "approve"] * 5000)
+    u_codes, u_uniques = factorize(strings)
+    o_codes, o_uniques = factorize(strings.astype(object))
+    assert u_uniques.tolist() == o_uniques.tolist() == ["", "approve", "review", "ü"]
+    assert u_codes.tolist() == o_codes.tolist()
+
+def test_deterministic_encoder_vectorized():
+    """Seen categories map to their sorted position, unseen ones to a stable hash"""
+    encoder = DeterministicEncoder(max_categories=3).fit(["review", "approve", "submit", "close"])
+    assert encoder.category_mappings == {"approve": 0, "close": 1, "review": 2, "submit": 0}
+    
+    column = np.array(["submit", "escalate", "review", "escalate", "zz"], dtype=object)
+    encoded = encoder.transform(column)
+    assert encoded[[0, 2]].tolist() == [0, 2]
+    assert encoded[1] == encoded[3]
+    assert encoded[1] == hash_strings(["escalate"])[0] % 3
+    # Hashes ignore fixed-width padding
+    assert hash_strings(np.array(["ab"], dtype="U10"))[0] == hash_strings(["ab"])[0]
+    
+    # Encoders pickled with the old dict vocabulary still load
+    legacy = DeterministicEncoder(max_categories=3)
+    state = {**legacy.__dict__, 'category_mappings': encoder.category_mappings, 'is_fitted': True}
+    del state['vocabulary']
+    restored = pickle.loads(pickle.dumps(legacy))
+    restored.__setstate__(state)
+    assert restored.transform(column).tolist() == encoded.tolist()
@@ -0,0 +1,73 @@
+"""
+Tests for the binary columnar transport
+Frame round-trips and parity with the JSON endpoints
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.columnar_transport import CONTENT_TYPE, TransportError, decode_frame, encode_frame
+from api.main import app
+
+
+def test_frame_round_trip():
+    columns = {
+        "value": np.linspace(0, 1, 7),
+        "code": np.arange(7, dtype=np.int32),
+        "flag": np.array([True, False] * 3 + [True]),
+        "label": np.array(["a", "b", "a", "ü", "b", "c", "a"], dtype=object),
+    }
+    decoded, metadata = decode_frame(encode_frame(columns, {"horizon": 3}))
+    
+    assert metadata == {"horizon": 3}
+    np.testing.assert_array_equal(decoded["value"], columns["value"])
+    np.testing.assert_array_equal(decoded["code"], columns["code"])
+    assert decoded["flag"].tolist() == [1, 0, 1, 0, 1, 0, 1]
+    assert decoded["label"].tolist() == columns["label"].tolist()
+    
+    with pytest.raises(TransportError):
+        decode_frame(b"EPQC" + b"\0" * 4)
+
+
+def test_binary_forecast_matches_json():
+    client = TestClient(app)
+    values = [float(v) for v in np.sin(np.arange(40) / 3) * 10 + 50]
+    payload = {"horizon": 6, "algorithm": "moving_average"}
+    
+    response = client.post(
+        "/forecast",
+        content=encode_frame({"values": np.array(values)}, payload),
+        headers={"content-type": CONTENT_TYPE},
+    )
+    assert response.headers["content-type"] == CONTENT_TYPE
+    columns, metadata = decode_frame(response.content)
+    
+    expected = client.post("/forecast", json={"values": values, **payload}).json()
+    np.testing.assert_allclose(columns["value"], [p["value"] for p in expected["forecast"]])
+    assert metadata["metrics"] == expected["metrics"]
+
+
+def test_malformed_metadata_is_a_client_error():
+    client = TestClient(app)
+    values = {"values": np.arange(20.0)}
+    bad_json = bytearray(encode_frame(values, {"horizon": 3}))
+    bad_json[16:18] = b"{{"
+    
+    frames = {
+        "/forecast": [bytes(bad_json), encode_frame(values, ["horizon"]), encode_frame(values, {"horizon": "soon"})],
+        "/simulation": [encode_frame({}, {"num_simulations": "many"})],
+        "/anomaly-detection": [encode_frame({"case_id": np.array(["a"] * 12, dtype=object),
+                                             "activity": np.array(["x"] * 12, dtype=object),
+                                             "timestamp": np.array(["t"] * 12, dtype=object)},
+                                            {"contamination": [0.1]})],
+    }
+    for path, bodies in frames.items():
+        for body in bodies:
+            response = client.post(path, content=body, headers={"content-type": CONTENT_TYPE})
+            assert response.status_code == 400, (path, response.text)
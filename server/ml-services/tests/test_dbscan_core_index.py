@@ -0,0 +1,57 @@
+"""
+Tests for out-of-sample DBSCAN scoring
+Predictions come from the core-sample index, not re-clustering
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "anomaly-detection"))
+
+from dbscan_prod import DBSCANAnomalyDetector
+
+
+def _blobs(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = np.array([[0, 0, 0], [5, 5, 5]])
+    X = np.vstack([c + rng.normal(scale=0.3, size=(200, 3)) for c in centers])
+    outliers = rng.uniform(-10, 15, size=(10, 3))
+    return np.vstack([X, outliers])
+
+
+def test_predict_reuses_training_clusters():
+    X = _blobs()
+    detector = DBSCANAnomalyDetector(eps=0.6, min_samples=5)
+    detector.train(X)
+    training_labels = detector.model.labels_
+    
+    predictions = detector.predict(X).predictions
+    predicted = np.array([-1 if p['cluster_id'] is None else p['cluster_id'] for p in predictions])
+    
+    np.testing.assert_array_equal(predicted == -1, training_labels == -1)
+    core = detector.model.core_sample_indices_
+    np.testing.assert_array_equal(predicted[core], training_labels[core])
+    
+    # A single far-away point is noise; no re-clustering of a 1-row batch
+    far = detector.predict(np.array([[50.0, 50.0, 50.0]])).predictions[0]
+    assert far['is_anomaly'] and far['core_distance'] > detector.eps
+    near = detector.predict(np.array([[0.05, 0.0, 0.0]])).predictions[0]
+    assert not near['is_anomaly']
+
+
+def test_core_index_persists(tmp_path):
+    X = _blobs(seed=1)
+    detector = DBSCANAnomalyDetector(eps=0.6, min_samples=5)
+    detector.train(X)
+    detector.save(str(tmp_path))
+    
+    restored = DBSCANAnomalyDetector(eps=0.1, min_samples=5)
+    restored.load(str(tmp_path))
+    assert restored.eps == 0.6
+    assert 'core_index' in {a.name for a in restored.metadata.artifacts}
+    
+    expected = [p['cluster_id'] for p in detector.predict(X).predictions]
+    assert [p['cluster_id'] for p in restored.predict(X).predictions] == expected
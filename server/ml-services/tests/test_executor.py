@@ -0,0 +1,69 @@
+"""
+Tests for the API's bounded compute executor
+Queue saturation, deadlines and event-loop responsiveness
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.executor import ComputeExecutor, DeadlineExceeded, ExecutorSaturated
+
+
+def _busy(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+
+def test_saturated_queue_rejects_with_retry_after():
+    async def scenario():
+        executor = ComputeExecutor(kind="thread", max_workers=1, max_queue=1)
+        running = asyncio.ensure_future(executor.run(_busy, 0.2))
+        queued = asyncio.ensure_future(executor.run(_busy, 0.01))
+        await asyncio.sleep(0.01)
+        
+        with pytest.raises(ExecutorSaturated) as exc_info:
+            await executor.run(_busy, 0.01)
+        assert exc_info.value.retry_after >= 1
+        
+        assert await running == "done"
+        assert await queued == "done"
+        stats = executor.stats()
+        executor.shutdown()
+        return stats
+    
+    stats = asyncio.run(scenario())
+    assert stats['rejected'] == 1
+    assert stats['completed'] == 2
+    assert stats['in_flight'] == 0
+
+
+def test_deadline_exceeded_keeps_loop_responsive():
+    async def scenario():
+        executor = ComputeExecutor(kind="thread", max_workers=1, max_queue=4)
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        
+        tick_task = asyncio.ensure_future(ticker())
+        with pytest.raises(DeadlineExceeded):
+            await executor.run(_busy, 0.3, deadline=executor.deadline(0.1))
+        tick_task.cancel()
+        
+        stats = executor.stats()
+        executor.shutdown()
+        return ticks, stats
+    
+    ticks, stats = asyncio.run(scenario())
+    # The event loop kept ticking while the worker was busy
+    assert ticks >= 5
+    assert stats['timeouts'] == 1
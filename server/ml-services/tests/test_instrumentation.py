@@ -0,0 +1,81 @@
+"""
+Tests for lifecycle phase instrumentation
+Hooks record each phase once, failures included, and /metrics exports them
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "anomaly-detection"))
+
+from base.instrumentation import MetricsRegistry, get_phase_instrumentation
+from base.ml_model_base import PredictionError
+from dbscan_prod import DBSCANAnomalyDetector
+
+
+def _phase_counts(instrumentation, operation):
+    labels = {'model_type': 'anomaly_dbscan', 'operation': operation}
+    return (
+        instrumentation.phases.value(status='ok', **labels),
+        instrumentation.phases.value(status='error', **labels),
+        instrumentation.samples.value(**labels)
+    )
+
+
+def test_hooks_record_each_phase_once(tmp_path):
+    instrumentation = get_phase_instrumentation()
+    before = {op: _phase_counts(instrumentation, op) for op in ('train', 'predict', 'save', 'load')}
+    
+    X = np.random.default_rng(0).normal(size=(120, 3))
+    detector = DBSCANAnomalyDetector(eps=0.8, min_samples=5)
+    detector.train(X)
+    detector.predict(X[:40])
+    detector.save(str(tmp_path / "dbscan"))
+    DBSCANAnomalyDetector().load(str(tmp_path / "dbscan"))
+    with pytest.raises(PredictionError):
+        detector.predict(np.zeros((2, 7)))
+    
+    after = {op: _phase_counts(instrumentation, op) for op in before}
+    delta = {op: tuple(a - b for a, b in zip(after[op], before[op])) for op in before}
+    # DBSCAN overrides before_train/after_train without super(); still one phase
+    assert delta['train'] == (1, 0, 120)
+    assert delta['predict'] == (1, 1, 40)
+    assert delta['save'][:2] == (1, 0) and delta['load'][:2] == (1, 0)
+    
+    labels = {'model_type': 'anomaly_dbscan', 'operation': 'predict'}
+    assert instrumentation.features.value(**labels) == 3
+    assert instrumentation.seconds.count(**labels) >= 2
+    assert instrumentation.depth(detector, 'predict') == 0
+    # Nothing is left behind per model instance once its phases close
+    assert getattr(instrumentation._local, 'phases', {}) == {}
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests', ('path',))
+    latency = registry.histogram('latency_seconds', 'Latency', ('path',), buckets=(0.1, 1.0))
+    requests.inc(path='/a"b')
+    latency.observe(0.5, path='/a')
+    latency.observe(5.0, path='/a')
+    
+    text = registry.render()
+    assert '# TYPE requests_total counter' in text
+    assert 'requests_total{path="/a\\"b"} 1.0' in text
+    assert 'latency_seconds_bucket{path="/a",le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{path="/a",le="1.0"} 1' in text
+    assert 'latency_seconds_bucket{path="/a",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{path="/a"} 2' in text
+    assert latency.quantile(0.5, path='/a') == 1.0
+    with pytest.raises(ValueError):
+        registry.gauge('requests_total', 'Requests', ('path',))
+    
+    from api.main import app
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert '# TYPE ml_model_phase_seconds histogram' in response.text
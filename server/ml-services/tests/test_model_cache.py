@@ -0,0 +1,87 @@
+"""
+Tests for the API's warm model cache
+LRU, TTL and memory-cap eviction plus statistics
+"""
+
+import numpy as np
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.model_cache import ModelCache
+
+
+def _key(cache: ModelCache, tenant: str, seed: int):
+    data = np.random.default_rng(seed).normal(size=(20, 3))
+    return cache.make_key(tenant, "isolation_forest", {"contamination": 0.05}, data)
+
+
+def test_lru_eviction_and_stats():
+    cache = ModelCache(max_entries=2, ttl_seconds=60)
+    k1, k2, k3 = (_key(cache, "t1", seed) for seed in range(3))
+    
+    cache.put(k1, "m1", size_bytes=10)
+    cache.put(k2, "m2", size_bytes=10)
+    assert cache.get(k1) == "m1"  # k1 is now most recently used
+    cache.put(k3, "m3", size_bytes=10)
+    
+    assert cache.get(k2) is None
+    assert cache.get(k1) == "m1"
+    assert cache.get(k3) == "m3"
+    
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 3
+    assert stats['misses'] == 1
+    assert stats['resident_bytes'] == 20
+
+
+def test_ttl_and_memory_cap():
+    cache = ModelCache(max_entries=10, ttl_seconds=0.01, max_bytes=25)
+    k1, k2, k3 = (_key(cache, "t1", seed) for seed in range(3))
+    
+    cache.put(k1, "m1", size_bytes=10)
+    time.sleep(0.02)
+    assert cache.get(k1) is None
+    assert cache.stats()['expirations'] == 1
+    
+    cache.ttl_seconds = 60
+    cache.put(k2, "m2", size_bytes=10)
+    cache.put(k3, "m3", size_bytes=20)  # pushes resident bytes over the cap
+    assert cache.get(k2) is None
+    assert cache.get(k3) == "m3"
+    assert cache.stats()['resident_bytes'] == 20
+
+
+def test_latest_model_per_tenant():
+    cache = ModelCache()
+    old_window = _key(cache, "t1", 0)
+    new_window = _key(cache, "t1", 1)
+    other_tenant = _key(cache, "t2", 1)
+    
+    cache.put(old_window, "m1", size_bytes=1)
+    assert cache.get(new_window) is None
+    assert cache.get_latest(new_window) == "m1"
+    assert cache.get_latest(other_tenant) is None
+    
+    assert cache.lookup(new_window, allow_latest=True) == ("m1", False)
+    assert cache.lookup(old_window, allow_latest=True) == ("m1", True)
+    assert cache.lookup(other_tenant, allow_latest=True) == (None, False)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (3, 3)
+
+
+def test_size_estimate_does_not_serialize():
+    from sklearn.ensemble import IsolationForest
+    
+    X = np.random.default_rng(0).normal(size=(500, 4))
+    forest = IsolationForest(n_estimators=20, random_state=0).fit(X)
+    size = ModelCache.estimate_size(forest)
+    node_bytes = sum(e.tree_.node_count * 64 for e in forest.estimators_)
+    assert node_bytes < size < 4 * node_bytes
+    
+    fitted = {"centers": np.zeros((100, 4)), "labels": np.zeros(500, dtype=np.int64)}
+    assert ModelCache.estimate_size(fitted) >= 3200 + 4000
@@ -0,0 +1,204 @@
+"""
+Tests for the SQLite model registry backend
+Legacy JSON migration, deployments and concurrent experiment recording
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from base.experiments import ExperimentRecorder
+from base.ml_model_base import ModelManifest
+from base.model_registry import JSONRegistryBackend, ModelRegistry, SQLiteRegistryBackend
+
+
+def _manifest(samples: int = 100) -> ModelManifest:
+    return ModelManifest(
+        model_id="m1",
+        model_type="isolation_forest",
+        trained_at="2024-01-01T00:00:00",
+        hyperparameters={'contamination': 0.05},
+        performance_metrics={'threshold': -0.5},
+        training_samples=samples,
+        status='trained'
+    )
+
+
+def test_register_deploy_and_latest(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    registry.register_model("m1", "isolation_forest", "1.0.0", _manifest(), "models/v1")
+    registry.register_model("m1", "isolation_forest", "1.1.0", _manifest(200), "models/v2")
+    
+    latest = registry.get_latest_version("isolation_forest", "m1")
+    assert latest['version'] == "1.1.0"
+    assert latest['hyperparameters'] == {'contamination': 0.05}
+    assert len(registry.get_model_info("isolation_forest", "m1")['versions']) == 2
+    
+    assert registry.deploy_model("isolation_forest", "m1", "1.0.0")
+    assert registry.deploy_model("isolation_forest", "m1", "1.1.0")
+    assert not registry.deploy_model("isolation_forest", "m1", "9.9.9")
+    deployed = registry.get_deployed_model("isolation_forest")
+    assert (deployed['version'], deployed['model_path']) == ("1.1.0", "models/v2")
+    
+    # A second handle on the same file sees the same state
+    other = ModelRegistry(str(tmp_path / "registry.db"))
+    assert other.get_deployed_model("isolation_forest")['version'] == "1.1.0"
+
+
+def test_legacy_json_is_migrated_once(tmp_path, caplog):
+    legacy = {
+        'models': {'prophet': {'p1': {'versions': [
+            {'version': '1.0.0', 'model_path': 'models/p1', 'created_at': 'x',
+             'trained_at': None, 'performance_metrics': {}, 'hyperparameters': {},
+             'training_samples': 10, 'status': 'trained'}
+        ]}}},
+        'deployments': {'production': {'prophet': {
+            'model_id': 'p1', 'version': '1.0.0', 'deployed_at': 'y', 'model_path': 'models/p1'
+        }}},
+        'experiments': {'exp_1': {
+            'name': 'exp', 'model_type': 'prophet', 'variants': [], 'created_at': 'z',
+            'status': 'active', 'results': [
+                {'variant_id': 'a', 'metric_name': 'mae', 'metric_value': 1.5, 'timestamp': 't'}
+            ]
+        }}
+    }
+    (tmp_path / "registry.json").write_text(json.dumps(legacy))
+    
+    registry = ModelRegistry(str(tmp_path / "registry.json"))
+    assert registry.get_deployed_model("prophet")['model_id'] == "p1"
+    assert registry.get_experiment_results("exp_1")['results'][0]['metric_value'] == 1.5
+    assert registry.get_experiment_summary("exp_1")['a']['mae']['count'] == 1
+    assert registry.list_models() == legacy['models']
+    assert not (tmp_path / "registry.json").exists()
+    assert (tmp_path / "registry.json.migrated").exists()
+    
+    # Importing again is a no-op
+    backend = SQLiteRegistryBackend(tmp_path / "registry.db")
+    assert not backend.import_json(tmp_path / "registry.json.migrated")
+    
+    # A registry.json written after the migration is not moved aside
+    (tmp_path / "registry.json").write_text(json.dumps(legacy))
+    with caplog.at_level(logging.WARNING, logger="base.model_registry"):
+        ModelRegistry(str(tmp_path / "registry.db"))
+    assert (tmp_path / "registry.json").exists()
+    assert "was not imported" in caplog.text
+    assert len(ModelRegistry(str(tmp_path / "registry.db")).list_models("prophet")["prophet"]["p1"]["versions"]) == 1
+
+
+def test_concurrent_experiment_results_are_all_kept(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    experiment_id = registry.create_experiment("ab", "prophet", [{'model_id': 'a', 'version': '1'}])
+    
+    def record(worker: int):
+        handle = ModelRegistry(str(tmp_path / "registry.db"))
+        for i in range(50):
+            handle.record_experiment_result(experiment_id, f"v{worker}", "mae", float(i))
+    
+    threads = [threading.Thread(target=record, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert len(registry.get_experiment_results(experiment_id)['results']) == 200
+    summary = registry.get_experiment_summary(experiment_id)
+    assert sorted(summary) == ["v0", "v1", "v2", "v3"]
+    assert summary["v2"]["mae"]["count"] == 50
+    assert summary["v2"]["mae"]["mean"] == pytest.approx(24.5)
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+def test_recorder_summary_matches_raw_results(tmp_path, backend):
+    if backend == "json":
+        registry = ModelRegistry(backend=JSONRegistryBackend(tmp_path / "registry.json"))
+    else:
+        registry = ModelRegistry(str(tmp_path / "registry.db"))
+    experiment_id = registry.create_experiment("ab", "prophet", [])
+    
+    rng = np.random.default_rng(0)
+    latencies = {"a": rng.lognormal(3, 0.5, 3000), "b": rng.normal(-2, 4, 3000)}
+    with ExperimentRecorder(registry, flush_size=500, flush_interval=None) as recorder:
+        for variant, values in latencies.items():
+            for v in values[:1000]:
+                recorder.record(experiment_id, variant, "latency", v)
+            recorder.record_batch(experiment_id, [(variant, "latency", v) for v in values[1000:]])
+        # Below flush_size the tail is still buffered until summary()/close()
+        assert recorder.summary(experiment_id)["a"]["latency"]["count"] == 3000
+    
+    assert len(registry.get_experiment_results(experiment_id)['results']) == 6000
+    summary = registry.get_experiment_summary(experiment_id)
+    for variant, values in latencies.items():
+        stats = summary[variant]["latency"]
+        assert stats["mean"] == pytest.approx(values.mean())
+        assert stats["variance"] == pytest.approx(values.var(ddof=1))
+        assert (stats["min"], stats["max"]) == (values.min(), values.max())
+        for q in (50, 90, 99):
+            expected = np.quantile(values, q / 100)
+            assert stats[f"p{q}"] == pytest.approx(expected, rel=0.03, abs=0.05)
+    
+    assert registry.get_experiment_summary("missing") is None
+
+
+def test_background_flush_failures_are_logged_and_kept(tmp_path, caplog):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    experiment_id = registry.create_experiment("ab", "prophet", [])
+    write = registry.record_experiment_results
+    failures = []
+    
+    def flaky(*args):
+        if not failures:
+            failures.append(1)
+            raise OSError("disk full")
+        return write(*args)
+    registry.record_experiment_results = flaky
+    
+    with caplog.at_level(logging.ERROR, logger="base.experiments"):
+        recorder = ExperimentRecorder(registry, flush_interval=0.01)
+        recorder.record(experiment_id, "a", "mae", 1.0)
+        deadline = time.monotonic() + 5
+        while not caplog.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert "flush failed" in caplog.records[0].getMessage()
+    assert isinstance(caplog.records[0].exc_info[1], OSError)
+    
+    recorder.close()
+    assert recorder.last_flush_error is None
+    assert len(registry.get_experiment_results(experiment_id)['results']) == 1
+
+
+def test_recorder_bounds_pending_results_and_logs_unknown_experiments(tmp_path, caplog):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    experiment_id = registry.create_experiment("ab", "prophet", [])
+    write = registry.record_experiment_results
+    
+    def broken(*args):
+        raise OSError("disk full")
+    registry.record_experiment_results = broken
+    
+    recorder = ExperimentRecorder(registry, flush_size=10, flush_interval=None, max_pending=25)
+    with caplog.at_level(logging.WARNING, logger="base.experiments"):
+        for i in range(40):
+            try:
+                recorder.record(experiment_id, "a", "mae", float(i))
+            except OSError:
+                pass
+    assert recorder.dropped == 15
+    assert "buffer is full" in caplog.text
+    
+    registry.record_experiment_results = write
+    with caplog.at_level(logging.WARNING, logger="base.experiments"):
+        recorder.record("missing", "a", "mae", 0.0)  # reaches flush_size and flushes
+    assert recorder.flush() == 0
+    assert "unknown experiment missing" in caplog.text
+    values = [r['metric_value'] for r in registry.get_experiment_results(experiment_id)['results']]
+    # Queuing the 26th result pushed out one more of the oldest
+    assert recorder.dropped == 16
+    assert sorted(values) == [float(i) for i in range(16, 40)]
@@ -0,0 +1,80 @@
+"""
+Tests for the deployed-model holder
+Preloading, atomic swaps and keeping the old model on a bad deployment
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "anomaly-detection"))
+
+from base.model_registry import ModelRegistry
+from base.model_serving import DeployedModelHolder
+from isolation_forest_prod import IsolationForestAnomalyDetector
+
+
+def _publish(registry, tmp_path, version, seed):
+    detector = IsolationForestAnomalyDetector(model_id="if", n_estimators=20)
+    detector.version = version
+    detector.train(np.random.default_rng(seed).normal(size=(300, 3)))
+    path = detector.save(str(tmp_path / version))
+    registry.register_model("if", "isolation_forest", version, detector.metadata, path)
+    registry.deploy_model("isolation_forest", "if", version)
+    return path
+
+
+def _holder(registry, **kwargs):
+    return DeployedModelHolder(
+        "isolation_forest",
+        lambda mid: IsolationForestAnomalyDetector(model_id=mid),
+        registry=registry,
+        **kwargs
+    )
+
+
+def test_swap_is_atomic_and_bad_versions_are_rejected(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    _publish(registry, tmp_path, "1.0.0", seed=0)
+    holder = _holder(registry, poll_interval=None)
+    
+    in_flight = holder.get("if")
+    assert in_flight.version == "1.0.0" and in_flight.model.is_trained
+    assert holder.get("other") is None
+    
+    _publish(registry, tmp_path, "1.1.0", seed=1)
+    # Nothing changes on the request path until the new version is loaded
+    assert holder.get("if") is in_flight
+    assert holder.refresh()
+    assert not holder.refresh()
+    
+    live = holder.get("if")
+    assert live.version == "1.1.0" and live.model is not in_flight.model
+    # The snapshot a running request holds is untouched by the swap
+    assert in_flight.model.is_trained and in_flight.version == "1.0.0"
+    
+    broken = _publish(registry, tmp_path, "1.2.0", seed=2)
+    next(Path(broken, "artifacts").glob("model*")).write_bytes(b"corrupt")
+    assert not holder.refresh()
+    assert holder.get("if") is live
+    assert "1.2.0" in holder.status()["last_error"]
+
+
+def test_watcher_picks_up_new_deployments(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    _publish(registry, tmp_path, "1.0.0", seed=0)
+    holder = _holder(registry, poll_interval=0.02)
+    try:
+        assert holder.get("if").version == "1.0.0"
+        _publish(registry, tmp_path, "2.0.0", seed=1)
+        
+        deadline = time.monotonic() + 5
+        while holder.get("if").version != "2.0.0" and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert holder.status()["version"] == "2.0.0"
+        assert holder.status()["swap_count"] == 2
+    finally:
+        holder.stop()
@@ -0,0 +1,100 @@
+"""
+Tests for online Isolation Forest updates
+Tree replacement, incremental window scores and refresh triggers
+"""
+
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "anomaly-detection"))
+
+import isolation_forest_prod
+from base.ml_model_base import TrainingError
+from isolation_forest_prod import IsolationForestAnomalyDetector
+
+
+def _detector(**kwargs):
+    params = dict(n_estimators=40, window_size=1500, refresh_trees=5, refresh_every=400)
+    params.update(kwargs)
+    return IsolationForestAnomalyDetector(**params)
+
+
+def test_size_trigger_replaces_oldest_trees():
+    rng = np.random.default_rng(0)
+    detector = _detector()
+    assert detector.train(rng.normal(size=(2000, 4))).success
+    oldest = detector.model.estimators_[:5]
+    survivors = detector.model.estimators_[5:]
+    
+    status = detector.partial_fit(rng.normal(size=(200, 4)))
+    assert not status['refreshed']
+    status = detector.partial_fit(rng.normal(size=(200, 4)))
+    assert status['trigger'] == 'size'
+    
+    trees = detector.model.estimators_
+    assert len(trees) == 40
+    assert trees[:35] == survivors
+    assert not any(tree in trees for tree in oldest)
+
+
+def test_incremental_window_scores_match_full_rescore():
+    rng = np.random.default_rng(1)
+    detector = _detector()
+    detector.train(rng.normal(size=(1000, 4)))
+    for _ in range(5):
+        detector.partial_fit(rng.normal(size=(250, 4)))
+    assert detector.refresh_count >= 2
+    
+    window = detector._window_X[detector._window_slots()]
+    scores = detector.model.score_samples(window)
+    np.testing.assert_allclose(
+        detector._scores_from_depths(detector._window_depths[detector._window_slots()]),
+        scores
+    )
+    assert detector.threshold == pytest.approx(np.percentile(scores, detector.contamination * 100))
+    assert detector.model.offset_ == detector.threshold
+
+
+def test_drift_trigger_and_reload(tmp_path):
+    rng = np.random.default_rng(2)
+    detector = _detector(refresh_every=10000)
+    detector.train(rng.normal(size=(1000, 4)))
+    status = detector.partial_fit(rng.normal(4, 1, size=(300, 4)))
+    assert status['trigger'] == 'drift'
+    
+    detector.save(str(tmp_path))
+    restored = _detector()
+    restored.load(str(tmp_path))
+    # Too few samples to re-derive the threshold: the saved one is kept
+    status = restored.partial_fit(rng.normal(size=(100, 4)))
+    assert status['window_size'] == 100
+    assert status['threshold'] == detector.threshold
+
+
+def test_tree_swapping_refuses_unverified_sklearn(monkeypatch):
+    import sklearn
+    
+    detector = _detector()
+    detector.train(np.random.default_rng(3).normal(size=(500, 4)))
+    monkeypatch.setattr(sklearn, "__version__", "1.2.2")
+    with pytest.raises(TrainingError, match="scikit-learn 1.2.2"):
+        detector.partial_fit(np.zeros((10, 4)))
+
+
+def test_online_detectors_are_bounded(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # the default model registry lives under ./models
+    monkeypatch.setattr(isolation_forest_prod, "MAX_ONLINE_DETECTORS", 2)
+    monkeypatch.setattr(isolation_forest_prod, "_online_detectors", OrderedDict())
+    events = [
+        {"case_id": f"c{i // 5}", "activity": f"a{i % 5}", "timestamp": f"2024-01-01T{i % 24:02d}:00:00"}
+        for i in range(60)
+    ]
+    
+    for model_id in ("online-a", "online-b", "online-a", "online-c"):
+        isolation_forest_prod.detect_anomalies_with_isolation_forest(events, model_id=model_id, online=True)
+    assert list(isolation_forest_prod._online_detectors) == ["online-a", "online-c"]
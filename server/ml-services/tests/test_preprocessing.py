@@ -0,0 +1,72 @@
+"""
+Tests for incremental preprocessing
+Chunked and merged fitting must match a single fit over all rows
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from base.preprocessing import FeatureExtractor, StandardScaler
+
+
+def _events(n: int, seed: int, activities):
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            'activity': activities[rng.integers(len(activities))],
+            'resource': f"r{rng.integers(5)}",
+            'duration': float(rng.exponential(30)),
+            'cost': float(rng.normal(100, 20)),
+            'timestamp': start + timedelta(minutes=int(rng.integers(100000)))
+        }
+        for _ in range(n)
+    ]
+
+
+def test_scaler_partial_fit_and_merge_match_fit():
+    rng = np.random.default_rng(0)
+    data = rng.normal(1e6, 3, size=(5000, 4)).astype(np.float32)
+    full = StandardScaler().fit(data)
+    
+    chunked = StandardScaler()
+    for chunk in np.array_split(data, 7):
+        chunked.partial_fit(chunk)
+    merged = StandardScaler().fit(data[:1234]).merge(StandardScaler().fit(data[1234:]))
+    
+    for scaler in (chunked, merged):
+        assert scaler.n_samples_seen == 5000
+        np.testing.assert_allclose(scaler.mean, full.mean)
+        np.testing.assert_allclose(scaler.std, full.std, rtol=1e-9)
+    np.testing.assert_allclose(full.std, data.astype(np.float64).std(axis=0), rtol=1e-9)
+    assert full.transform(data).dtype == np.float32
+
+
+def test_feature_extractor_chunked_and_merged_fit_match_fit():
+    # Later chunks introduce categories that sort before earlier ones
+    chunks = [
+        _events(300, 0, ['review', 'submit']),
+        _events(300, 1, ['approve', 'review']),
+        _events(300, 2, ['archive', 'submit', 'zeta'])
+    ]
+    events = [e for chunk in chunks for e in chunk]
+    full = FeatureExtractor().fit(events)
+    
+    chunked = FeatureExtractor()
+    for chunk in chunks:
+        chunked.partial_fit(chunk)
+    
+    workers = [FeatureExtractor().partial_fit(chunk) for chunk in chunks]
+    merged = workers[0].merge(workers[1]).merge(workers[2])
+    
+    expected = full.transform(events)
+    for extractor in (chunked, merged):
+        assert extractor.categorical_encoders['activity'].vocabulary.tolist() == [
+            'approve', 'archive', 'review', 'submit', 'zeta'
+        ]
+        np.testing.assert_allclose(extractor.transform(events), expected, rtol=1e-5, atol=1e-5)
@@ -0,0 +1,86 @@
+"""
+Tests for chunked NDJSON / CSV ingestion
+Chunked feature extraction must match the whole-log path
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.main as main
+from api.executor import ComputeExecutor
+from api.main import EventLog, _stream_chunk_features, extract_features
+from api.streaming import CaseStreamState, LineChunker, parse_csv_header, parse_csv_lines
+
+
+def _events(n: int):
+    return [
+        {
+            "case_id": f"C{i % 7}",
+            "activity": f"act{i % 5}",
+            "timestamp": f"2024-01-{1 + i // 24:02d}T{i % 24:02d}:00:00",
+            "duration": float(i % 9),
+        }
+        for i in range(n)
+    ]
+
+
+def test_line_chunker_reassembles_split_lines():
+    chunker = LineChunker(chunk_size=2)
+    batches = list(chunker.feed(b'{"a": 1}\n{"a"')) + list(chunker.feed(b': 2}\n\n{"a": 3}'))
+    batches += list(chunker.finish())
+    assert batches == [[b'{"a": 1}', b'{"a": 2}'], [b'{"a": 3}']]
+
+
+def test_chunked_features_match_batch_features():
+    events = _events(300)
+    expected = extract_features([EventLog(**e) for e in events])
+    
+    lines = [json.dumps(e).encode() for e in events]
+    state = CaseStreamState()
+    chunks = [
+        _stream_chunk_features(lines[i:i + 37], "ndjson", None, state)[1]
+        for i in range(0, len(lines), 37)
+    ]
+    actual = np.vstack(chunks)
+    
+    # Case size is a running count while streaming; everything else matches
+    columns = [0, 1, 3, 4, 5]
+    np.testing.assert_allclose(actual[:, columns], expected[:, columns])
+    assert actual[-1, 2] == expected[-1, 2]
+
+
+def test_csv_chunk_parsing():
+    sample = Path(__file__).parent.parent.parent.parent / "sample_event_log.csv"
+    lines = sample.read_bytes().splitlines()
+    header = parse_csv_header(lines[0])
+    columns = parse_csv_lines(lines[1:6], header)
+    
+    assert columns['case_id'].tolist() == ["CASE001"] * 5
+    assert columns['cost'][0] == 50.0
+    assert all(d is None for d in columns['duration'])
+
+
+def test_stream_case_state_survives_process_workers(monkeypatch):
+    body = "\n".join(json.dumps(e) for e in _events(300))
+    params = {"chunk_size": 37, "model_mode": "refit"}
+    client = TestClient(main.app)
+    
+    expected = client.post("/anomaly-detection/stream", params=params, content=body,
+                           headers={"content-type": "application/x-ndjson"})
+    assert expected.status_code == 200
+    
+    executor = ComputeExecutor(kind="process", max_workers=1)
+    monkeypatch.setattr(main, "compute_executor", executor)
+    try:
+        actual = client.post("/anomaly-detection/stream", params=params, content=body,
+                             headers={"content-type": "application/x-ndjson"})
+    finally:
+        executor.shutdown()
+    assert actual.status_code == 200
+    assert actual.json()["anomalies"] == expected.json()["anomalies"]
@@ -0,0 +1,100 @@
+"""
+Tests for request-level tracing
+Stage spans on every request, opt-in profiles, rolling latency window
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import api.tracing as tracing
+from api.main import app
+from base.instrumentation import RollingHistogram
+
+
+def _events(n=60):
+    return [
+        {"case_id": f"c{i // 6}", "activity": f"a{i % 6}", "timestamp": f"2024-01-01T{i % 24:02d}:00:00",
+         "duration": float(i % 7) * (50 if i == 30 else 1)}
+        for i in range(n)
+    ]
+
+
+def _span_names(span):
+    return [span['name']] + [name for child in span['children'] for name in _span_names(child)]
+
+
+def test_profiled_request_reports_stage_tree(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "PROFILING_ENABLED", True)
+    client = TestClient(app)
+    payload = {"events": _events(), "algorithm": "isolation_forest", "model_mode": "refit"}
+    labels = {'endpoint': '/anomaly-detection', 'algorithm': 'isolation_forest'}
+    before = tracing.STAGE_SECONDS.count(stage='percentiles', **labels)
+    
+    plain = client.post("/anomaly-detection", json=payload)
+    assert plain.status_code == 200 and "_profile" not in plain.json()
+    assert tracing.STAGE_SECONDS.count(stage='percentiles', **labels) == before + 1
+    
+    profiled = client.post("/anomaly-detection", json=payload, headers={"X-EPIQ-Profile": "response"})
+    report = profiled.json()["_profile"]
+    names = _span_names(report['spans'])
+    for name in ("parse_request", "handler", "extract_features", "fit_isolation_forest",
+                 "score_samples", "percentiles", "serialize_response"):
+        assert name in names
+    assert report['algorithm'] == 'isolation_forest'
+    assert any('_score_isolation_forest' in row['function'] for row in report['profile'])
+    assert "percentiles" not in profiled.headers["Server-Timing"].split(",")[0]
+    
+    monkeypatch.setattr(tracing, "PROFILE_DIR", tmp_path)
+    written = client.post("/forecast", json={"values": list(np.arange(30.0)), "horizon": 5},
+                          headers={"X-EPIQ-Profile": "dir"})
+    assert "_profile" not in written.json()
+    path = tmp_path / written.headers["X-EPIQ-Profile-File"]
+    assert path.with_suffix(".pstats").exists()
+    assert "forecast" in _span_names(json.loads(path.read_text())['spans'])
+
+
+def test_profiling_needs_server_opt_in(monkeypatch):
+    client = TestClient(app)
+    payload = {"values": list(np.arange(30.0)), "horizon": 5}
+    monkeypatch.setattr(tracing, "PROFILE_DIR", None)
+    
+    for enabled, mode in ((False, "response"), (True, "dir"), (True, "yes-please")):
+        monkeypatch.setattr(tracing, "PROFILING_ENABLED", enabled)
+        response = client.post("/forecast", json=payload, headers={"X-EPIQ-Profile": mode})
+        assert response.status_code == 200 and "_profile" not in response.json()
+        assert "Server-Timing" not in response.headers
+    assert tracing.parse_profile_mode("Response") == "response"
+
+
+def test_unknown_algorithms_share_one_label():
+    client = TestClient(app)
+    labels = {'endpoint': '/anomaly-detection', 'algorithm': 'other'}
+    before = int(tracing.REQUEST_SECONDS.window_counts(**labels).sum())
+    for name in ("bogus-1", "bogus-2"):
+        response = client.post("/anomaly-detection", json={"events": _events(), "algorithm": name})
+        assert response.status_code == 400
+    assert tracing.REQUEST_SECONDS.window_counts(**labels).sum() == before + 2
+    assert 'bogus' not in '\n'.join(tracing.REQUEST_SECONDS.render())
+
+
+def test_rolling_histogram_forgets_old_observations():
+    now = [0.0]
+    latency = RollingHistogram('latency', 'Latency', ('endpoint',), buckets=(0.1, 1.0),
+                               window_seconds=60, slots=6, clock=lambda: now[0])
+    for _ in range(9):
+        latency.observe(0.05, endpoint='/a')
+    latency.observe(5.0, endpoint='/a')
+    assert latency.quantile(0.5, endpoint='/a') == 0.1
+    assert latency.quantile(0.99, endpoint='/a') == float('inf')
+    
+    now[0] = 65.0
+    latency.observe(0.5, endpoint='/a')
+    assert latency.window_counts(endpoint='/a').tolist() == [0, 1, 0]
+    assert latency.quantile(0.5, endpoint='/a') == 1.0
+    assert 'latency_count{endpoint="/a"} 11' in '\n'.join(latency.render())
@@ -0,0 +1,75 @@
+"""
+Tests for the shared sliding-window utilities
+Window views must match the list-of-slices construction they replace
+"""
+
+import gc
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "forecasting"))
+
+from base import autoregressive
+from base.preprocessing import TimeSeriesPreprocessor
+from base.windowing import iter_batches, predict_in_batches, sliding_windows
+from xgboost_prod import XGBoostForecaster
+
+
+def test_windows_are_views_matching_slices():
+    data = np.random.default_rng(0).normal(size=(50, 3))
+    X, y = TimeSeriesPreprocessor().create_sequences(data, sequence_length=8, forecast_horizon=2)
+    
+    expected_X = np.array([data[i:i + 8] for i in range(41)])
+    expected_y = np.array([data[i + 8:i + 10] for i in range(41)])
+    np.testing.assert_array_equal(X, expected_X)
+    np.testing.assert_array_equal(y, expected_y)
+    assert np.shares_memory(X, data) and not X.flags.writeable
+    
+    series = np.arange(20.0)
+    lags, target = XGBoostForecaster(n_lags=5)._create_features(series)
+    np.testing.assert_array_equal(lags, [series[i - 5:i] for i in range(5, 20)])
+    np.testing.assert_array_equal(target, series[5:])
+    
+    inputs, targets = sliding_windows(np.arange(3.0), 5, 1)
+    assert inputs.shape == (0, 5) and targets.shape == (0, 1)
+
+
+def test_batches_materialize_only_one_batch():
+    data = np.arange(1000.0)
+    X, y = sliding_windows(data, 10, 1)
+    
+    batches = list(iter_batches(X, y, batch_size=64))
+    assert [len(b[0]) for b in batches] == [64] * 15 + [30]
+    assert all(b[0].flags.c_contiguous and not np.shares_memory(b[0], data) for b in batches)
+    
+    shuffled = list(iter_batches(X, y, batch_size=64, shuffle=True, seed=1))
+    X_all = np.concatenate([b[0] for b in shuffled])
+    y_all = np.concatenate([b[1] for b in shuffled])
+    np.testing.assert_array_equal(X_all[:, -1] + 1, y_all[:, 0])
+    assert sorted(X_all[:, 0]) == list(range(990))
+    
+    calls = []
+    def model(batch):
+        calls.append(len(batch))
+        return batch * 2
+    errors = predict_in_batches(model, X, batch_size=300, reduce=lambda b, out: (out - b).sum(axis=1))
+    np.testing.assert_allclose(errors, X.sum(axis=1))
+    assert calls == [300, 300, 300, 90]
+
+
+def test_compiled_rollout_is_dropped_with_its_model():
+    tf = pytest.importorskip("tensorflow")
+    
+    model = tf.keras.Sequential([tf.keras.Input(shape=(6, 1)), tf.keras.layers.Flatten(), tf.keras.layers.Dense(1)])
+    forecasts = autoregressive.rollout_forecast(model, np.zeros((3, 6)), horizon=4)
+    assert forecasts.shape == (3, 4) and len(autoregressive._ROLLOUTS) >= 1
+    
+    entries = len(autoregressive._ROLLOUTS)
+    del model
+    gc.collect()
+    assert len(autoregressive._ROLLOUTS) == entries - 1
+
@@ -0,0 +1,71 @@
+"""
+Tests for the XGBoost forecaster
+Incremental updates and batched recursive forecasts
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "forecasting"))
+
+from xgboost_prod import XGBoostForecaster
+
+
+def test_update_adds_trees_without_changing_params():
+    pytest.importorskip("xgboost")
+    
+    series = np.sin(np.arange(120) / 5) * 10 + 50
+    forecaster = XGBoostForecaster(n_lags=6, n_estimators=30)
+    forecaster.train(series[:100])
+    
+    forecaster.update(series[100:110], n_rounds=5)
+    assert forecaster.model.get_params()['n_estimators'] == 30
+    assert forecaster.metadata.performance_metrics['total_trees'] == 35
+    
+    forecaster.update(series[110:], n_rounds=5)
+    assert forecaster.metadata.performance_metrics['total_trees'] == 40
+
+
+def test_ring_buffer_forecast_matches_step_loop():
+    from sklearn.linear_model import LinearRegression
+    
+    # A regressor without a booster takes the model.predict path
+    rng = np.random.default_rng(2)
+    series = [np.cumsum(rng.normal(size=n)) for n in (30, 45, 60)]
+    forecaster = XGBoostForecaster(n_lags=4, horizon=9)
+    lags, target = forecaster._create_features(series[0])
+    forecaster.model = LinearRegression().fit(lags, target)
+    forecaster.is_trained = True
+    
+    batch = forecaster.forecast_many(series)
+    assert batch.shape == (3, 9)
+    for row, history in enumerate(series):
+        window = list(history[-4:])
+        for step in range(9):
+            window.append(float(forecaster.model.predict(np.array([window[-4:]], dtype=np.float32))[0]))
+        np.testing.assert_allclose(batch[row], window[4:], rtol=1e-5)
+
+
+def test_inplace_forecast_many_matches_per_series_predict():
+    pytest.importorskip("xgboost")
+    
+    rng = np.random.default_rng(4)
+    series = [np.sin(np.arange(n) / 4) * 10 + rng.normal(size=n) for n in (40, 55, 70)]
+    forecaster = XGBoostForecaster(n_lags=5, horizon=8, n_estimators=20)
+    forecaster.train(series[2])
+    assert forecaster.metadata.hyperparameters['use_inplace_predict'] is True
+    
+    # Inplace predict on the ring buffer's non-contiguous window slices
+    batch = forecaster.forecast_many(series)
+    forecaster.use_inplace_predict = False
+    np.testing.assert_allclose(forecaster.forecast_many(series), batch, rtol=1e-5)
+    
+    for row, history in enumerate(series):
+        window = list(np.asarray(history[-5:], dtype=np.float32))
+        for step in range(8):
+            window.append(float(forecaster.model.predict(np.array([window[-5:]], dtype=np.float32))[0]))
+        np.testing.assert_allclose(batch[row], window[5:], rtol=1e-5)